@@ -0,0 +1,67 @@
+import logging
+import threading
+from typing import Callable, Optional, TypeVar
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+
+def run_in_session(session_factory, work: Callable[[Session], T], failure: str) -> T:
+    """Run ``work`` in a fresh session and commit it; on error roll back, log ``failure`` and re-raise."""
+    db = session_factory()
+    try:
+        result = work(db)
+        db.commit()
+        return result
+    except Exception as e:
+        db.rollback()
+        logging.error(f"{failure}: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+class PeriodicJob:
+    """Calls ``run_once(session_factory)`` on a daemon thread every ``interval_seconds``.
+
+    Subclasses implement ``run_once`` and log their own failures (usually via
+    ``run_in_session``); the loop swallows the exception and waits for the next
+    tick. With ``run_at_start`` the first run happens right away instead of
+    after a full interval.
+    """
+
+    name = "periodic-job"
+    run_at_start = False
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self, session_factory):
+        raise NotImplementedError
+
+    def should_run_at_start(self, session_factory) -> bool:
+        return self.run_at_start
+
+    def start(self, session_factory, interval_seconds: float) -> None:
+        if interval_seconds <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def run():
+            due = self.should_run_at_start(session_factory)
+            while due or not self._stop.wait(interval_seconds):
+                due = False
+                try:
+                    self.run_once(session_factory)
+                except Exception:
+                    pass
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
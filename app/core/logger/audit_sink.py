@@ -0,0 +1,166 @@
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Optional
+from app.db import SessionLocal
+from app.db.unit_of_work import on_commit
+from app.features.logs.data.models import Log
+
+AUDIT_LOG_QUEUE_SIZE = int(os.getenv("AUDIT_LOG_QUEUE_SIZE", "10000"))
+AUDIT_LOG_BATCH_SIZE = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "500"))
+AUDIT_LOG_FLUSH_SECONDS = float(os.getenv("AUDIT_LOG_FLUSH_SECONDS", "1"))
+
+
+class AuditLogSink:
+    """Bounded in-memory queue of ``Log`` rows drained by a background thread.
+
+    ``log`` never touches the database: it appends to the queue (dropping the
+    entry when the queue is full) and the flusher bulk-inserts batches in its
+    own session whenever ``batch_size`` entries are waiting or every
+    ``flush_interval`` seconds, whichever comes first. The flusher starts on
+    the first ``log`` call unless ``autostart`` is off.
+
+    Entries logged with a ``session`` belong to its transaction: they are held
+    on the session and only queued once it commits, and dropped on rollback.
+    """
+
+    def __init__(self, session_factory, max_queue: int, batch_size: int, flush_interval: float, autostart: bool = True):
+        self.session_factory = session_factory
+        self.autostart = autostart
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Deque[dict] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def log(
+        self,
+        action: str,
+        user_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        details: Optional[str] = "",
+        session=None
+    ) -> bool:
+        entry = {
+            "user_id": user_id,
+            "company_id": company_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details,
+            "timestamp": datetime.utcnow()
+        }
+        if session is not None:
+            self._hold(session, entry)
+            return True
+        return self._enqueue([entry]) == 1
+
+    def _hold(self, session, entry: dict) -> None:
+        sync_session = getattr(session, "sync_session", session)
+        pending = sync_session.info.get(self)
+        if pending is None:
+            pending = sync_session.info[self] = []
+            on_commit(
+                sync_session,
+                lambda: self._enqueue(sync_session.info.pop(self, [])),
+                lambda: sync_session.info.pop(self, None)
+            )
+        pending.append(entry)
+
+    def _enqueue(self, entries: list) -> int:
+        accepted = 0
+        with self._cond:
+            for entry in entries:
+                if len(self._queue) >= self.max_queue:
+                    self.dropped += 1
+                    continue
+                self._queue.append(entry)
+                accepted += 1
+            self.queued += accepted
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        if accepted and self.autostart and self._thread is None:
+            self.start()
+        return accepted
+
+    def flush(self) -> int:
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return written
+                if not self._write(batch):
+                    return written
+                written += len(batch)
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="audit-log-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            thread, self._thread = self._thread, None
+            self._cond.notify()
+        if thread is not None:
+            thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._queue),
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed
+        }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def _write(self, batch: list) -> bool:
+        db = self.session_factory()
+        try:
+            db.bulk_insert_mappings(Log, batch)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failed += len(batch)
+            logging.error(f"Failed to flush audit log batch: {str(e)}")
+            return False
+        finally:
+            db.close()
+        self.written += len(batch)
+        return True
+
+
+audit_sink = AuditLogSink(
+    session_factory=SessionLocal,
+    max_queue=AUDIT_LOG_QUEUE_SIZE,
+    batch_size=AUDIT_LOG_BATCH_SIZE,
+    flush_interval=AUDIT_LOG_FLUSH_SECONDS
+)
@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(**values: Any) -> str:
+    payload = {key: value.isoformat() if isinstance(value, datetime) else value for key, value in values.items()}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *datetime_fields: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        for field in datetime_fields:
+            payload[field] = datetime.fromisoformat(payload[field])
+        if not isinstance(payload.get("id"), int):
+            raise ValueError("cursor without id")
+        return payload
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, items: Sequence, per_page: int, *fields: str) -> None:
+    """Expose the keyset position after the last item of a full page as an opaque header."""
+    if not items or len(items) < per_page:
+        return
+    last = items[-1]
+    values = {field: last[field] if isinstance(last, dict) else getattr(last, field) for field in ("id",) + fields}
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(**values)
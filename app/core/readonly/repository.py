@@ -0,0 +1,50 @@
+from typing import Callable, List, Optional, Type, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+Record = TypeVar("Record")
+
+
+def record_columns(record: Type, table) -> tuple:
+    """Columns of ``table`` matching the fields of a slotted ``record`` dataclass, in field order."""
+    return tuple(table.c[name] for name in record.__dataclass_fields__)
+
+
+class ReadOnlyRepository:
+    """Base for hot read paths.
+
+    Statements run on the session's connection as plain Core, so no ORM
+    instances are built or added to the identity map; each row becomes a
+    ``__slots__`` record. Writes keep using the ORM repositories.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def fetch(self, statement, record: Callable[..., Record]) -> List[Record]:
+        return [record(*row) for row in self.db.connection().execute(statement)]
+
+    def fetch_one(self, statement, record: Callable[..., Record]) -> Optional[Record]:
+        row = self.db.connection().execute(statement).first()
+        return record(*row) if row is not None else None
+
+    def fetch_mappings(self, statement) -> List[dict]:
+        return [dict(row) for row in self.db.connection().execute(statement).mappings()]
+
+
+class AsyncReadOnlyRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def fetch(self, statement, record: Callable[..., Record]) -> List[Record]:
+        connection = await self.db.connection()
+        return [record(*row) for row in await connection.execute(statement)]
+
+    async def fetch_one(self, statement, record: Callable[..., Record]) -> Optional[Record]:
+        connection = await self.db.connection()
+        row = (await connection.execute(statement)).first()
+        return record(*row) if row is not None else None
+
+    async def fetch_mappings(self, statement) -> List[dict]:
+        connection = await self.db.connection()
+        return [dict(row) for row in (await connection.execute(statement)).mappings()]
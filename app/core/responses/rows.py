@@ -0,0 +1,28 @@
+from functools import lru_cache
+from typing import Any, List, Sequence
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def rows_adapter(row_type: Any) -> TypeAdapter:
+    """Cached ``TypeAdapter`` for a list of ``row_type`` (a TypedDict or record dataclass describing one row)."""
+    return TypeAdapter(List[row_type])
+
+
+class RowsJSONResponse(Response):
+    """Serializes row dicts or read-repository records to JSON in one pass through pydantic-core.
+
+    Rows are dumped against their TypedDict or dataclass schema without being validated or
+    wrapped in models first. Returning this response also skips FastAPI's
+    ``response_model`` re-validation, which stays on the route for the docs.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: Sequence[Any], row_type: Any, **kwargs):
+        self.adapter = rows_adapter(row_type)
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Sequence[Any]) -> bytes:
+        return self.adapter.dump_json(content)
@@ -1,14 +1,22 @@
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import HTTPException, status
-from app.core.models.user_rules import UserRules
+from app.core.security.principal_cache import PrincipalCache
+from app.core.security.token_revocation import TokenRevocationList
+from app.core.security.login_tracker import LoginAttemptTracker
+from app.core.security.hashing import PasswordHasher, pwd_context
+from app.core.security.membership import MembershipResolver
+from app.core.security.permissions import invalidate_permissions
+from app.core.security.policy import UserPolicy, get_user_policy
 from sqlalchemy.orm import Session
-from app.features.auth.data.models import User, LoginAttempt
+from app.features.auth.data.models import User
 import os
-from app.db import get_db
+import time
+import uuid
+from app.db import get_db, call_service
+from app.db.unit_of_work import on_commit
 from fastapi import Depends, Request
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
@@ -17,9 +25,30 @@ ACCESS_TOKEN_EXPIRE_HOURS = 4
 OTP_EXPIRE_MINUTES = 3  
 MAX_LOGIN_ATTEMPTS = 10 
 LOGIN_BAN_HOURS = 5  
+LOGIN_ATTEMPT_WINDOW_MINUTES = 30
+LOGIN_ATTEMPT_FLUSH_SECONDS = int(os.getenv("LOGIN_ATTEMPT_FLUSH_SECONDS", "30"))
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+STATELESS_TOKENS = os.getenv("STATELESS_TOKENS", "false").lower() == "true"
+STATELESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("STATELESS_TOKEN_EXPIRE_MINUTES", "15"))
+PRINCIPAL_TOKEN_TYPE = "principal"
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+principal_cache = PrincipalCache(max_size=PRINCIPAL_CACHE_MAX_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+revocation_list = TokenRevocationList(token_lifetime_seconds=STATELESS_TOKEN_EXPIRE_MINUTES * 60)
+login_tracker = LoginAttemptTracker(
+    max_attempts=MAX_LOGIN_ATTEMPTS,
+    window_seconds=LOGIN_ATTEMPT_WINDOW_MINUTES * 60,
+    ban_seconds=LOGIN_BAN_HOURS * 3600
+)
+password_hasher = PasswordHasher(
+    workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+    executor=PASSWORD_HASH_EXECUTOR
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -30,9 +59,80 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def membership_claims(memberships) -> list:
+    return [
+        {
+            "company_id": membership.company_id,
+            "role": membership.role,
+            "can_delete_government": bool(membership.can_delete_government),
+            "can_manage_government_admins": bool(membership.can_manage_government_admins),
+            "can_manage_operators": bool(membership.can_manage_operators)
+        }
+        for membership in memberships
+    ]
+
+def create_principal_token(user: User, memberships: Optional[list] = None) -> str:
+    """Short-lived token carrying everything get_current_user needs, so it can authorize without the database."""
+    now = time.time()
+    payload = {
+        "sub": str(user.id),
+        "username": user.username,
+        "email": user.email,
+        "phone_num": user.phone_num,
+        "is_active": user.is_active,
+        "is_premium": user.is_premium,
+        "companies": membership_claims(user.companies if memberships is None else memberships),
+        "typ": PRINCIPAL_TOKEN_TYPE,
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": int(now + STATELESS_TOKEN_EXPIRE_MINUTES * 60)
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop cached principals and revoke principal tokens of a user after their role, status or memberships change."""
+    principal_cache.invalidate_user(user_id)
+    revocation_list.revoke_user(user_id)
+    invalidate_permissions(user_id)
+
+def invalidate_principal_on_commit(session, user_id: int) -> None:
+    # Drop the cached principal now so this request never reads it, and invalidate
+    # fully once the change commits in case a concurrent request re-cached the old role.
+    principal_cache.invalidate_user(user_id)
+    invalidate_permissions(user_id)
+    on_commit(session, lambda: invalidate_principal(user_id))
+
+def revoke_access_token(token: str, payload: dict) -> bool:
+    """Log out one bearer token: revoke its ``jti`` until it expires and drop its cached principal.
+
+    Tokens issued without a ``jti`` cannot be revoked individually; False is returned for them.
+    """
+    principal_cache.invalidate_token(token)
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    revocation_list.revoke_token(jti, float(payload.get("exp") or time.time() + ACCESS_TOKEN_EXPIRE_HOURS * 3600))
+    return True
+
+def principal_membership(current_user: dict, company_id: int) -> Optional[dict]:
+    return next((c for c in current_user.get("companies") or [] if c["company_id"] == company_id), None)
+
+def _principal_from_claims(payload: dict) -> dict:
+    companies = payload.get("companies") or []
+    return {
+        "id": int(payload["sub"]),
+        "username": payload["username"],
+        "email": payload.get("email"),
+        "phone_num": payload.get("phone_num"),
+        "is_active": payload.get("is_active"),
+        "role": companies[0]["role"] if companies else None,
+        "company_id": companies[0]["company_id"] if companies else None,
+        "companies": companies
+    }
+
 async def get_current_user(
     request: Request,
     token: str = Depends(oauth2_scheme),
@@ -51,92 +151,45 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    client_ip = request.client.host
-    attempt_count = db.query(LoginAttempt).filter(
-        LoginAttempt.ip_address == client_ip,
-        LoginAttempt.timestamp > datetime.utcnow() - timedelta(minutes=30)
-    ).count()
-    
-    if attempt_count >= MAX_LOGIN_ATTEMPTS:
+    if login_tracker.is_banned(request.client.host):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Too many attempts. IP banned for {LOGIN_BAN_HOURS} hours."
         )
     
-    user = db.query(User).filter(User.username == username).first()
+    if payload.get("typ") == PRINCIPAL_TOKEN_TYPE:
+        if revocation_list.is_revoked(payload):
+            raise credentials_exception
+        return _principal_from_claims(payload)
+    
+    if revocation_list.is_token_revoked(payload.get("jti")):
+        raise credentials_exception
+    
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
+    # The membership lookup uses the sync Session, so keep it off the event loop.
+    user, memberships = await call_service(MembershipResolver(db).user_with_memberships, username)
     if user is None:
         raise credentials_exception
     
-    role = user.companies[0].role if user.companies else None
-    company_id = user.companies[0].company_id if user.companies else None
+    role = memberships[0].role if memberships else None
+    company_id = memberships[0].company_id if memberships else None
     
-    return {
+    principal = {
         "id": user.id,
         "username": user.username,
         "email": user.email,
         "phone_num": user.phone_num,
         "is_active": user.is_active,
         "role": role,
-        "company_id": company_id
+        "company_id": company_id,
+        "companies": membership_claims(memberships)
     }
+    principal_cache.set(token, principal)
+    return principal
 
-def get_user_rules(role: str, company_id: Optional[int] = None, permissions: Optional[dict] = None) -> UserRules:
-    can_delete_government = permissions.get("can_delete_government", False) if permissions else False
-    can_manage_government_admins = permissions.get("can_manage_government_admins", False) if permissions else False
-    can_manage_operators = permissions.get("can_manage_operators", False) if permissions else False
-
-    rules_map = {
-        "S": UserRules(
-            role="S",
-            allowed_fields={
-                "users": ["id", "username", "phone_num", "email", "role", "company_id", "is_active", "can_delete_government", "can_manage_government_admins", "can_manage_operators"],
-                "companies": ["id", "name", "government_admin_id", "is_active"],
-                "assets": ["id", "company_id", "name", "code", "location", "status", "rfid_tag", "gps_enabled", "geo_location"]
-            },
-            editable_fields={
-                "users": ["username", "phone_num", "email", "role", "company_id", "is_active", "can_delete_government", "can_manage_government_admins", "can_manage_operators"],
-                "companies": ["name", "government_admin_id", "is_active"],
-                "assets": ["name", "code", "location", "status", "rfid_tag", "gps_enabled", "geo_location"]
-            },
-            max_records=None
-        ),
-        "A1": UserRules(
-            role="A1",
-            allowed_fields={
-                "users": ["id", "username", "phone_num", "email", "role", "company_id", "is_active", "can_delete_government", "can_manage_government_admins", "can_manage_operators"],
-                "assets": ["id", "name", "code", "location", "status", "rfid_tag", "gps_enabled", "geo_location"]
-            },
-            editable_fields={
-                "users": ["username", "phone_num", "email", "role", "is_active", "can_delete_government", "can_manage_government_admins", "can_manage_operators"],
-                "assets": ["name", "code", "location", "status", "rfid_tag", "gps_enabled", "geo_location"]
-            },
-            max_records=1000,
-            company_id=company_id
-        ),
-        "A2": UserRules(
-            role="A2",
-            allowed_fields={
-                "users": ["id", "username", "phone_num", "email", "role", "company_id", "is_active"],
-                "assets": ["id", "name", "code", "location", "status"]
-            },
-            editable_fields={
-                "users": ["username", "phone_num", "email", "is_active"] if can_manage_operators else [],
-                "assets": ["location", "status"]
-            },
-            max_records=100,
-            company_id=company_id,
-            can_delete_government=can_delete_government,
-            can_manage_government_admins=can_manage_government_admins,
-            can_manage_operators=can_manage_operators
-        ),
-        "O": UserRules(
-            role="O",
-            allowed_fields={
-                "assets": ["id", "name", "code", "location"]
-            },
-            editable_fields={},
-            max_records=50,
-            company_id=company_id
-        )
-    }
-    return rules_map.get(role, rules_map["O"])
\ No newline at end of file
+def get_user_rules(role: str, company_id: Optional[int] = None, permissions: Optional[dict] = None) -> UserPolicy:
+    """Compiled field rules for a role; repeated calls with the same role, flags and company return the same object."""
+    return get_user_policy(role, company_id, permissions)
\ No newline at end of file
@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List
+from app.core.jobs.periodic import PeriodicJob, run_in_session
+from app.features.auth.data.models import LoginAttempt
+
+
+class _Shard:
+    __slots__ = ("lock", "attempts", "banned_until")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.attempts: Dict[str, Deque[float]] = {}
+        self.banned_until: Dict[str, float] = {}
+
+
+class LoginAttemptTracker(PeriodicJob):
+    """Sliding-window counter of failed logins per client IP, sharded by IP.
+
+    ``is_banned`` is a single dict lookup, so it can run on every request.
+    Attempts are buffered and written to ``login_attempts`` by ``flush`` for
+    auditing only; the database is never read to make a ban decision.
+    Attempts that do not fit in ``max_pending`` or belong to a failed flush
+    are counted as dropped and logged, so gaps in the audit trail show up in
+    ``stats``.
+    """
+
+    name = "login-attempt-flusher"
+
+    def __init__(
+        self,
+        max_attempts: int,
+        window_seconds: float,
+        ban_seconds: float,
+        shards: int = 16,
+        max_pending: int = 10000,
+        clock: Callable[[], float] = time.time
+    ):
+        super().__init__()
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.ban_seconds = ban_seconds
+        self.max_pending = max_pending
+        self._clock = clock
+        self._shards = [_Shard() for _ in range(shards)]
+        self._pending: List[dict] = []
+        self._pending_lock = threading.Lock()
+        self._dropped_since_flush = 0
+        self.written = 0
+        self.dropped = 0
+
+    def record_failure(self, ip_address: str, username: str) -> None:
+        now = self._clock()
+        shard = self._shard(ip_address)
+        with shard.lock:
+            window = shard.attempts.setdefault(ip_address, deque())
+            window.append(now)
+            self._trim(window, now)
+            if len(window) >= self.max_attempts:
+                shard.banned_until[ip_address] = now + self.ban_seconds
+        self._queue(ip_address, username, successful=False)
+
+    def record_success(self, ip_address: str, username: str) -> None:
+        self._queue(ip_address, username, successful=True)
+
+    def is_banned(self, ip_address: str) -> bool:
+        shard = self._shard(ip_address)
+        banned_until = shard.banned_until.get(ip_address)
+        if banned_until is None:
+            return False
+        if banned_until > self._clock():
+            return True
+        with shard.lock:
+            shard.banned_until.pop(ip_address, None)
+        return False
+
+    def flush(self, session_factory) -> int:
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+            overflow, self._dropped_since_flush = self._dropped_since_flush, 0
+        if overflow:
+            logging.warning(f"Login attempt queue full; dropped {overflow} attempts")
+        self._prune()
+        if not rows:
+            return 0
+        try:
+            run_in_session(
+                session_factory,
+                lambda db: db.bulk_insert_mappings(LoginAttempt, rows),
+                f"Failed to flush login attempts, dropped {len(rows)}"
+            )
+        except Exception:
+            with self._pending_lock:
+                self.dropped += len(rows)
+            return 0
+        self.written += len(rows)
+        return len(rows)
+
+    def stats(self) -> dict:
+        with self._pending_lock:
+            return {
+                "pending": len(self._pending),
+                "max_pending": self.max_pending,
+                "written": self.written,
+                "dropped": self.dropped
+            }
+
+    def run_once(self, session_factory) -> int:
+        return self.flush(session_factory)
+
+    def stop(self, session_factory=None) -> None:
+        super().stop()
+        if session_factory is not None:
+            self.flush(session_factory)
+
+    def _shard(self, ip_address: str) -> _Shard:
+        return self._shards[hash(ip_address) % len(self._shards)]
+
+    def _trim(self, window: Deque[float], now: float) -> None:
+        cutoff = now - self.window_seconds
+        while window and window[0] <= cutoff:
+            window.popleft()
+
+    def _queue(self, ip_address: str, username: str, successful: bool) -> None:
+        with self._pending_lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                self._dropped_since_flush += 1
+                return
+            self._pending.append({
+                "ip_address": ip_address,
+                "username": username,
+                "successful": successful,
+                "timestamp": datetime.utcnow()
+            })
+
+    def _prune(self) -> None:
+        now = self._clock()
+        for shard in self._shards:
+            with shard.lock:
+                for ip_address in list(shard.attempts):
+                    window = shard.attempts[ip_address]
+                    self._trim(window, now)
+                    if not window:
+                        del shard.attempts[ip_address]
+                for ip_address in [ip for ip, until in shard.banned_until.items() if until <= now]:
+                    del shard.banned_until[ip_address]
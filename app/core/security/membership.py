@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.models.company import Company
+from app.features.auth.data.models import User, UserCompanyRole
+
+
+@dataclass(frozen=True)
+class Membership:
+    company_id: int
+    company_name: Optional[str]
+    role: str
+    can_delete_government: bool
+    can_manage_government_admins: bool
+    can_manage_operators: bool
+
+
+_MEMBERSHIP_COLUMNS = (
+    UserCompanyRole.company_id,
+    Company.name,
+    UserCompanyRole.role,
+    UserCompanyRole.can_delete_government,
+    UserCompanyRole.can_manage_government_admins,
+    UserCompanyRole.can_manage_operators
+)
+
+
+def _membership(row) -> Membership:
+    company_id, company_name, role, can_delete_government, can_manage_government_admins, can_manage_operators = row
+    return Membership(
+        company_id=company_id,
+        company_name=company_name,
+        role=role,
+        can_delete_government=bool(can_delete_government),
+        can_manage_government_admins=bool(can_manage_government_admins),
+        can_manage_operators=bool(can_manage_operators)
+    )
+
+
+def _memberships_query(user_id: int):
+    # Ordered by membership id so the first row is the user's oldest membership,
+    # which the principal exposes as its default role and company.
+    return (
+        select(*_MEMBERSHIP_COLUMNS)
+        .join(Company, Company.id == UserCompanyRole.company_id)
+        .where(UserCompanyRole.user_id == user_id)
+        .order_by(UserCompanyRole.id)
+    )
+
+
+class MembershipResolver:
+    """Resolves a user's company memberships (company, role, permission flags) in one joined query.
+
+    Results are memoized per user for the lifetime of the resolver, so a
+    request that checks several companies for the same user queries once.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._memberships: Dict[int, List[Membership]] = {}
+
+    def for_user(self, user_id: int) -> List[Membership]:
+        if user_id not in self._memberships:
+            self._memberships[user_id] = [_membership(row) for row in self.db.execute(_memberships_query(user_id))]
+        return self._memberships[user_id]
+
+    def for_company(self, user_id: int, company_id: int) -> Optional[Membership]:
+        return next((m for m in self.for_user(user_id) if m.company_id == company_id), None)
+
+    def user_with_memberships(self, username: str) -> Tuple[Optional[User], List[Membership]]:
+        rows = self.db.execute(
+            select(User, *_MEMBERSHIP_COLUMNS)
+            .outerjoin(UserCompanyRole, UserCompanyRole.user_id == User.id)
+            .outerjoin(Company, Company.id == UserCompanyRole.company_id)
+            .where(User.username == username)
+            .order_by(UserCompanyRole.id)
+        ).all()
+        if not rows:
+            return None, []
+        user = rows[0][0]
+        memberships = [_membership(row[1:]) for row in rows if row[1] is not None]
+        self._memberships[user.id] = memberships
+        return user, memberships
+
+
+class AsyncMembershipResolver:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._memberships: Dict[int, List[Membership]] = {}
+
+    async def for_user(self, user_id: int) -> List[Membership]:
+        if user_id not in self._memberships:
+            self._memberships[user_id] = [_membership(row) for row in await self.db.execute(_memberships_query(user_id))]
+        return self._memberships[user_id]
+
+    async def for_company(self, user_id: int, company_id: int) -> Optional[Membership]:
+        return next((m for m in await self.for_user(user_id) if m.company_id == company_id), None)
@@ -0,0 +1,88 @@
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.security.membership import AsyncMembershipResolver, Membership, MembershipResolver
+
+_request_permissions: ContextVar[Optional[Dict[int, "PermissionContext"]]] = ContextVar("request_permissions", default=None)
+
+
+class PermissionContext:
+    """Answers role and permission questions for one user from memberships loaded once."""
+
+    def __init__(self, user_id: int, memberships: List[Membership]):
+        self.user_id = user_id
+        self.memberships = memberships
+        self._by_company: Dict[int, Membership] = {}
+        for membership in memberships:
+            self._by_company.setdefault(membership.company_id, membership)
+
+    @property
+    def is_super_admin(self) -> bool:
+        return any(membership.role == "S" for membership in self.memberships)
+
+    def membership(self, company_id: Optional[int]) -> Optional[Membership]:
+        return self._by_company.get(company_id)
+
+    def is_member(self, company_id: Optional[int]) -> bool:
+        return company_id in self._by_company
+
+    def role_in(self, company_id: Optional[int]) -> Optional[str]:
+        membership = self.membership(company_id)
+        return membership.role if membership else None
+
+    def can_manage_operators(self, company_id: Optional[int]) -> bool:
+        membership = self.membership(company_id)
+        return bool(membership and membership.can_manage_operators)
+
+    def can_manage_government_admins(self, company_id: Optional[int]) -> bool:
+        membership = self.membership(company_id)
+        return bool(membership and membership.can_manage_government_admins)
+
+    def can_delete_government(self, company_id: Optional[int]) -> bool:
+        membership = self.membership(company_id)
+        return bool(membership and membership.can_delete_government)
+
+
+def permissions_for(db: Session, user_id: int) -> PermissionContext:
+    """Permission context of ``user_id``, loaded at most once per request."""
+    contexts = _request_permissions.get()
+    if contexts is not None and user_id in contexts:
+        return contexts[user_id]
+    context = PermissionContext(user_id, MembershipResolver(db).for_user(user_id))
+    if contexts is not None:
+        contexts[user_id] = context
+    return context
+
+
+async def async_permissions_for(db: AsyncSession, user_id: int) -> PermissionContext:
+    contexts = _request_permissions.get()
+    if contexts is not None and user_id in contexts:
+        return contexts[user_id]
+    context = PermissionContext(user_id, await AsyncMembershipResolver(db).for_user(user_id))
+    if contexts is not None:
+        contexts[user_id] = context
+    return context
+
+
+def invalidate_permissions(user_id: int) -> None:
+    contexts = _request_permissions.get()
+    if contexts is not None:
+        contexts.pop(user_id, None)
+
+
+class PermissionContextMiddleware:
+    """Gives every request its own permission contexts; outside a request nothing is memoized."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _request_permissions.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_permissions.reset(token)
@@ -0,0 +1,173 @@
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, Iterable, List, Mapping, Optional
+from fastapi import HTTPException, status
+from app.core.models.user_rules import UserRules
+
+USER_POLICY_CACHE_MAX_SIZE = int(os.getenv("USER_POLICY_CACHE_MAX_SIZE", "4096"))
+
+_USER_FIELDS = ("id", "username", "phone_num", "email", "role", "company_id", "is_active")
+_USER_PERMISSION_FIELDS = ("can_delete_government", "can_manage_government_admins", "can_manage_operators")
+_ASSET_FIELDS = ("name", "asset_id", "location", "status", "rfid_tag", "gps_enabled", "geo_location")
+_ASSET_DETAIL_FIELDS = (
+    "category_id", "model", "serial_number", "technical_specs", "custodian", "value",
+    "registration_date", "warranty_end_date", "description", "created_at", "updated_at"
+)
+
+# role -> (allowed fields, editable fields, max records). A2 gets its user edit
+# rights from the can_manage_operators flag when compiled.
+_POLICY_TABLES = {
+    "S": (
+        {
+            "users": _USER_FIELDS + _USER_PERMISSION_FIELDS,
+            "companies": ("id", "name", "government_admin_id", "is_active"),
+            "assets": ("id", "company_id") + _ASSET_FIELDS + _ASSET_DETAIL_FIELDS
+        },
+        {
+            "users": _USER_FIELDS[1:] + _USER_PERMISSION_FIELDS,
+            "companies": ("name", "government_admin_id", "is_active"),
+            "assets": _ASSET_FIELDS
+        },
+        None
+    ),
+    "A1": (
+        {
+            "users": _USER_FIELDS + _USER_PERMISSION_FIELDS,
+            "assets": ("id", "company_id") + _ASSET_FIELDS + _ASSET_DETAIL_FIELDS
+        },
+        {
+            "users": ("username", "phone_num", "email", "role", "is_active") + _USER_PERMISSION_FIELDS,
+            "assets": _ASSET_FIELDS
+        },
+        1000
+    ),
+    "A2": (
+        {
+            "users": _USER_FIELDS,
+            "assets": ("id", "name", "asset_id", "location", "status")
+        },
+        {
+            "users": (),
+            "assets": ("location", "status")
+        },
+        100
+    ),
+    "O": (
+        {"assets": ("id", "name", "asset_id", "location")},
+        {},
+        50
+    )
+}
+_A2_OPERATOR_MANAGER_USER_EDITS = ("username", "phone_num", "email", "is_active")
+
+
+def _frozen(table: Mapping[str, Iterable[str]]) -> Mapping[str, FrozenSet[str]]:
+    return MappingProxyType({entity: frozenset(fields) for entity, fields in table.items()})
+
+
+@dataclass(frozen=True)
+class UserPolicy:
+    """Immutable field rules for one (role, permission flags, company) combination.
+
+    Built once per combination by ``get_user_policy``; every check is a set lookup.
+    """
+
+    role: str
+    company_id: Optional[int]
+    can_delete_government: bool
+    can_manage_government_admins: bool
+    can_manage_operators: bool
+    max_records: Optional[int]
+    allowed_fields: Mapping[str, FrozenSet[str]] = field(hash=False, compare=False)
+    editable_fields: Mapping[str, FrozenSet[str]] = field(hash=False, compare=False)
+
+    def allowed(self, entity: str) -> FrozenSet[str]:
+        return self.allowed_fields.get(entity, frozenset())
+
+    def editable(self, entity: str) -> FrozenSet[str]:
+        return self.editable_fields.get(entity, frozenset())
+
+    def can_view(self, entity: str, field_name: str) -> bool:
+        return field_name in self.allowed(entity)
+
+    def can_edit(self, entity: str, field_name: str) -> bool:
+        return field_name in self.editable(entity)
+
+    def project(self, entity: str, record: Mapping) -> dict:
+        allowed = self.allowed(entity)
+        return {key: value for key, value in record.items() if key in allowed}
+
+    def columns(self, entity: str, column_map: Mapping[str, object]) -> List:
+        """The entries of ``column_map`` this policy may read, labelled by field name, in map order."""
+        allowed = self.allowed(entity)
+        return [column.label(name) for name, column in column_map.items() if name in allowed]
+
+    def forbidden_edits(self, entity: str, field_names: Iterable[str]) -> FrozenSet[str]:
+        return frozenset(field_names) - self.editable(entity)
+
+    def check_editable(self, entity: str, field_names: Iterable[str]) -> None:
+        forbidden = self.forbidden_edits(entity, field_names)
+        if forbidden:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Not allowed to edit {entity} fields: {', '.join(sorted(forbidden))}"
+            )
+
+    def to_rules(self) -> UserRules:
+        return UserRules(
+            role=self.role,
+            allowed_fields={entity: sorted(fields) for entity, fields in self.allowed_fields.items()},
+            editable_fields={entity: sorted(fields) for entity, fields in self.editable_fields.items()},
+            max_records=self.max_records,
+            company_id=self.company_id,
+            can_delete_government=self.can_delete_government,
+            can_manage_government_admins=self.can_manage_government_admins,
+            can_manage_operators=self.can_manage_operators
+        )
+
+
+@lru_cache(maxsize=USER_POLICY_CACHE_MAX_SIZE)
+def compile_policy(
+    role: str,
+    can_delete_government: bool = False,
+    can_manage_government_admins: bool = False,
+    can_manage_operators: bool = False,
+    company_id: Optional[int] = None
+) -> UserPolicy:
+    if role not in _POLICY_TABLES:
+        role = "O"
+    allowed, editable, max_records = _POLICY_TABLES[role]
+    if role == "A2" and can_manage_operators:
+        editable = {**editable, "users": _A2_OPERATOR_MANAGER_USER_EDITS}
+    # Only A2 carries permission flags; other roles' rights follow from the role alone.
+    flags = (can_delete_government, can_manage_government_admins, can_manage_operators) if role == "A2" else (False, False, False)
+    return UserPolicy(
+        role=role,
+        company_id=None if role == "S" else company_id,
+        can_delete_government=flags[0],
+        can_manage_government_admins=flags[1],
+        can_manage_operators=flags[2],
+        max_records=max_records,
+        allowed_fields=_frozen(allowed),
+        editable_fields=_frozen(editable)
+    )
+
+
+def principal_policy(current_user: dict) -> UserPolicy:
+    """Policy of an authenticated principal, using the flags of its default company membership."""
+    company_id = current_user.get("company_id")
+    membership = next((c for c in current_user.get("companies") or [] if c["company_id"] == company_id), None)
+    return get_user_policy(current_user.get("role"), company_id, membership)
+
+
+def get_user_policy(role: str, company_id: Optional[int] = None, permissions: Optional[Mapping] = None) -> UserPolicy:
+    permissions = permissions or {}
+    return compile_policy(
+        role,
+        bool(permissions.get("can_delete_government", False)),
+        bool(permissions.get("can_manage_government_admins", False)),
+        bool(permissions.get("can_manage_operators", False)),
+        company_id
+    )
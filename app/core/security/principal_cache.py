@@ -0,0 +1,50 @@
+import threading
+from typing import Dict, Optional, Set
+from app.core.cache.ttl_cache import TTLCache
+
+
+class PrincipalCache:
+    """Caches the principal resolved by ``get_current_user`` per bearer token.
+
+    Entries are evicted by TTL and LRU size, and every token of a user can be
+    dropped at once with ``invalidate_user`` when their role, status or
+    memberships change.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl, on_evict=self._forget)
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, token: str) -> Optional[dict]:
+        principal = self._cache.get(token)
+        return dict(principal) if principal is not None else None
+
+    def set(self, token: str, principal: dict) -> None:
+        with self._lock:
+            self._tokens_by_user.setdefault(principal["id"], set()).add(token)
+            self._cache.set(token, dict(principal))
+
+    def invalidate_token(self, token: str) -> None:
+        self._cache.pop(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._cache.pop(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens_by_user.clear()
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    def _forget(self, token: str, principal: dict) -> None:
+        with self._lock:
+            tokens = self._tokens_by_user.get(principal["id"])
+            if tokens is not None and token not in self._cache:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[principal["id"]]
@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenRevocationList:
+    """In-memory revocation set for short-lived principal tokens.
+
+    Single tokens are revoked by ``jti`` until they expire (logout); all tokens of a
+    user issued up to a point in time are revoked with ``revoke_user``.
+    Entries are pruned once no token they could match is still valid, so the
+    set stays bounded by the token lifetime.
+    """
+
+    def __init__(self, token_lifetime_seconds: float):
+        self.token_lifetime_seconds = token_lifetime_seconds
+        self._revoked_tokens: Dict[str, float] = {}
+        self._revoked_users: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._revoked_tokens[jti] = expires_at
+
+    def revoke_user(self, user_id: int, issued_before: Optional[float] = None) -> None:
+        cutoff = issued_before if issued_before is not None else time.time()
+        with self._lock:
+            self._revoked_users[user_id] = max(cutoff, self._revoked_users.get(user_id, 0.0))
+
+    def is_token_revoked(self, jti: Optional[str]) -> bool:
+        now = time.time()
+        if now >= self._next_prune:
+            self._prune(now)
+        return jti is not None and jti in self._revoked_tokens
+
+    def is_revoked(self, payload: dict) -> bool:
+        if self.is_token_revoked(payload.get("jti")):
+            return True
+        cutoff = self._revoked_users.get(int(payload["sub"]))
+        return cutoff is not None and float(payload.get("iat", 0)) <= cutoff
+
+    def __len__(self) -> int:
+        return len(self._revoked_tokens) + len(self._revoked_users)
+
+    def _prune(self, now: float) -> None:
+        with self._lock:
+            self._revoked_tokens = {jti: exp for jti, exp in self._revoked_tokens.items() if exp > now}
+            self._revoked_users = {
+                user_id: cutoff for user_id, cutoff in self._revoked_users.items()
+                if cutoff + self.token_lifetime_seconds > now
+            }
+            self._next_prune = now + 60
@@ -1,5 +1,8 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.concurrency import run_in_threadpool
+import inspect
 import os
 from app.core.models.base import Base
 
@@ -8,13 +11,29 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postg
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _async_database_url(url: str) -> str:
+    scheme, _, rest = url.partition("://")
+    if scheme in ("postgresql", "postgres", "postgresql+psycopg2"):
+        return f"postgresql+asyncpg://{rest}"
+    if scheme == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_database_url(SQLALCHEMY_DATABASE_URL))
+# Comma separated router names (e.g. "assets,workflows,logs") or "*" for all.
+ASYNC_DB_ROUTERS = {name.strip() for name in os.getenv("ASYNC_DB_ROUTERS", "").split(",") if name.strip()}
+
+_async_engine: AsyncEngine = None
+AsyncSessionLocal: async_sessionmaker = None
+
 from app.core.models.company import Company
 from app.features.auth.data.models import User, UserCompanyRole, OtpToken, ResetCode, LoginAttempt
 from app.features.logs.data.models import Log
 from app.features.subscription.data.models import Subscription
-from app.features.assets_management.data.models import Asset, AssetStatusHistory
+from app.features.assets_management.data.models import Asset, AssetStatusHistory, CompanyAssetStats
 from app.features.assets_loan_management.data.models import AssetLoan
 from app.features.work_flow.data.models import WorkFlow
+from app.features.assets_gps_management.data.models import AssetLocation, AssetLocationHistory, AssetTrackSegment
 
 Base.metadata.create_all(bind=engine, checkfirst=True)
 
@@ -24,3 +43,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True)
+        AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine():
+    global _async_engine, AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        AsyncSessionLocal = None
+
+def use_async_db(router_name: str) -> bool:
+    return "*" in ASYNC_DB_ROUTERS or router_name in ASYNC_DB_ROUTERS
+
+async def call_service(method, *args, **kwargs):
+    # Async services are awaited on the loop; sync ones are pushed to the threadpool
+    # so their blocking Session I/O never stalls other requests.
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
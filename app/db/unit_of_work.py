@@ -0,0 +1,98 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.db import engine, get_async_engine
+
+class UnitOfWorkSession(Session):
+    """Session whose ``commit()`` only flushes.
+
+    Repositories and services written against a plain Session commit after
+    every write. Bound to a unit of work those calls just push SQL to the
+    open transaction; the unit of work issues the single real commit.
+    """
+
+    def commit(self) -> None:
+        self.flush()
+
+    def complete(self) -> None:
+        super().commit()
+
+UnitOfWorkSessionLocal = sessionmaker(class_=UnitOfWorkSession, autocommit=False, autoflush=False, bind=engine)
+
+class UnitOfWork:
+    def __init__(self, session: UnitOfWorkSession):
+        self.session = session
+
+    def commit(self) -> None:
+        self.session.complete()
+
+    def rollback(self) -> None:
+        self.session.rollback()
+
+    def close(self) -> None:
+        self.session.close()
+
+class AsyncUnitOfWork:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.run_sync(UnitOfWorkSession.complete)
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    async def close(self) -> None:
+        await self.session.close()
+
+def on_commit(session, callback, on_rollback=None) -> None:
+    """Run ``callback`` once the session's transaction really commits, or ``on_rollback`` if it rolls back.
+
+    Only one of the two ever runs. Inside a unit of work ``commit()`` just flushes,
+    so the callback waits for the unit of work's single real commit.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    if not sync_session.in_transaction():
+        sync_session.begin()
+
+    def committed(_):
+        event.remove(sync_session, "after_rollback", rolled_back)
+        callback()
+
+    def rolled_back(_):
+        event.remove(sync_session, "after_commit", committed)
+        if on_rollback is not None:
+            on_rollback()
+
+    event.listen(sync_session, "after_commit", committed, once=True)
+    event.listen(sync_session, "after_rollback", rolled_back, once=True)
+
+_async_uow_session_factory: async_sessionmaker = None
+
+def get_unit_of_work():
+    uow = UnitOfWork(UnitOfWorkSessionLocal())
+    try:
+        yield uow
+        uow.commit()
+    except Exception:
+        uow.rollback()
+        raise
+    finally:
+        uow.close()
+
+async def get_async_unit_of_work():
+    global _async_uow_session_factory
+    async_engine = get_async_engine()
+    if _async_uow_session_factory is None or _async_uow_session_factory.kw.get("bind") is not async_engine:
+        _async_uow_session_factory = async_sessionmaker(
+            async_engine, sync_session_class=UnitOfWorkSession, autoflush=False, expire_on_commit=False
+        )
+    uow = AsyncUnitOfWork(_async_uow_session_factory())
+    try:
+        yield uow
+        await uow.commit()
+    except Exception:
+        await uow.rollback()
+        raise
+    finally:
+        await uow.close()
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
 from app.features.assets_gps_management.data.repository import GpsRepository
-from app.features.assets_gps_management.data.schemas import AssetLocationCreate, AssetLocationResponse, GeofenceCheck
+from app.features.assets_gps_management.data.schemas import (
+    AssetLocationCreate, AssetLocationResponse, GeofenceBatchCheck, GeofenceBatchResult, GeofenceCheck,
+    GpsPingBatch, GpsPingBatchResult, NearbyAsset, TrackResponse
+)
 from app.features.assets_gps_management.service.gps_service import GpsService
-from app.db import get_db
+from app.db import call_service
+from app.db.unit_of_work import UnitOfWork, get_unit_of_work
 from app.core.security import get_current_user
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -11,8 +16,8 @@ from slowapi.util import get_remote_address
 router = APIRouter(prefix="/assets/gps", tags=["assets_gps"])
 limiter = Limiter(key_func=get_remote_address)
 
-def get_gps_service(db: Session = Depends(get_db)) -> GpsService:
-    repository = GpsRepository(db)
+def get_gps_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> GpsService:
+    repository = GpsRepository(uow.session)
     return GpsService(repository)
 
 @router.post("/", response_model=AssetLocationResponse)
@@ -23,7 +28,82 @@ async def create_location(
     gps_service: GpsService = Depends(get_gps_service),
     current_user: dict = Depends(get_current_user)
 ):
-    return gps_service.create_location(location, current_user)
+    return await call_service(gps_service.create_location, location, current_user)
+
+@router.post("/pings", response_model=GpsPingBatchResult)
+@limiter.limit("600/minute")
+async def ingest_pings(
+    request: Request,
+    batch: GpsPingBatch,
+    gps_service: GpsService = Depends(get_gps_service),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(gps_service.ingest_pings, batch, current_user)
+
+@router.get("/{asset_id}/track", response_model=TrackResponse)
+@limiter.limit("60/minute")
+async def get_track(
+    request: Request,
+    asset_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    zoom: int = 15,
+    gps_service: GpsService = Depends(get_gps_service),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(gps_service.get_track, asset_id, start, end, zoom, current_user)
+
+@router.get("/nearby", response_model=List[NearbyAsset])
+@limiter.limit("60/minute")
+async def assets_nearby(
+    request: Request,
+    company_id: int,
+    latitude: float,
+    longitude: float,
+    radius_m: float = 1000,
+    limit: int = 100,
+    gps_service: GpsService = Depends(get_gps_service),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(gps_service.assets_within_radius, company_id, latitude, longitude, radius_m, limit, current_user)
+
+@router.get("/bbox", response_model=List[NearbyAsset], response_model_exclude_none=True)
+@limiter.limit("60/minute")
+async def assets_in_bbox(
+    request: Request,
+    company_id: int,
+    min_latitude: float,
+    min_longitude: float,
+    max_latitude: float,
+    max_longitude: float,
+    limit: int = 100,
+    gps_service: GpsService = Depends(get_gps_service),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(gps_service.assets_in_bbox, company_id, min_latitude, min_longitude, max_latitude, max_longitude, limit, current_user)
+
+@router.get("/nearest", response_model=List[NearbyAsset])
+@limiter.limit("60/minute")
+async def nearest_assets(
+    request: Request,
+    company_id: int,
+    latitude: float,
+    longitude: float,
+    k: int = 10,
+    gps_service: GpsService = Depends(get_gps_service),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(gps_service.nearest_assets, company_id, latitude, longitude, k, current_user)
+
+@router.post("/check_geofence/batch", response_model=GeofenceBatchResult)
+@limiter.limit("10/minute")
+async def check_geofence_batch(
+    request: Request,
+    batch: GeofenceBatchCheck,
+    gps_service: GpsService = Depends(get_gps_service),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(gps_service.check_geofence_batch, batch, current_user)
 
 @router.post("/{asset_id}/check_geofence", response_model=dict)
 @limiter.limit("10/minute")
@@ -34,4 +114,4 @@ async def check_geofence(
     gps_service: GpsService = Depends(get_gps_service),
     current_user: dict = Depends(get_current_user)
 ):
-    return gps_service.check_geofence(asset_id, current_location, current_user)
\ No newline at end of file
+    return await call_service(gps_service.check_geofence, asset_id, current_location, current_user)
\ No newline at end of file
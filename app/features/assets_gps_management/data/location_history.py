@@ -0,0 +1,182 @@
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.jobs.periodic import PeriodicJob, run_in_session
+from app.features.assets_gps_management.data.models import AssetLocation, AssetLocationHistory
+from app.features.assets_gps_management.domain.geohash import GEOHASH_PRECISION, encode
+
+LOCATION_HISTORY_PARTITION_SECONDS = int(os.getenv("LOCATION_HISTORY_PARTITION_SECONDS", "86400"))
+LOCATION_HISTORY_PARTITION_MONTHS_AHEAD = int(os.getenv("LOCATION_HISTORY_PARTITION_MONTHS_AHEAD", "3"))
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# (asset_id, timestamp, latitude, longitude)
+Ping = Tuple[int, datetime, float, float]
+
+# PostgreSQL: the pings travel as five array parameters whatever the batch size, and
+# the history append and the latest-position upsert run as one statement.
+_PG_INGEST = text("""
+WITH pings AS (
+    SELECT * FROM unnest(:asset_ids, :timestamps, :latitudes, :longitudes)
+        AS ping(asset_id, "timestamp", latitude, longitude)
+), history AS (
+    INSERT INTO asset_location_history (asset_id, "timestamp", latitude, longitude)
+    SELECT asset_id, "timestamp", latitude, longitude FROM pings
+    ON CONFLICT DO NOTHING
+)
+INSERT INTO asset_locations (asset_id, last_latitude, last_longitude, last_seen_at, geohash, updated_at)
+SELECT latest.*, CAST(:now AS timestamp)
+FROM unnest(:latest_asset_ids, :latest_latitudes, :latest_longitudes, :latest_timestamps, :latest_geohashes)
+    AS latest(asset_id, latitude, longitude, "timestamp", geohash)
+ON CONFLICT (asset_id) DO UPDATE SET
+    last_latitude = excluded.last_latitude,
+    last_longitude = excluded.last_longitude,
+    last_seen_at = excluded.last_seen_at,
+    geohash = excluded.geohash,
+    updated_at = excluded.updated_at
+WHERE asset_locations.last_seen_at IS NULL OR asset_locations.last_seen_at < excluded.last_seen_at
+RETURNING asset_id, last_latitude, last_longitude, geohash
+""").bindparams(
+    bindparam("asset_ids", type_=postgresql.ARRAY(AssetLocationHistory.asset_id.type)),
+    bindparam("timestamps", type_=postgresql.ARRAY(AssetLocationHistory.timestamp.type)),
+    bindparam("latitudes", type_=postgresql.ARRAY(AssetLocationHistory.latitude.type)),
+    bindparam("longitudes", type_=postgresql.ARRAY(AssetLocationHistory.longitude.type)),
+    bindparam("latest_asset_ids", type_=postgresql.ARRAY(AssetLocation.asset_id.type)),
+    bindparam("latest_latitudes", type_=postgresql.ARRAY(AssetLocation.last_latitude.type)),
+    bindparam("latest_longitudes", type_=postgresql.ARRAY(AssetLocation.last_longitude.type)),
+    bindparam("latest_timestamps", type_=postgresql.ARRAY(AssetLocation.last_seen_at.type)),
+    bindparam("latest_geohashes", type_=postgresql.ARRAY(AssetLocation.geohash.type))
+)
+
+
+def latest_fixes(pings: Iterable[Ping]) -> Dict[int, Ping]:
+    """Newest ping per asset; an upsert may touch each latest-position row only once."""
+    latest: Dict[int, Ping] = {}
+    for ping in pings:
+        current = latest.get(ping[0])
+        if current is None or ping[1] > current[1]:
+            latest[ping[0]] = ping
+    return latest
+
+
+def _sqlite_statements():
+    upsert = _UPSERTS["sqlite"]
+    history = upsert(AssetLocationHistory).on_conflict_do_nothing()
+    latest = upsert(AssetLocation)
+    latest = latest.on_conflict_do_update(
+        index_elements=[AssetLocation.asset_id],
+        set_={
+            "last_latitude": latest.excluded.last_latitude,
+            "last_longitude": latest.excluded.last_longitude,
+            "last_seen_at": latest.excluded.last_seen_at,
+            "geohash": latest.excluded.geohash,
+            "updated_at": latest.excluded.updated_at
+        },
+        where=AssetLocation.last_seen_at.is_(None) | (AssetLocation.last_seen_at < latest.excluded.last_seen_at)
+    ).returning(AssetLocation.asset_id, AssetLocation.last_latitude, AssetLocation.last_longitude, AssetLocation.geohash)
+    return history, latest
+
+
+class LocationHistoryRepository:
+    """Bulk ingestion of tracker pings.
+
+    Every ping is appended to ``asset_location_history`` and the newest one
+    per asset is upserted into ``asset_locations`` (``last_*`` and
+    ``geohash``), never moving a position back to an older fix.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ingest(self, pings: List[Ping]) -> List[Tuple[int, float, float, str]]:
+        """Stores the pings; returns (asset_id, latitude, longitude, geohash) of each position that moved.
+
+        An asset whose stored fix is newer than anything in the batch (a
+        back-filled offline buffer) keeps its position and is not returned.
+        """
+        latest = latest_fixes(pings)
+        geohashes = {asset_id: encode(ping[2], ping[3], GEOHASH_PRECISION) for asset_id, ping in latest.items()}
+        now = datetime.utcnow()
+        connection = self.db.connection()
+        if self.db.get_bind().dialect.name == "postgresql":
+            moved = connection.execute(_PG_INGEST, {
+                "asset_ids": [ping[0] for ping in pings],
+                "timestamps": [ping[1] for ping in pings],
+                "latitudes": [ping[2] for ping in pings],
+                "longitudes": [ping[3] for ping in pings],
+                "latest_asset_ids": list(latest),
+                "latest_latitudes": [ping[2] for ping in latest.values()],
+                "latest_longitudes": [ping[3] for ping in latest.values()],
+                "latest_timestamps": [ping[1] for ping in latest.values()],
+                "latest_geohashes": [geohashes[asset_id] for asset_id in latest],
+                "now": now
+            })
+        else:
+            moved = self._ingest_rows(connection, pings, latest, geohashes, now)
+        return [tuple(row) for row in moved]
+
+    @staticmethod
+    def _ingest_rows(connection, pings: List[Ping], latest: Dict[int, Ping], geohashes: Dict[int, str], now: datetime):
+        history, upsert = _sqlite_statements()
+        connection.execute(history, [
+            {"asset_id": asset_id, "timestamp": timestamp, "latitude": latitude, "longitude": longitude}
+            for asset_id, timestamp, latitude, longitude in pings
+        ])
+        return connection.execute(upsert, [
+            {
+                "asset_id": asset_id, "last_latitude": latitude, "last_longitude": longitude, "last_seen_at": timestamp,
+                "geohash": geohashes[asset_id], "updated_at": now
+            }
+            for asset_id, timestamp, latitude, longitude in latest.values()
+        ])
+
+
+def _month_start(day: date, months: int = 0) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_statements(today: date, months_ahead: int) -> List[str]:
+    """DDL for the DEFAULT partition plus one partition per month from this month on."""
+    statements = ["CREATE TABLE IF NOT EXISTS asset_location_history_default PARTITION OF asset_location_history DEFAULT"]
+    for offset in range(months_ahead + 1):
+        start, end = _month_start(today, offset), _month_start(today, offset + 1)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS asset_location_history_{start:%Y_%m} PARTITION OF asset_location_history "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    return statements
+
+
+class LocationHistoryPartitioner(PeriodicJob):
+    """Keeps monthly ``asset_location_history`` partitions created ahead of time on PostgreSQL.
+
+    Pings are rejected when they claim a future time, so the DEFAULT partition
+    only ever holds back-filled history and never blocks a new month.
+    """
+
+    name = "location-history-partitioner"
+    run_at_start = True
+
+    def __init__(self):
+        super().__init__()
+        self.runs = 0
+
+    def run_once(self, session_factory, today: Optional[date] = None) -> int:
+        def create(db: Session) -> int:
+            if db.get_bind().dialect.name != "postgresql":
+                return 0
+            statements = partition_statements(today or datetime.utcnow().date(), LOCATION_HISTORY_PARTITION_MONTHS_AHEAD)
+            for statement in statements:
+                db.execute(text(statement))
+            return len(statements)
+
+        created = run_in_session(session_factory, create, "Failed to create location history partitions")
+        self.runs += 1
+        return created
+
+
+location_history_partitioner = LocationHistoryPartitioner()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, String, LargeBinary, Index
 from datetime import datetime
 from app.core.models.base import Base
 
@@ -7,7 +7,44 @@ class AssetLocation(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     asset_id = Column(Integer, ForeignKey("assets.id"), unique=True, index=True)
-    latitude = Column(Float)
+    latitude = Column(Float)  # geofence anchor; null for rows created by tracker pings
     longitude = Column(Float)
     geofence_radius = Column(Float, nullable=True)  # شعاع محدوده (متر)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    last_latitude = Column(Float, nullable=True)  # latest tracker fix
+    last_longitude = Column(Float, nullable=True)
+    last_seen_at = Column(DateTime, nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)  # cell of the latest fix (or the anchor); prefix = grid cell, see domain/geohash.py
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class AssetLocationHistory(Base):
+    """Append-only tracker fixes. The primary key doubles as the (asset_id, timestamp)
+    index and makes re-sent pings no-ops; on PostgreSQL the table is range-partitioned
+    by month (see ``location_history.LocationHistoryPartitioner``)."""
+    __tablename__ = "asset_location_history"
+
+    asset_id = Column(Integer, ForeignKey("assets.id"), primary_key=True)
+    timestamp = Column(DateTime, primary_key=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+
+    __table_args__ = (
+        {"postgresql_partition_by": 'RANGE ("timestamp")'},
+    )
+
+class AssetTrackSegment(Base):
+    """A compacted stretch of ``asset_location_history``: the simplified fixes of one
+    asset-day packed by ``domain.trajectory.encode_track``."""
+    __tablename__ = "asset_track_segments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    asset_id = Column(Integer, ForeignKey("assets.id"), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    raw_count = Column(Integer, nullable=False)  # pings before compaction
+    point_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_asset_track_segments_asset_start', 'asset_id', 'start_time'),
+    )
\ No newline at end of file
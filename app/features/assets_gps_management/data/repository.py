@@ -1,9 +1,11 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.features.assets_management.data.models import Asset
 from app.features.assets_gps_management.data.models import AssetLocation
 from app.features.assets_gps_management.data.schemas import AssetLocationCreate
-from typing import Optional
+from app.features.assets_gps_management.domain.geohash import GEOHASH_PRECISION, encode
+from typing import List, Optional, Tuple
 
 class GpsRepository:
     def __init__(self, db: Session):
@@ -13,19 +15,63 @@ class GpsRepository:
         if not self.db.query(Asset).filter(Asset.id == location.asset_id).first():
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
         
-        if self.db.query(AssetLocation).filter(AssetLocation.asset_id == location.asset_id).first():
+        db_location = self.db.query(AssetLocation).filter(AssetLocation.asset_id == location.asset_id).first()
+        if db_location is not None and db_location.latitude is not None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Location already exists for this asset")
-        
+        if db_location is not None:
+            # Row created by tracker pings: set its geofence anchor, keep its latest fix.
+            db_location.latitude = location.latitude
+            db_location.longitude = location.longitude
+            db_location.geofence_radius = location.geofence_radius
+            self.db.flush()
+            return db_location
+
         db_location = AssetLocation(
             asset_id=location.asset_id,
             latitude=location.latitude,
             longitude=location.longitude,
-            geofence_radius=location.geofence_radius
+            geofence_radius=location.geofence_radius,
+            geohash=encode(location.latitude, location.longitude, GEOHASH_PRECISION)
         )
         self.db.add(db_location)
-        self.db.commit()
-        self.db.refresh(db_location)
+        self.db.flush()
         return db_location
 
     def get_location_by_asset_id(self, asset_id: int) -> Optional[AssetLocation]:
-        return self.db.query(AssetLocation).filter(AssetLocation.asset_id == asset_id).first()
\ No newline at end of file
+        return self.db.query(AssetLocation).filter(AssetLocation.asset_id == asset_id).first()
+
+    def get_geofence_anchors(self, company_id: int, asset_ids: Optional[List[int]] = None) -> List[Tuple[int, float, float, Optional[float]]]:
+        """(asset_id, latitude, longitude, geofence_radius) for the located assets of a company (optionally only ``asset_ids``), in one query."""
+        query = (
+            select(AssetLocation.asset_id, AssetLocation.latitude, AssetLocation.longitude, AssetLocation.geofence_radius)
+            .join(Asset, Asset.id == AssetLocation.asset_id)
+            .where(Asset.company_id == company_id, AssetLocation.latitude.is_not(None), AssetLocation.longitude.is_not(None))
+        )
+        if asset_ids is not None:
+            query = query.where(AssetLocation.asset_id.in_(asset_ids))
+        return [tuple(row) for row in self.db.connection().execute(query)]
+
+    def get_asset_names(self, asset_ids: List[int]) -> dict:
+        return dict(self.db.connection().execute(select(Asset.id, Asset.name).where(Asset.id.in_(asset_ids))).all())
+
+    def get_company_asset_ids(self, company_id: int, asset_ids: List[int]) -> set:
+        query = select(Asset.id).where(Asset.company_id == company_id, Asset.id.in_(asset_ids))
+        return set(self.db.connection().execute(query).scalars())
+
+    def get_spatial_points(self, company_id: int) -> List[Tuple[int, float, float, str]]:
+        """(asset_id, latitude, longitude, geohash) of every located asset of a company, in one query.
+
+        The position is the latest tracker fix, or the geofence anchor for assets without pings.
+        """
+        latitude = func.coalesce(AssetLocation.last_latitude, AssetLocation.latitude)
+        longitude = func.coalesce(AssetLocation.last_longitude, AssetLocation.longitude)
+        query = (
+            select(AssetLocation.asset_id, latitude, longitude, AssetLocation.geohash)
+            .join(Asset, Asset.id == AssetLocation.asset_id)
+            .where(Asset.company_id == company_id, latitude.is_not(None), longitude.is_not(None))
+        )
+        # Rows written before the geohash column existed are hashed on load.
+        return [
+            (asset_id, latitude, longitude, cell or encode(latitude, longitude, GEOHASH_PRECISION))
+            for asset_id, latitude, longitude, cell in self.db.connection().execute(query)
+        ]
\ No newline at end of file
@@ -1,6 +1,18 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+import os
+
+GEOFENCE_BATCH_MAX = int(os.getenv("GEOFENCE_BATCH_MAX", 50000))
+GPS_PING_BATCH_MAX = int(os.getenv("GPS_PING_BATCH_MAX", 10000))
+GPS_PING_MAX_FUTURE_SECONDS = int(os.getenv("GPS_PING_MAX_FUTURE_SECONDS", 300))
+TRACK_DEFAULT_HOURS = int(os.getenv("TRACK_DEFAULT_HOURS", 24))
+TRACK_MAX_RANGE_DAYS = int(os.getenv("TRACK_MAX_RANGE_DAYS", 31))
+TRACK_MAX_ZOOM = 22
+# Dropped fixes stay within this many screen pixels of the returned polyline.
+TRACK_PIXEL_TOLERANCE = float(os.getenv("TRACK_PIXEL_TOLERANCE", 1.0))
+SPATIAL_QUERY_MAX_RESULTS = int(os.getenv("SPATIAL_QUERY_MAX_RESULTS", 1000))
+SPATIAL_QUERY_MAX_RADIUS_M = float(os.getenv("SPATIAL_QUERY_MAX_RADIUS_M", 100000))
 
 class AssetLocationCreate(BaseModel):
     asset_id: int
@@ -14,6 +26,10 @@ class AssetLocationResponse(BaseModel):
     latitude: float
     longitude: float
     geofence_radius: Optional[float]
+    last_latitude: Optional[float] = None
+    last_longitude: Optional[float] = None
+    last_seen_at: Optional[datetime] = None
+    geohash: Optional[str] = None
     updated_at: datetime
 
     class Config:
@@ -21,4 +37,62 @@ class AssetLocationResponse(BaseModel):
 
 class GeofenceCheck(BaseModel):
     latitude: float
-    longitude: float
\ No newline at end of file
+    longitude: float
+
+class GeofenceFix(BaseModel):
+    asset_id: int
+    latitude: float
+    longitude: float
+
+class GeofenceBatchCheck(BaseModel):
+    company_id: int
+    fixes: List[GeofenceFix] = Field(..., min_length=1, max_length=GEOFENCE_BATCH_MAX)
+
+class GeofenceBreach(BaseModel):
+    asset_id: int
+    distance_m: float
+    geofence_radius: float
+
+class GeofenceBatchResult(BaseModel):
+    company_id: int
+    checked: int
+    within_count: int
+    outside: List[GeofenceBreach]
+    unknown_asset_ids: List[int]
+
+class NearbyAsset(BaseModel):
+    asset_id: int
+    latitude: float
+    longitude: float
+    distance_m: Optional[float] = None
+
+class GpsPing(BaseModel):
+    asset_id: int
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    timestamp: datetime
+
+class GpsPingBatch(BaseModel):
+    company_id: int
+    pings: List[GpsPing] = Field(..., min_length=1, max_length=GPS_PING_BATCH_MAX)
+
+class GpsPingBatchResult(BaseModel):
+    company_id: int
+    accepted: int
+    assets: int
+    unknown_asset_ids: List[int]
+    future_pings: int
+
+class TrackPoint(BaseModel):
+    latitude: float
+    longitude: float
+    timestamp: datetime
+
+class TrackResponse(BaseModel):
+    asset_id: int
+    start: datetime
+    end: datetime
+    zoom: int
+    tolerance_m: float
+    source_points: int
+    points: List[TrackPoint]
\ No newline at end of file
@@ -0,0 +1,159 @@
+import math
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, List, Optional, Tuple
+import numpy as np
+from app.db.unit_of_work import on_commit
+from app.core.cache.ttl_cache import TTLCache
+from app.features.assets_gps_management.domain.geofence import EARTH_RADIUS_M, haversine_many
+from app.features.assets_gps_management.domain.geohash import (
+    GEOHASH_PRECISION, PREFIX_END, covering_cells, covering_precision
+)
+
+SPATIAL_INDEX_MAX_COMPANIES = int(os.getenv("SPATIAL_INDEX_MAX_COMPANIES", "256"))
+SPATIAL_INDEX_TTL_SECONDS = int(os.getenv("SPATIAL_INDEX_TTL_SECONDS", "300"))
+SPATIAL_QUERY_MAX_CELLS = int(os.getenv("SPATIAL_QUERY_MAX_CELLS", "64"))
+NEAREST_START_RADIUS_M = 500.0
+
+# (asset_id, latitude, longitude, geohash)
+Point = Tuple[int, float, float, str]
+
+
+def _lon_ranges(min_lon: float, max_lon: float) -> List[Tuple[float, float]]:
+    # Boxes running past +-180 are split at the antimeridian.
+    if max_lon - min_lon >= 360:
+        return [(-180.0, 180.0)]
+    if min_lon < -180:
+        return [(min_lon + 360, 180.0), (-180.0, max_lon)]
+    if max_lon > 180:
+        return [(min_lon, 180.0), (-180.0, max_lon - 360)]
+    return [(min_lon, max_lon)]
+
+
+class CompanyGrid:
+    """Located assets of one company, ordered by geohash.
+
+    Every geohash prefix is a grid cell, so the assets of a cell are one
+    bisect range of the sorted keys (the in-memory twin of the indexed
+    ``asset_locations.geohash`` column). Queries collect the cells covering
+    their bounding box at the finest precision that keeps the cover small,
+    then filter the candidates exactly with a vectorized haversine.
+    """
+
+    def __init__(self, points: Iterable[Point]):
+        self._lock = threading.Lock()
+        self.positions = {asset_id: (latitude, longitude, cell) for asset_id, latitude, longitude, cell in points}
+        entries = sorted((cell, asset_id) for asset_id, (_, _, cell) in self.positions.items())
+        self.keys = [cell for cell, _ in entries]
+        self.ids = [asset_id for _, asset_id in entries]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def move(self, asset_id: int, latitude: float, longitude: float, cell: str) -> None:
+        with self._lock:
+            previous = self.positions.get(asset_id)
+            if previous is not None:
+                index = bisect_left(self.keys, previous[2])
+                while self.ids[index] != asset_id:
+                    index += 1
+                del self.keys[index], self.ids[index]
+            index = bisect_right(self.keys, cell)
+            self.keys.insert(index, cell)
+            self.ids.insert(index, asset_id)
+            self.positions[asset_id] = (latitude, longitude, cell)
+
+    def within_radius(self, latitude: float, longitude: float, radius_m: float, limit: Optional[int] = None) -> List[dict]:
+        angle = radius_m / EARTH_RADIUS_M
+        min_lat, max_lat = latitude - math.degrees(angle), latitude + math.degrees(angle)
+        spread = math.sin(angle) / math.cos(math.radians(latitude)) if abs(latitude) < 90 else 2.0
+        if min_lat <= -90 or max_lat >= 90 or angle >= math.pi / 2 or spread >= 1:
+            lon_ranges = [(-180.0, 180.0)]
+        else:
+            delta_lon = math.degrees(math.asin(spread))
+            lon_ranges = _lon_ranges(longitude - delta_lon, longitude + delta_lon)
+        ids, latitudes, longitudes = self._candidates(max(min_lat, -90.0), min(max_lat, 90.0), lon_ranges)
+        distances = haversine_many(np.full(len(ids), latitude), np.full(len(ids), longitude), latitudes, longitudes)
+        inside = (distances <= radius_m).nonzero()[0]
+        order = inside[np.argsort(distances[inside], kind="stable")][:limit]
+        return [
+            {"asset_id": int(ids[i]), "latitude": float(latitudes[i]), "longitude": float(longitudes[i]), "distance_m": float(distances[i])}
+            for i in order.tolist()
+        ]
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, limit: Optional[int] = None) -> List[dict]:
+        # min_lon > max_lon means the box crosses the antimeridian.
+        lon_ranges = _lon_ranges(min_lon, max_lon + 360 if min_lon > max_lon else max_lon)
+        ids, latitudes, longitudes = self._candidates(min_lat, max_lat, lon_ranges)
+        inside = (latitudes >= min_lat) & (latitudes <= max_lat)
+        inside &= np.logical_or.reduce([(longitudes >= low) & (longitudes <= high) for low, high in lon_ranges])
+        order = inside.nonzero()[0]
+        order = order[np.argsort(ids[order], kind="stable")][:limit]
+        return [
+            {"asset_id": int(ids[i]), "latitude": float(latitudes[i]), "longitude": float(longitudes[i])}
+            for i in order.tolist()
+        ]
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> List[dict]:
+        # Widen the radius until it holds k assets; anything outside it is farther than all of them.
+        radius_m = NEAREST_START_RADIUS_M
+        while True:
+            found = self.within_radius(latitude, longitude, radius_m)
+            if len(found) >= k or len(found) == len(self) or radius_m >= math.pi * EARTH_RADIUS_M:
+                return found[:k]
+            radius_m *= 4
+
+    def _candidates(self, min_lat: float, max_lat: float, lon_ranges: List[Tuple[float, float]]):
+        with self._lock:
+            ids = []
+            for min_lon, max_lon in lon_ranges:
+                precision = covering_precision(min_lat, min_lon, max_lat, max_lon, SPATIAL_QUERY_MAX_CELLS, GEOHASH_PRECISION)
+                if precision == 0:
+                    ids = list(self.ids)
+                    break
+                for prefix in covering_cells(min_lat, min_lon, max_lat, max_lon, precision):
+                    ids.extend(self.ids[bisect_left(self.keys, prefix):bisect_left(self.keys, prefix + PREFIX_END)])
+            points = [self.positions[asset_id] for asset_id in ids]
+        latitudes = np.array([point[0] for point in points], dtype=np.float64)
+        longitudes = np.array([point[1] for point in points], dtype=np.float64)
+        return np.array(ids, dtype=np.int64), latitudes, longitudes
+
+
+class SpatialIndex:
+    """Process-wide company_id -> ``CompanyGrid`` cache behind the "assets near me" queries.
+
+    A grid is loaded from ``asset_locations.geohash`` on first use, moved in
+    place when a location is written through this process, and rebuilt after
+    ``ttl`` seconds so writes made by other workers are picked up.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._grids = TTLCache(max_size=max_size, ttl=ttl)
+
+    def grid(self, company_id: int, load: Callable[[], Iterable[Point]]) -> CompanyGrid:
+        grid = self._grids.get(company_id)
+        if grid is None:
+            grid = CompanyGrid(load())
+            self._grids.set(company_id, grid)
+        return grid
+
+    def move(self, company_id: int, asset_id: int, latitude: float, longitude: float, cell: str) -> None:
+        grid = self._grids.get(company_id)
+        if grid is not None:
+            grid.move(asset_id, latitude, longitude, cell)
+
+    def move_on_commit(self, session, company_id: int, points: List[Point]) -> None:
+        def moved():
+            for asset_id, latitude, longitude, cell in points:
+                self.move(company_id, asset_id, latitude, longitude, cell)
+        on_commit(session, moved)
+
+    def clear(self) -> None:
+        self._grids.clear()
+
+    def stats(self) -> dict:
+        return self._grids.stats()
+
+
+spatial_index = SpatialIndex(max_size=SPATIAL_INDEX_MAX_COMPANIES, ttl=SPATIAL_INDEX_TTL_SECONDS)
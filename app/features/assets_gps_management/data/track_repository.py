@@ -0,0 +1,141 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.core.jobs.periodic import PeriodicJob, run_in_session
+from app.features.assets_gps_management.data.models import AssetLocationHistory, AssetTrackSegment
+from app.features.assets_gps_management.domain.trajectory import bucket_indices, decode_track, encode_track, simplify
+
+TRACK_COMPACTION_SECONDS = int(os.getenv("TRACK_COMPACTION_SECONDS", "3600"))
+# Raw pings younger than this many whole days stay in asset_location_history.
+TRACK_COMPACT_AFTER_DAYS = int(os.getenv("TRACK_COMPACT_AFTER_DAYS", "2"))
+TRACK_COMPACTION_BATCH = int(os.getenv("TRACK_COMPACTION_BATCH", "500"))
+TRACK_BUCKET_SECONDS = int(os.getenv("TRACK_BUCKET_SECONDS", "60"))
+TRACK_BASE_TOLERANCE_M = float(os.getenv("TRACK_BASE_TOLERANCE_M", "5"))
+
+# (epoch seconds, latitudes, longitudes), sorted by time
+Track = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def epoch_seconds(timestamps) -> np.ndarray:
+    return np.array(timestamps, dtype="datetime64[s]").astype(np.int64)
+
+
+def _history_window(asset_id: int, start: datetime, end: datetime):
+    return (
+        AssetLocationHistory.asset_id == asset_id,
+        AssetLocationHistory.timestamp >= start,
+        AssetLocationHistory.timestamp < end
+    )
+
+
+class TrackRepository:
+    """An asset's GPS track, read from compacted segments plus the raw history not yet compacted."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_track(self, asset_id: int, start: datetime, end: datetime) -> Track:
+        connection = self.db.connection()
+        segments = connection.execute(
+            select(AssetTrackSegment.data)
+            .where(AssetTrackSegment.asset_id == asset_id, AssetTrackSegment.start_time < end, AssetTrackSegment.end_time >= start)
+        ).scalars()
+        raw = connection.execute(
+            select(AssetLocationHistory.timestamp, AssetLocationHistory.latitude, AssetLocationHistory.longitude)
+            .where(*_history_window(asset_id, start, end))
+        ).all()
+        parts = [decode_track(data) for data in segments]
+        parts.append((epoch_seconds([row[0] for row in raw]), np.array([row[1] for row in raw]), np.array([row[2] for row in raw])))
+        seconds, latitudes, longitudes = (np.concatenate(column) for column in zip(*parts))
+        inside = ((seconds >= epoch_seconds(start)) & (seconds < epoch_seconds(end))).nonzero()[0]
+        order = inside[np.argsort(seconds[inside], kind="stable")]
+        return seconds[order], latitudes[order], longitudes[order]
+
+    def compaction_candidates(self, cutoff: datetime, limit: int) -> List[Tuple[int, datetime]]:
+        """(asset_id, oldest raw ping) for assets with raw history older than ``cutoff``."""
+        return [tuple(row) for row in self.db.connection().execute(
+            select(AssetLocationHistory.asset_id, func.min(AssetLocationHistory.timestamp))
+            .where(AssetLocationHistory.timestamp < cutoff)
+            .group_by(AssetLocationHistory.asset_id)
+            .limit(limit)
+        )]
+
+    def compact(self, asset_id: int, start: datetime, end: datetime, bucket_seconds: int, tolerance_m: float) -> int:
+        """Replaces the raw pings of one window with a single bucketed, simplified segment.
+
+        The segment is built from exactly the rows the DELETE removed, so a ping
+        back-filled mid-compaction stays raw for the next run, and a concurrent
+        compactor of the same window gets no rows instead of a duplicate segment.
+        """
+        connection = self.db.connection()
+        rows = sorted(connection.execute(
+            delete(AssetLocationHistory)
+            .where(*_history_window(asset_id, start, end))
+            .returning(AssetLocationHistory.timestamp, AssetLocationHistory.latitude, AssetLocationHistory.longitude)
+        ).all())
+        if not rows:
+            return 0
+        seconds = epoch_seconds([row[0] for row in rows])
+        latitudes, longitudes = np.array([row[1] for row in rows]), np.array([row[2] for row in rows])
+        bucketed = bucket_indices(seconds, bucket_seconds)
+        kept = bucketed[simplify(latitudes[bucketed], longitudes[bucketed], tolerance_m)]
+        connection.execute(insert(AssetTrackSegment).values(
+            asset_id=asset_id,
+            start_time=rows[0][0],
+            end_time=rows[-1][0],
+            raw_count=len(rows),
+            point_count=len(kept),
+            data=encode_track(seconds[kept], latitudes[kept], longitudes[kept]),
+            created_at=datetime.utcnow()
+        ))
+        return len(rows)
+
+
+class TrackCompactor(PeriodicJob):
+    """Folds raw GPS history older than ``TRACK_COMPACT_AFTER_DAYS`` into one
+    segment per asset-day on a fixed interval.
+
+    Each asset-day commits on its own, so a failed day is retried on the next
+    run and late pings for a compacted day simply become a second segment.
+    """
+
+    name = "track-compactor"
+
+    def __init__(self):
+        super().__init__()
+        self.runs = 0
+        self.compacted_pings = 0
+
+    def run_once(self, session_factory, now: Optional[datetime] = None) -> int:
+        now = now or datetime.utcnow()
+        cutoff = datetime(now.year, now.month, now.day) - timedelta(days=TRACK_COMPACT_AFTER_DAYS)
+        compacted_days = 0
+        while compacted_days < TRACK_COMPACTION_BATCH:
+            limit = TRACK_COMPACTION_BATCH - compacted_days
+            compacted = run_in_session(
+                session_factory,
+                lambda db: self._compact_batch(db, cutoff, limit),
+                "Failed to compact GPS tracks"
+            )
+            if not compacted:
+                break
+            compacted_days += compacted
+        self.runs += 1
+        return compacted_days
+
+    def _compact_batch(self, db: Session, cutoff: datetime, limit: int) -> int:
+        repository = TrackRepository(db)
+        candidates = repository.compaction_candidates(cutoff, limit)
+        for asset_id, oldest in candidates:
+            day = datetime(oldest.year, oldest.month, oldest.day)
+            self.compacted_pings += repository.compact(
+                asset_id, day, day + timedelta(days=1), TRACK_BUCKET_SECONDS, TRACK_BASE_TOLERANCE_M
+            )
+            db.commit()
+        return len(candidates)
+
+
+track_compactor = TrackCompactor()
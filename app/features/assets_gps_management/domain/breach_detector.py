@@ -0,0 +1,135 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+GEOFENCE_HYSTERESIS_M = float(os.getenv("GEOFENCE_HYSTERESIS_M", "25"))
+GEOFENCE_CONFIRM_FIXES = int(os.getenv("GEOFENCE_CONFIRM_FIXES", "2"))
+# The band never exceeds this share of the radius, so small fences can still be re-entered.
+GEOFENCE_MAX_HYSTERESIS_RATIO = 0.25
+
+EXIT = "exit"
+ENTER = "enter"
+
+
+class _FenceState:
+    # ``previous`` is the state this one replaced, kept only until its fixes
+    # commit so a rollback can put it back; ``reverted`` marks a rolled-back state.
+    __slots__ = ("inside", "pending", "previous", "reverted")
+
+    def __init__(self, previous: Optional["_FenceState"] = None):
+        self.inside = previous.inside if previous is not None else True
+        self.pending = previous.pending if previous is not None else 0
+        self.previous = previous
+        self.reverted = False
+
+
+class GeofenceBreachDetector:
+    """Last known inside/outside state per asset, turning a stream of fixes into
+    exit / re-enter transitions.
+
+    A fix only counts toward a transition once it clears the fence edge by the
+    hysteresis band (outward to exit, inward to re-enter), and the state flips
+    after ``confirm_fixes`` such fixes in a row, so GPS jitter around the edge
+    never produces events. Assets start inside; the state is per process and
+    is rebuilt from the next fixes after a restart.
+
+    ``stage`` steps and installs new states in one go under the lock, so
+    concurrent callers always build on each other's fixes. The caller then
+    confirms them with ``apply`` once its transaction commits, or undoes them
+    with ``revert`` on rollback.
+    """
+
+    def __init__(self, hysteresis_m: float, confirm_fixes: int):
+        self.hysteresis_m = hysteresis_m
+        self.confirm_fixes = max(confirm_fixes, 1)
+        self._states: Dict[int, _FenceState] = {}
+        self._lock = threading.RLock()
+        self.transitions = 0
+
+    def observe(self, asset_id: int, distance_m: float, radius_m: Optional[float]) -> Optional[str]:
+        """Feeds one fix; returns ``EXIT`` or ``ENTER`` when the state flips, else None."""
+        return self.observe_many([asset_id], [distance_m], [radius_m]).get(asset_id)
+
+    def observe_many(self, asset_ids: List[int], distances_m: List[float], radii_m: List[Optional[float]]) -> Dict[int, str]:
+        transitions, staged = self.stage(asset_ids, distances_m, radii_m)
+        self.apply(staged, len(transitions))
+        return transitions
+
+    def stage(self, asset_ids: List[int], distances_m: List[float], radii_m: List[Optional[float]]) -> Tuple[Dict[int, str], Dict[int, _FenceState]]:
+        """Runs fixes in order and installs the resulting states; returns the transitions and the installed states."""
+        transitions, staged = {}, {}
+        with self._lock:
+            for asset_id, distance_m, radius_m in zip(asset_ids, distances_m, radii_m):
+                if radius_m is None or not radius_m > 0:  # also rejects NaN (no radius) from GeofenceEngine
+                    continue
+                state = staged.get(asset_id)
+                if state is None:
+                    # A fresh object per caller: installed states are never mutated
+                    # again, so ``revert`` can tell whether someone built on top of it.
+                    state = staged[asset_id] = self._states[asset_id] = _FenceState(self._states.get(asset_id))
+                transition = self._step(state, distance_m, radius_m)
+                if transition is not None:
+                    transitions[asset_id] = transition
+        return transitions, staged
+
+    def apply(self, staged: Dict[int, _FenceState], transitions: int = 0) -> None:
+        """Confirms states installed by ``stage``."""
+        with self._lock:
+            for state in staged.values():
+                state.previous = None
+            self.transitions += transitions
+
+    def revert(self, staged: Dict[int, _FenceState]) -> None:
+        """Undoes states installed by ``stage``.
+
+        A state is only put back while it is still the current one; if a later
+        caller already stepped on top of it, that caller's state stays and is
+        itself reverted past this one should it roll back too.
+        """
+        with self._lock:
+            for asset_id, state in staged.items():
+                state.reverted = True
+                if self._states.get(asset_id) is not state:
+                    continue
+                previous = state.previous
+                while previous is not None and previous.reverted:
+                    previous = previous.previous
+                if previous is None:
+                    self._states.pop(asset_id, None)
+                else:
+                    self._states[asset_id] = previous
+                state.previous = None
+
+    def _step(self, state: _FenceState, distance_m: float, radius_m: float) -> Optional[str]:
+        band = min(self.hysteresis_m, radius_m * GEOFENCE_MAX_HYSTERESIS_RATIO)
+        crossing = distance_m > radius_m + band if state.inside else distance_m < radius_m - band
+        if not crossing:
+            state.pending = 0
+            return None
+        state.pending += 1
+        if state.pending < self.confirm_fixes:
+            return None
+        state.inside = not state.inside
+        state.pending = 0
+        return ENTER if state.inside else EXIT
+
+    def is_inside(self, asset_id: int) -> bool:
+        with self._lock:
+            state = self._states.get(asset_id)
+            return state is None or state.inside
+
+    def forget(self, asset_id: int) -> None:
+        with self._lock:
+            self._states.pop(asset_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            outside = sum(1 for state in self._states.values() if not state.inside)
+            return {"tracked": len(self._states), "outside": outside, "transitions": self.transitions}
+
+
+breach_detector = GeofenceBreachDetector(hysteresis_m=GEOFENCE_HYSTERESIS_M, confirm_fixes=GEOFENCE_CONFIRM_FIXES)
@@ -0,0 +1,63 @@
+import math
+from typing import Iterable, Sequence, Tuple
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two points given in degrees."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_phi = math.radians(lat2 - lat1)
+    delta_lambda = math.radians(lon2 - lon1)
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def haversine_many(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Element-wise ``haversine`` over arrays of degrees."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GeofenceEngine:
+    """Geofence anchors of many assets held as NumPy arrays, sorted by asset id.
+
+    A batch of position fixes is matched to its anchors with one
+    ``searchsorted`` and measured in one vectorized haversine pass. Assets
+    without a radius (or a radius of 0) are always within their geofence,
+    as in ``CheckGeofenceUseCase``.
+    """
+
+    def __init__(self, anchors: Iterable[Tuple[int, float, float, float]]):
+        rows = np.array(list(anchors), dtype=np.float64).reshape(-1, 4)
+        rows = rows[np.argsort(rows[:, 0], kind="stable")]
+        self.asset_ids = rows[:, 0].astype(np.int64)
+        self.latitudes = rows[:, 1]
+        self.longitudes = rows[:, 2]
+        self.radii = rows[:, 3]
+
+    def __len__(self) -> int:
+        return len(self.asset_ids)
+
+    def evaluate(self, asset_ids: Sequence[int], latitudes: Sequence[float], longitudes: Sequence[float]):
+        """Returns ``(known, distances, radii, within)`` aligned with the fixes.
+
+        ``known`` marks fixes whose asset has an anchor; the other arrays are
+        only meaningful where ``known`` is true.
+        """
+        ids = np.asarray(asset_ids, dtype=np.int64)
+        if not len(self.asset_ids):
+            return np.zeros(len(ids), dtype=bool), np.zeros(len(ids)), np.zeros(len(ids)), np.zeros(len(ids), dtype=bool)
+        positions = np.searchsorted(self.asset_ids, ids).clip(max=len(self.asset_ids) - 1)
+        known = self.asset_ids[positions] == ids
+        distances = haversine_many(
+            self.latitudes[positions], self.longitudes[positions],
+            np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64)
+        )
+        radii = self.radii[positions]
+        within = np.isnan(radii) | (radii <= 0) | (distances <= radii)
+        return known, distances, radii, within
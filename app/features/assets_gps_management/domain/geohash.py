@@ -0,0 +1,76 @@
+import math
+from typing import Iterator, List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Stored precision of asset_locations.geohash: cells of about 4.8 m x 4.8 m.
+GEOHASH_PRECISION = 9
+# Sorts after every BASE32 character, so [prefix, prefix + PREFIX_END) is a prefix range.
+PREFIX_END = "~"
+
+
+def encode(latitude: float, longitude: float, precision: int) -> str:
+    """Standard geohash of a point: interleaved longitude/latitude bisection bits, 5 per character."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        bounds, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell at ``precision``."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def _steps(low: float, high: float, step: float, origin: float) -> Iterator[float]:
+    # One sample per cell row/column, taken at the cell centers the box touches.
+    first = math.floor((low - origin) / step)
+    last = math.floor((high - origin) / step)
+    for index in range(first, last + 1):
+        yield origin + (index + 0.5) * step
+
+
+def _clamp(max_lat: float, max_lon: float, height: float, width: float) -> Tuple[float, float]:
+    # Points on the north pole / antimeridian belong to the last row / column.
+    return min(max_lat, 90.0 - height / 2), min(max_lon, 180.0 - width / 2)
+
+
+def cell_count(min_lat: float, min_lon: float, max_lat: float, max_lon: float, precision: int) -> int:
+    height, width = cell_size(precision)
+    max_lat, max_lon = _clamp(max_lat, max_lon, height, width)
+    rows = math.floor((max_lat + 90) / height) - math.floor((min_lat + 90) / height) + 1
+    columns = math.floor((max_lon + 180) / width) - math.floor((min_lon + 180) / width) + 1
+    return rows * columns
+
+
+def covering_cells(min_lat: float, min_lon: float, max_lat: float, max_lon: float, precision: int) -> List[str]:
+    """Geohash cells at ``precision`` that intersect the box (which must not cross the antimeridian)."""
+    height, width = cell_size(precision)
+    max_lat, max_lon = _clamp(max_lat, max_lon, height, width)
+    return [
+        encode(latitude, longitude, precision)
+        for latitude in _steps(min_lat, max_lat, height, -90.0)
+        for longitude in _steps(min_lon, max_lon, width, -180.0)
+    ]
+
+
+def covering_precision(min_lat: float, min_lon: float, max_lat: float, max_lon: float, max_cells: int, max_precision: int) -> int:
+    """Finest precision whose cover of the box has at most ``max_cells`` cells (0 when even one character is too many)."""
+    for precision in range(max_precision, 0, -1):
+        if cell_count(min_lat, min_lon, max_lat, max_lon, precision) <= max_cells:
+            return precision
+    return 0
@@ -1,8 +1,9 @@
 from fastapi import HTTPException, status
 from app.features.assets_gps_management.data.repository import GpsRepository
-from app.features.assets_gps_management.data.schemas import AssetLocationCreate
+from app.features.assets_gps_management.data.schemas import AssetLocationCreate, GeofenceFix
 from app.features.assets_gps_management.data.models import AssetLocation
-import math
+from app.features.assets_gps_management.domain.geofence import GeofenceEngine, haversine
+from typing import List, Optional, Tuple
 
 class CreateLocationUseCase:
     def __init__(self, repository: GpsRepository):
@@ -16,23 +17,39 @@ class CheckGeofenceUseCase:
         self.repository = repository
 
     def execute(self, asset_id: int, current_latitude: float, current_longitude: float) -> bool:
+        distance, radius = self.measure(asset_id, current_latitude, current_longitude)
+        return distance is None or distance <= radius
+
+    def measure(self, asset_id: int, current_latitude: float, current_longitude: float) -> Tuple[Optional[float], Optional[float]]:
+        """(distance from the anchor, geofence radius) in meters; (None, None) when no geofence is defined."""
         location = self.repository.get_location_by_asset_id(asset_id)
         if not location:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Location not found for this asset")
         
         if not location.geofence_radius:
-            return True  # محدوده‌ای تعریف نشده
+            return None, None  # محدوده‌ای تعریف نشده
         
         # محاسبه فاصله با فرمول Haversine
-        def haversine(lat1, lon1, lat2, lon2):
-            R = 6371000  # شعاع زمین (متر)
-            phi1 = math.radians(lat1)
-            phi2 = math.radians(lat2)
-            delta_phi = math.radians(lat2 - lat1)
-            delta_lambda = math.radians(lon2 - lon1)
-            a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            return R * c
-
         distance = haversine(location.latitude, location.longitude, current_latitude, current_longitude)
-        return distance <= location.geofence_radius
\ No newline at end of file
+        return distance, location.geofence_radius
+
+class BatchCheckGeofenceUseCase:
+    def __init__(self, repository: GpsRepository):
+        self.repository = repository
+
+    def execute(self, company_id: int, fixes: List[GeofenceFix]) -> dict:
+        engine = GeofenceEngine(self.repository.get_geofence_anchors(company_id))
+        known, distances, radii, within = engine.evaluate(
+            [fix.asset_id for fix in fixes], [fix.latitude for fix in fixes], [fix.longitude for fix in fixes]
+        )
+        outside = (known & ~within).nonzero()[0]
+        return {
+            "company_id": company_id,
+            "checked": int(known.sum()),
+            "within_count": int((known & within).sum()),
+            "outside": [
+                {"asset_id": fixes[i].asset_id, "distance_m": float(distances[i]), "geofence_radius": float(radii[i])}
+                for i in outside.tolist()
+            ],
+            "unknown_asset_ids": [fixes[i].asset_id for i in (~known).nonzero()[0].tolist()]
+        }
\ No newline at end of file
@@ -1,13 +1,32 @@
 from fastapi import HTTPException, status
+from app.core.logger.audit_sink import audit_sink
+from app.core.security import principal_membership
+from app.db.unit_of_work import on_commit
 from app.features.assets_gps_management.data.repository import GpsRepository
-from app.features.assets_gps_management.data.schemas import AssetLocationCreate, AssetLocationResponse, GeofenceCheck
-from app.features.assets_gps_management.domain.use_cases import CheckGeofenceUseCase
-from app.features.logs.data.models import Log
+from app.features.assets_gps_management.data.location_history import LocationHistoryRepository
+from app.features.assets_gps_management.data.schemas import (
+    AssetLocationCreate, AssetLocationResponse, GeofenceBatchCheck, GeofenceCheck, GpsPingBatch,
+    GPS_PING_MAX_FUTURE_SECONDS, SPATIAL_QUERY_MAX_RADIUS_M, SPATIAL_QUERY_MAX_RESULTS,
+    TRACK_DEFAULT_HOURS, TRACK_MAX_RANGE_DAYS, TRACK_MAX_ZOOM, TRACK_PIXEL_TOLERANCE
+)
+from app.features.assets_gps_management.data.track_repository import TrackRepository
+from app.features.assets_gps_management.domain.breach_detector import EXIT, breach_detector
+from app.features.assets_gps_management.domain.geofence import GeofenceEngine
+from app.features.assets_gps_management.domain.trajectory import simplify, tolerance_for_zoom
+from app.features.assets_gps_management.data.spatial_index import CompanyGrid, spatial_index
+from app.features.assets_gps_management.domain.use_cases import BatchCheckGeofenceUseCase, CheckGeofenceUseCase
 from app.features.work_flow.data.repository import WorkFlowRepository
 from app.features.work_flow.data.models import WorkflowActionType
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 from app.features.assets_management.data.models import Asset
 
+def _utc(timestamp: datetime) -> datetime:
+    # Stored timestamps are naive UTC.
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
 class GpsService:
     def __init__(self, repository: GpsRepository):
         self.repository = repository
@@ -19,17 +38,26 @@ class GpsService:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can create locations")
         
         db_location = self.repository.create_location(location)
-        self._log_action(
+        asset = self.db.query(Asset).filter(Asset.id == location.asset_id).first()
+        self._require_membership(current_user, asset.company_id)
+        breach_detector.forget(location.asset_id)
+        if db_location.last_seen_at is None:
+            spatial_index.move_on_commit(
+                self.db, asset.company_id, [(location.asset_id, db_location.latitude, db_location.longitude, db_location.geohash)]
+            )
+        audit_sink.log(
             user_id=current_user["id"],
+            company_id=asset.company_id,
             action="LOCATION_CREATE",
             entity_type="ASSET_LOCATION",
             entity_id=db_location.id,
-            details=f"Created location for asset {location.asset_id}"
+            details=f"Created location for asset {location.asset_id}",
+            session=self.db
         )
-        asset = self.db.query(Asset).filter(Asset.id == location.asset_id).first()
-        self.workflow_repository.create_workflow(
+        self.workflow_repository.record_workflow(
             company_id=asset.company_id,
             user_id=current_user["id"],
+            admin_name=current_user["username"],
             asset_id=location.asset_id,
             asset_name=asset.name,
             action_type=WorkflowActionType.TRANSFERRED,
@@ -41,35 +69,194 @@ class GpsService:
         if current_user["role"] not in ["S", "A1", "A2"]:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can check geofence")
         
-        is_within_geofence = CheckGeofenceUseCase(self.repository).execute(
+        distance, radius = CheckGeofenceUseCase(self.repository).measure(
             asset_id, current_location.latitude, current_location.longitude
         )
-        self._log_action(
+        asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
+        self._require_membership(current_user, asset.company_id)
+        # Read-only: only a confirmed exit / re-entry is written, as a workflow and audit event.
+        staged = {}
+        if distance is not None:
+            transitions, staged = self._stage_breaches([asset_id], [distance], [radius])
+            if transitions:
+                self._record_transitions(asset.company_id, transitions, {asset_id: asset.name}, current_user)
+        inside = staged[asset_id].inside if asset_id in staged else breach_detector.is_inside(asset_id)
+        return {
+            "asset_id": asset_id,
+            "is_within_geofence": distance is None or distance <= radius,
+            "geofence_state": "inside" if inside else "outside"
+        }
+
+    def check_geofence_batch(self, batch: GeofenceBatchCheck, current_user: dict) -> dict:
+        if current_user["role"] not in ["S", "A1", "A2"]:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can check geofence")
+        self._require_membership(current_user, batch.company_id)
+
+        result = BatchCheckGeofenceUseCase(self.repository).execute(batch.company_id, batch.fixes)
+        # One summary entry per sweep; per-asset audit rows would be as many writes as fixes.
+        audit_sink.log(
             user_id=current_user["id"],
-            action="GEOFENCE_CHECK",
+            company_id=batch.company_id,
+            action="GEOFENCE_BATCH_CHECK",
             entity_type="ASSET_LOCATION",
-            entity_id=asset_id,
-            details=f"Checked geofence for asset {asset_id}: {'within' if is_within_geofence else 'outside'}"
+            entity_id=None,
+            details=f"Checked geofence for {result['checked']} assets: {len(result['outside'])} outside, {len(result['unknown_asset_ids'])} unknown"
         )
-        asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
-        self.workflow_repository.create_workflow(
-            company_id=asset.company_id,
-            user_id=current_user["id"],
-            asset_id=asset_id,
-            asset_name=asset.name,
-            action_type=WorkflowActionType.STATUS_CHANGED,
-            details=f"Geofence check: {'within' if is_within_geofence else 'outside'} geofence"
+        return result
+
+    def ingest_pings(self, batch: GpsPingBatch, current_user: dict) -> dict:
+        if current_user["role"] not in ["S", "A1", "A2"]:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can report positions")
+        self._require_membership(current_user, batch.company_id)
+
+        known = self.repository.get_company_asset_ids(batch.company_id, list({ping.asset_id for ping in batch.pings}))
+        horizon = datetime.utcnow() + timedelta(seconds=GPS_PING_MAX_FUTURE_SECONDS)
+        pings, unknown, future = [], set(), 0
+        for ping in batch.pings:
+            timestamp = _utc(ping.timestamp)
+            if ping.asset_id not in known:
+                unknown.add(ping.asset_id)
+            elif timestamp > horizon:
+                # A skewed tracker clock would otherwise park rows in the wrong history partition.
+                future += 1
+            else:
+                pings.append((ping.asset_id, timestamp, ping.latitude, ping.longitude))
+
+        # Telemetry is not audited per batch; a fleet reporting every 30 s would drown the audit log.
+        moved = LocationHistoryRepository(self.db).ingest(pings) if pings else []
+        spatial_index.move_on_commit(self.db, batch.company_id, moved)
+        self._detect_breaches(batch.company_id, pings, current_user)
+        return {
+            "company_id": batch.company_id,
+            "accepted": len(pings),
+            "assets": len({ping[0] for ping in pings}),
+            "unknown_asset_ids": sorted(unknown),
+            "future_pings": future
+        }
+
+    def _detect_breaches(self, company_id: int, pings: List[tuple], current_user: dict) -> None:
+        # The batch is fed to the detector in time order, as the stream it came from.
+        if not pings:
+            return
+        anchors = self.repository.get_geofence_anchors(company_id, list({ping[0] for ping in pings}))
+        if not anchors:
+            return
+        pings = sorted(pings, key=lambda ping: ping[1])
+        known, distances, radii, _ = GeofenceEngine(anchors).evaluate(
+            [ping[0] for ping in pings], [ping[2] for ping in pings], [ping[3] for ping in pings]
         )
-        return {"asset_id": asset_id, "is_within_geofence": is_within_geofence}
-
-    def _log_action(self, user_id: int, action: str, entity_type: str, entity_id: int = None, details: str = ""):
-        log = Log(
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-            timestamp=datetime.utcnow()
+        tracked = known.nonzero()[0]
+        transitions, _ = self._stage_breaches(
+            [pings[i][0] for i in tracked.tolist()], distances[tracked].tolist(), radii[tracked].tolist()
         )
-        self.db.add(log)
-        self.db.commit()
\ No newline at end of file
+        if transitions:
+            self._record_transitions(company_id, transitions, self.repository.get_asset_names(list(transitions)), current_user)
+
+    def _stage_breaches(self, asset_ids: List[int], distances: List[float], radii: List[float]) -> Tuple[Dict[int, str], dict]:
+        # Detector states move right away so concurrent requests see each other's fixes; a rollback undoes them.
+        transitions, staged = breach_detector.stage(asset_ids, distances, radii)
+        if staged:
+            on_commit(
+                self.db,
+                lambda: breach_detector.apply(staged, len(transitions)),
+                on_rollback=lambda: breach_detector.revert(staged)
+            )
+        return transitions, staged
+
+    def _record_transitions(self, company_id: int, transitions: Dict[int, str], names: Dict[int, str], current_user: dict) -> None:
+        workflows = []
+        for asset_id, transition in transitions.items():
+            details = "Left geofence" if transition == EXIT else "Re-entered geofence"
+            audit_sink.log(
+                user_id=current_user["id"],
+                company_id=company_id,
+                action="GEOFENCE_EXIT" if transition == EXIT else "GEOFENCE_ENTER",
+                entity_type="ASSET_LOCATION",
+                entity_id=asset_id,
+                details=f"Asset {asset_id}: {details.lower()}",
+                session=self.db
+            )
+            workflows.append({
+                "company_id": company_id,
+                "user_id": current_user["id"],
+                "admin_name": current_user["username"],
+                "asset_id": asset_id,
+                "asset_name": names.get(asset_id),
+                "action_type": WorkflowActionType.STATUS_CHANGED,
+                "details": details
+            })
+        self.workflow_repository.create_workflows_bulk(workflows)
+
+    def get_track(
+        self, asset_id: int, start: Optional[datetime], end: Optional[datetime], zoom: int, current_user: dict
+    ) -> dict:
+        asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
+        if not asset:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+        self._require_membership(current_user, asset.company_id)
+        end = _utc(end) if end else datetime.utcnow()
+        start = _utc(start) if start else end - timedelta(hours=TRACK_DEFAULT_HOURS)
+        if not start < end <= start + timedelta(days=TRACK_MAX_RANGE_DAYS):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"start must precede end by at most {TRACK_MAX_RANGE_DAYS} days")
+        if not 0 <= zoom <= TRACK_MAX_ZOOM:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"zoom must be between 0 and {TRACK_MAX_ZOOM}")
+
+        seconds, latitudes, longitudes = TrackRepository(self.db).get_track(asset_id, start, end)
+        tolerance_m = tolerance_for_zoom(zoom, float(latitudes.mean()) if len(latitudes) else 0.0, TRACK_PIXEL_TOLERANCE)
+        kept = simplify(latitudes, longitudes, tolerance_m)
+        timestamps = seconds[kept].astype("datetime64[s]").tolist()
+        return {
+            "asset_id": asset_id,
+            "start": start,
+            "end": end,
+            "zoom": zoom,
+            "tolerance_m": tolerance_m,
+            "source_points": len(seconds),
+            "points": [
+                {"latitude": latitude, "longitude": longitude, "timestamp": timestamp}
+                for latitude, longitude, timestamp in zip(latitudes[kept].tolist(), longitudes[kept].tolist(), timestamps)
+            ]
+        }
+
+    def assets_within_radius(
+        self, company_id: int, latitude: float, longitude: float, radius_m: float, limit: int, current_user: dict
+    ) -> List[dict]:
+        self._check_point(latitude, longitude)
+        if not 0 < radius_m <= SPATIAL_QUERY_MAX_RADIUS_M:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"radius_m must be in (0, {SPATIAL_QUERY_MAX_RADIUS_M:g}]")
+        return self._company_grid(company_id, current_user).within_radius(latitude, longitude, radius_m, self._limit(limit))
+
+    def assets_in_bbox(
+        self, company_id: int, min_latitude: float, min_longitude: float, max_latitude: float, max_longitude: float,
+        limit: int, current_user: dict
+    ) -> List[dict]:
+        self._check_point(min_latitude, min_longitude)
+        self._check_point(max_latitude, max_longitude)
+        if min_latitude > max_latitude:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="min_latitude must not exceed max_latitude")
+        return self._company_grid(company_id, current_user).within_bbox(
+            min_latitude, min_longitude, max_latitude, max_longitude, self._limit(limit)
+        )
+
+    def nearest_assets(self, company_id: int, latitude: float, longitude: float, k: int, current_user: dict) -> List[dict]:
+        self._check_point(latitude, longitude)
+        return self._company_grid(company_id, current_user).nearest(latitude, longitude, self._limit(k))
+
+    def _company_grid(self, company_id: int, current_user: dict) -> CompanyGrid:
+        self._require_membership(current_user, company_id)
+        return spatial_index.grid(company_id, lambda: self.repository.get_spatial_points(company_id))
+
+    @staticmethod
+    def _check_point(latitude: float, longitude: float) -> None:
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Coordinates out of range")
+
+    @staticmethod
+    def _limit(limit: int) -> int:
+        if not 1 <= limit <= SPATIAL_QUERY_MAX_RESULTS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"limit must be between 1 and {SPATIAL_QUERY_MAX_RESULTS}")
+        return limit
+
+    def _require_membership(self, current_user: dict, company_id: int) -> None:
+        if not principal_membership(current_user, company_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not associated with this company")
\ No newline at end of file
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
 from app.features.assets_loan_management.data.repository import LoanRepository
 from app.features.assets_loan_management.data.schemas import AssetLoanCreate, AssetLoanResponse
 from app.features.assets_loan_management.service.loan_service import LoanService
-from app.db import get_db
+from app.db.unit_of_work import UnitOfWork, get_unit_of_work
 from app.core.security import get_current_user
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -11,9 +10,9 @@ from slowapi.util import get_remote_address
 router = APIRouter(prefix="/assets/loans", tags=["assets_loans"])
 limiter = Limiter(key_func=get_remote_address)
 
-def get_loan_service(db: Session = Depends(get_db)) -> LoanService:
-    repository = LoanRepository(db)
-    return LoanService(repository, db)
+def get_loan_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> LoanService:
+    repository = LoanRepository(uow.session)
+    return LoanService(repository, uow.session)
 
 @router.post("/", response_model=AssetLoanResponse)
 @limiter.limit("5/minute")
@@ -1,7 +1,9 @@
-import datetime
+from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.features.assets_management.data.models import Asset, AssetStatus, AssetStatusHistory
+from app.features.assets_management.data.asset_stats import AssetStatsRepository, asset_stats_snapshot
+from app.features.assets_management.data.rfid_cache import rfid_cache
 from app.features.assets_loan_management.data.models import AssetLoan
 from app.features.assets_loan_management.data.schemas import AssetLoanCreate
 from app.features.auth.data.models import User
@@ -40,8 +42,11 @@ class LoanRepository:
         self.db.add(db_loan)
         
         # به‌روزرسانی وضعیت دارایی
+        stats_before = asset_stats_snapshot(asset)
         asset.status = AssetStatus.ON_LOAN
         self.db.add(asset)
+        AssetStatsRepository(self.db).apply(stats_before, asset_stats_snapshot(asset))
+        rfid_cache.invalidate_on_commit(self.db, asset.rfid_tag)
 
         # ثبت تاریخچه وضعیت
         status_history = AssetStatusHistory(
@@ -53,8 +58,7 @@ class LoanRepository:
         )
         self.db.add(status_history)
         
-        self.db.commit()
-        self.db.refresh(db_loan)
+        self.db.flush()
         return db_loan
 
     def return_loan(self, loan_id: int, user_id: int) -> AssetLoan:
@@ -70,7 +74,10 @@ class LoanRepository:
         
         # به‌روزرسانی وضعیت دارایی
         asset = self.db.query(Asset).filter(Asset.id == loan.asset_id).first()
+        stats_before = asset_stats_snapshot(asset)
         asset.status = AssetStatus.ACTIVE
+        AssetStatsRepository(self.db).apply(stats_before, asset_stats_snapshot(asset))
+        rfid_cache.invalidate_on_commit(self.db, asset.rfid_tag)
         
         # ثبت تاریخچه وضعیت
         status_history = AssetStatusHistory(
@@ -82,6 +89,5 @@ class LoanRepository:
         )
         self.db.add(status_history)
         
-        self.db.commit()
-        self.db.refresh(loan)
+        self.db.flush()
         return loan
\ No newline at end of file
@@ -1,59 +1,114 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
 from app.features.assets_management.data.repository import AssetRepository
-from app.features.assets_management.data.schemas import AssetCreate, AssetResponse, AssetCategoryCreate, AssetCategoryResponse
-from app.features.assets_management.service.asset_service import AssetService
-from app.db import get_db
+from app.features.assets_management.data.async_repository import AsyncAssetRepository
+from app.features.assets_management.data.schemas import AssetCreate, AssetResponse, AssetRow, ProjectedAssetResponse, AssetCategoryCreate, AssetCategoryResponse, RfidScanBatch, RfidScanBatchResponse, CompanyAssetStatsResponse
+from app.features.assets_management.service.asset_service import AssetService, AsyncAssetService, rfid_cache_stats
+from app.db import use_async_db, call_service
+from app.db.unit_of_work import UnitOfWork, AsyncUnitOfWork, get_unit_of_work, get_async_unit_of_work
 from app.core.security import get_current_user
+from app.core.pagination.cursor import set_next_cursor
+from app.core.responses.rows import RowsJSONResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(prefix="/assets", tags=["assets"])
 limiter = Limiter(key_func=get_remote_address)
 
-def get_asset_service(db: Session = Depends(get_db)) -> AssetService:
-    repository = AssetRepository(db)
+def get_asset_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> AssetService:
+    repository = AssetRepository(uow.session)
     return AssetService(repository)
 
+def get_async_asset_service(uow: AsyncUnitOfWork = Depends(get_async_unit_of_work)) -> AsyncAssetService:
+    repository = AsyncAssetRepository(uow.session)
+    return AsyncAssetService(repository)
+
+asset_service_dependency = get_async_asset_service if use_async_db("assets") else get_asset_service
+
 @router.post("/categories", response_model=AssetCategoryResponse)
 @limiter.limit("5/minute")
 async def create_category(
     request: Request,
     category: AssetCategoryCreate,
-    asset_service: AssetService = Depends(get_asset_service),
+    asset_service: AssetService = Depends(asset_service_dependency),
     current_user: dict = Depends(get_current_user)
 ):
-    return asset_service.create_category(category, current_user)
+    return await call_service(asset_service.create_category, category, current_user)
 
 @router.post("/", response_model=AssetResponse)
 @limiter.limit("5/minute")
 async def create_asset(
     request: Request,
     asset: AssetCreate,
-    asset_service: AssetService = Depends(get_asset_service),
+    asset_service: AssetService = Depends(asset_service_dependency),
     current_user: dict = Depends(get_current_user)
 ):
-    return asset_service.create_asset(asset, current_user)
+    return await call_service(asset_service.create_asset, asset, current_user, asset.company_id)
 
-@router.get("/", response_model=List[AssetResponse])
+@router.get("/", response_model=List[ProjectedAssetResponse], response_model_exclude_unset=True)
 @limiter.limit("5/minute")
 async def list_assets(
     request: Request,
     company_id: int,
     page: int = 1,
     per_page: int = 20,
-    asset_service: AssetService = Depends(get_asset_service),
+    cursor: Optional[str] = None,
+    asset_service: AssetService = Depends(asset_service_dependency),
     current_user: dict = Depends(get_current_user)
 ):
-    return asset_service.list_assets(company_id, current_user, page, per_page)
+    assets = await call_service(asset_service.list_assets, company_id, current_user, page, per_page, cursor)
+    response = RowsJSONResponse(assets, AssetRow)
+    set_next_cursor(response, assets, per_page)
+    return response
 
-@router.get("/rfid/{rfid_tag}", response_model=AssetResponse)
+@router.get("/rfid/{rfid_tag}", response_model=ProjectedAssetResponse, response_model_exclude_unset=True)
 @limiter.limit("10/minute")
 async def get_asset_by_rfid(
     request: Request,
     rfid_tag: str,
-    asset_service: AssetService = Depends(get_asset_service),
+    asset_service: AssetService = Depends(asset_service_dependency),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(asset_service.get_asset_by_rfid, rfid_tag, current_user)
+
+@router.post("/rfid/scan-batch", response_model=RfidScanBatchResponse, response_model_exclude_unset=True)
+@limiter.limit("60/minute")
+async def scan_rfid_batch(
+    request: Request,
+    batch: RfidScanBatch,
+    asset_service: AssetService = Depends(asset_service_dependency),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(asset_service.scan_rfid_batch, batch, current_user)
+
+@router.post("/rfid/cache/prewarm")
+@limiter.limit("5/minute")
+async def prewarm_rfid_cache(
+    request: Request,
+    company_id: int,
+    asset_service: AssetService = Depends(asset_service_dependency),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(asset_service.prewarm_rfid_cache, company_id, current_user)
+
+@router.get("/rfid/cache/stats")
+async def get_rfid_cache_stats(current_user: dict = Depends(get_current_user)):
+    return rfid_cache_stats(current_user)
+
+@router.get("/stats/company/{company_id}", response_model=CompanyAssetStatsResponse)
+async def get_company_asset_stats(
+    company_id: int,
+    asset_service: AssetService = Depends(asset_service_dependency),
+    current_user: dict = Depends(get_current_user)
+):
+    return await call_service(asset_service.get_company_stats, company_id, current_user)
+
+@router.post("/stats/reconcile")
+@limiter.limit("5/minute")
+async def reconcile_asset_stats(
+    request: Request,
+    company_id: Optional[int] = None,
+    asset_service: AssetService = Depends(asset_service_dependency),
     current_user: dict = Depends(get_current_user)
 ):
-    return asset_service.get_asset_by_rfid(rfid_tag, current_user)
\ No newline at end of file
+    return await call_service(asset_service.reconcile_stats, company_id, current_user)
\ No newline at end of file
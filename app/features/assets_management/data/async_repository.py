@@ -0,0 +1,80 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from app.features.assets_management.data.models import Asset, AssetCategory, AssetStatusHistory
+from app.features.assets_management.data.asset_stats import AsyncAssetStatsRepository, asset_stats_snapshot
+from app.features.assets_management.data.schemas import AssetCreate, AssetCategoryCreate
+from app.core.models.company import Company
+from app.features.assets_management.data.repository import RFID_LOOKUP_CHUNK
+from typing import Optional, List
+
+class AsyncAssetRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_category(self, category: AssetCategoryCreate) -> AssetCategory:
+        db_category = AssetCategory(
+            name=category.name,
+            code=category.code,
+            description=category.description
+        )
+        self.db.add(db_category)
+        await self.db.flush()
+        return db_category
+
+    async def create_asset(self, asset: AssetCreate, user_id: int) -> Asset:
+        if await self.db.scalar(select(Company.id).where(Company.id == asset.company_id)) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+
+        if await self.db.scalar(select(AssetCategory.id).where(AssetCategory.id == asset.category_id)) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+
+        db_asset = Asset(
+            company_id=asset.company_id,
+            asset_id=asset.asset_id,
+            category_id=asset.category_id,
+            name=asset.name,
+            rfid_tag=asset.rfid_tag,
+            model=asset.model,
+            serial_number=asset.serial_number,
+            technical_specs=asset.technical_specs,
+            location=asset.location,
+            custodian=asset.custodian,
+            value=asset.value,
+            registration_date=asset.registration_date,
+            warranty_end_date=asset.warranty_end_date,
+            description=asset.description,
+            status=asset.status
+        )
+        self.db.add(db_asset)
+        await self.db.flush()
+        await AsyncAssetStatsRepository(self.db).apply(None, asset_stats_snapshot(db_asset))
+
+        self.db.add(AssetStatusHistory(
+            asset_id=db_asset.id,
+            location=asset.location,
+            status=asset.status,
+            event_type="registered",
+            user_id=user_id,
+            details=f"Asset {asset.name} registered"
+        ))
+        await self.db.flush()
+        return db_asset
+
+    async def get_asset_by_rfid(self, rfid_tag: str) -> Optional[Asset]:
+        return await self.db.scalar(select(Asset).where(Asset.rfid_tag == rfid_tag).limit(1))
+
+    async def get_assets_by_rfid_tags(self, rfid_tags: List[str]) -> List[Asset]:
+        assets = []
+        for start in range(0, len(rfid_tags), RFID_LOOKUP_CHUNK):
+            chunk = rfid_tags[start:start + RFID_LOOKUP_CHUNK]
+            assets.extend(await self.db.scalars(select(Asset).where(Asset.rfid_tag.in_(chunk))))
+        return assets
+
+    async def get_assets_by_company(self, company_id: int, page: int, per_page: int, after: Optional[dict] = None) -> List[Asset]:
+        query = select(Asset).where(Asset.company_id == company_id).order_by(Asset.id).limit(per_page)
+        if after:
+            query = query.where(Asset.id > after["id"])
+        else:
+            query = query.offset((page - 1) * per_page)
+        return list(await self.db.scalars(query))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Boolean, DateTime, Enum
 from datetime import datetime
 from app.core.models.base import Base
 import enum
@@ -58,4 +58,14 @@ class AssetStatusHistory(Base):
     status = Column(Enum(AssetStatus))
     event_type = Column(Enum(AssetEventType))
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    details = Column(String, nullable=True)
\ No newline at end of file
+    details = Column(String, nullable=True)
+
+class CompanyAssetStats(Base):
+    __tablename__ = "company_asset_stats"
+
+    company_id = Column(Integer, ForeignKey("companies.id"), primary_key=True)
+    status = Column(Enum(AssetStatus), primary_key=True)
+    category_id = Column(Integer, ForeignKey("asset_categories.id"), primary_key=True)
+    asset_count = Column(Integer, nullable=False, default=0)
+    total_value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
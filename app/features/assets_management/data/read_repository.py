@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import lambda_stmt, select
+from app.core.readonly.repository import AsyncReadOnlyRepository, ReadOnlyRepository, record_columns
+from app.features.assets_management.data.models import Asset, AssetStatus
+from app.features.assets_management.data.repository import RFID_LOOKUP_CHUNK
+
+ASSET_FIELD_COLUMNS = {column.key: column for column in Asset.__table__.columns}
+
+
+@dataclass(frozen=True, slots=True)
+class AssetRecord:
+    id: int
+    company_id: int
+    asset_id: str
+    category_id: int
+    name: str
+    rfid_tag: str
+    model: Optional[str]
+    serial_number: Optional[str]
+    technical_specs: Optional[str]
+    location: Optional[str]
+    custodian: Optional[str]
+    value: Optional[int]
+    registration_date: Optional[datetime]
+    warranty_end_date: Optional[datetime]
+    description: Optional[str]
+    status: AssetStatus
+    created_at: datetime
+    updated_at: datetime
+
+
+ASSET_RECORD_COLUMNS = record_columns(AssetRecord, Asset.__table__)
+
+
+def asset_by_rfid_statement(rfid_tag: str):
+    return lambda_stmt(lambda: select(*ASSET_RECORD_COLUMNS).where(Asset.rfid_tag == rfid_tag).limit(1))
+
+
+def assets_by_rfid_tags_statement(rfid_tags: List[str]):
+    return lambda_stmt(lambda: select(*ASSET_RECORD_COLUMNS).where(Asset.rfid_tag.in_(rfid_tags)))
+
+
+def assets_page_statement(company_id: int, page: int, per_page: int, after: Optional[dict] = None):
+    statement = lambda_stmt(lambda: select(*ASSET_RECORD_COLUMNS).where(Asset.company_id == company_id).order_by(Asset.id).limit(per_page))
+    if after:
+        after_id = after["id"]
+        return statement + (lambda s: s.where(Asset.id > after_id))
+    offset = (page - 1) * per_page
+    return statement + (lambda s: s.offset(offset))
+
+
+def assets_page_query(columns: List, company_id: int, page: int, per_page: int, after: Optional[dict] = None):
+    # The column list follows the caller's policy, so this one is not a cached lambda.
+    query = select(*columns).where(Asset.company_id == company_id).order_by(Asset.id).limit(per_page)
+    if after:
+        return query.where(Asset.id > after["id"])
+    return query.offset((page - 1) * per_page)
+
+
+def _chunks(rfid_tags: List[str]):
+    for start in range(0, len(rfid_tags), RFID_LOOKUP_CHUNK):
+        yield rfid_tags[start:start + RFID_LOOKUP_CHUNK]
+
+
+class AssetReadRepository(ReadOnlyRepository):
+    """Read-only asset lookups for listing and RFID scans, returning ``AssetRecord`` rows."""
+
+    def get_asset_by_rfid(self, rfid_tag: str) -> Optional[AssetRecord]:
+        return self.fetch_one(asset_by_rfid_statement(rfid_tag), AssetRecord)
+
+    def get_assets_by_rfid_tags(self, rfid_tags: List[str]) -> List[AssetRecord]:
+        assets = []
+        for chunk in _chunks(rfid_tags):
+            assets.extend(self.fetch(assets_by_rfid_tags_statement(chunk), AssetRecord))
+        return assets
+
+    def get_assets_by_company(self, company_id: int, page: int, per_page: int, after: Optional[dict] = None) -> List[AssetRecord]:
+        return self.fetch(assets_page_statement(company_id, page, per_page, after), AssetRecord)
+
+    def get_asset_rows_by_company(self, company_id: int, page: int, per_page: int, columns: List, after: Optional[dict] = None) -> List[dict]:
+        return self.fetch_mappings(assets_page_query(columns, company_id, page, per_page, after))
+
+
+class AsyncAssetReadRepository(AsyncReadOnlyRepository):
+    async def get_asset_by_rfid(self, rfid_tag: str) -> Optional[AssetRecord]:
+        return await self.fetch_one(asset_by_rfid_statement(rfid_tag), AssetRecord)
+
+    async def get_assets_by_rfid_tags(self, rfid_tags: List[str]) -> List[AssetRecord]:
+        assets = []
+        for chunk in _chunks(rfid_tags):
+            assets.extend(await self.fetch(assets_by_rfid_tags_statement(chunk), AssetRecord))
+        return assets
+
+    async def get_assets_by_company(self, company_id: int, page: int, per_page: int, after: Optional[dict] = None) -> List[AssetRecord]:
+        return await self.fetch(assets_page_statement(company_id, page, per_page, after), AssetRecord)
+
+    async def get_asset_rows_by_company(self, company_id: int, page: int, per_page: int, columns: List, after: Optional[dict] = None) -> List[dict]:
+        return await self.fetch_mappings(assets_page_query(columns, company_id, page, per_page, after))
@@ -1,10 +1,13 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.features.assets_management.data.models import Asset, AssetCategory, AssetStatusHistory
+from app.features.assets_management.data.asset_stats import AssetStatsRepository, asset_stats_snapshot
 from app.features.assets_management.data.schemas import AssetCreate, AssetCategoryCreate
 from app.core.models.company import Company
 from typing import Optional, List
 
+RFID_LOOKUP_CHUNK = 500
+
 class AssetRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -16,8 +19,7 @@ class AssetRepository:
             description=category.description
         )
         self.db.add(db_category)
-        self.db.commit()
-        self.db.refresh(db_category)
+        self.db.flush()
         return db_category
 
     def create_asset(self, asset: AssetCreate, user_id: int) -> Asset:
@@ -45,8 +47,8 @@ class AssetRepository:
             status=asset.status
         )
         self.db.add(db_asset)
-        self.db.commit()
-        self.db.refresh(db_asset)
+        self.db.flush()
+        AssetStatsRepository(self.db).apply(None, asset_stats_snapshot(db_asset))
 
         status_history = AssetStatusHistory(
             asset_id=db_asset.id,
@@ -57,12 +59,22 @@ class AssetRepository:
             details=f"Asset {asset.name} registered"
         )
         self.db.add(status_history)
-        self.db.commit()
+        self.db.flush()
         return db_asset
 
     def get_asset_by_rfid(self, rfid_tag: str) -> Optional[Asset]:
         return self.db.query(Asset).filter(Asset.rfid_tag == rfid_tag).first()
 
-    def get_assets_by_company(self, company_id: int, page: int, per_page: int) -> List[Asset]:
+    def get_assets_by_rfid_tags(self, rfid_tags: List[str]) -> List[Asset]:
+        assets = []
+        for start in range(0, len(rfid_tags), RFID_LOOKUP_CHUNK):
+            chunk = rfid_tags[start:start + RFID_LOOKUP_CHUNK]
+            assets.extend(self.db.query(Asset).filter(Asset.rfid_tag.in_(chunk)).all())
+        return assets
+
+    def get_assets_by_company(self, company_id: int, page: int, per_page: int, after: Optional[dict] = None) -> List[Asset]:
+        query = self.db.query(Asset).filter(Asset.company_id == company_id)
+        if after:
+            return query.filter(Asset.id > after["id"]).order_by(Asset.id).limit(per_page).all()
         offset = (page - 1) * per_page
-        return self.db.query(Asset).filter(Asset.company_id == company_id).offset(offset).limit(per_page).all()
\ No newline at end of file
+        return query.order_by(Asset.id).offset(offset).limit(per_page).all()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.db.unit_of_work import on_commit
+from app.core.cache.ttl_cache import TTLCache
+from app.features.assets_management.data.models import Asset
+from app.features.assets_management.data.schemas import AssetResponse
+
+RFID_CACHE_MAX_SIZE = int(os.getenv("RFID_CACHE_MAX_SIZE", "50000"))
+RFID_CACHE_TTL_SECONDS = int(os.getenv("RFID_CACHE_TTL_SECONDS", "300"))
+RFID_CACHE_PREWARM_LIMIT = int(os.getenv("RFID_CACHE_PREWARM_LIMIT", "10000"))
+
+
+class RfidTagCache:
+    """Process-wide rfid_tag -> AssetResponse snapshot cache in front of scan lookups.
+
+    Tag mappings rarely change, so entries live for ``ttl`` seconds and are
+    dropped explicitly whenever an asset is created or modified.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.prewarmed = 0
+
+    def get(self, rfid_tag: str) -> Optional[AssetResponse]:
+        return self._cache.get(rfid_tag)
+
+    def get_many(self, rfid_tags: Iterable[str]) -> Tuple[Dict[str, AssetResponse], List[str]]:
+        hits, misses = {}, []
+        for rfid_tag in rfid_tags:
+            snapshot = self._cache.get(rfid_tag)
+            if snapshot is None:
+                misses.append(rfid_tag)
+            else:
+                hits[rfid_tag] = snapshot
+        return hits, misses
+
+    def put(self, asset: Asset) -> AssetResponse:
+        snapshot = AssetResponse.from_orm(asset)
+        self._cache.set(snapshot.rfid_tag, snapshot)
+        return snapshot
+
+    def put_many(self, assets: Iterable[Asset]) -> List[AssetResponse]:
+        return [self.put(asset) for asset in assets]
+
+    def prewarm(self, assets: Iterable[Asset]) -> int:
+        count = len(self.put_many(assets))
+        self.prewarmed += count
+        return count
+
+    def invalidate(self, *rfid_tags: Optional[str]) -> None:
+        for rfid_tag in rfid_tags:
+            if rfid_tag:
+                self._cache.pop(rfid_tag)
+
+    def invalidate_on_commit(self, session, *rfid_tags: Optional[str]) -> None:
+        # Drop now so this request never reads a stale entry, and again once the
+        # transaction commits in case a concurrent request re-cached the old row.
+        self.invalidate(*rfid_tags)
+        on_commit(session, lambda: self.invalidate(*rfid_tags))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["prewarmed"] = self.prewarmed
+        return stats
+
+
+rfid_cache = RfidTagCache(max_size=RFID_CACHE_MAX_SIZE, ttl=RFID_CACHE_TTL_SECONDS)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, List
+from typing_extensions import TypedDict
 from app.features.assets_management.data.models import AssetStatus, AssetEventType
 
 class AssetCategoryCreate(BaseModel):
@@ -60,6 +61,69 @@ class AssetResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ProjectedAssetResponse(BaseModel):
+    """AssetResponse restricted to the fields the caller's role may see; unset fields are omitted."""
+    id: Optional[int] = None
+    company_id: Optional[int] = None
+    asset_id: Optional[str] = None
+    category_id: Optional[int] = None
+    name: Optional[str] = None
+    rfid_tag: Optional[str] = None
+    model: Optional[str] = None
+    serial_number: Optional[str] = None
+    technical_specs: Optional[str] = None
+    location: Optional[str] = None
+    custodian: Optional[str] = None
+    value: Optional[int] = None
+    registration_date: Optional[datetime] = None
+    warranty_end_date: Optional[datetime] = None
+    description: Optional[str] = None
+    status: Optional[AssetStatus] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class AssetRow(TypedDict, total=False):
+    """Projected ``assets`` row as served by the list endpoint; keys outside the caller's policy are absent."""
+    id: int
+    company_id: int
+    asset_id: str
+    category_id: int
+    name: str
+    rfid_tag: str
+    model: Optional[str]
+    serial_number: Optional[str]
+    technical_specs: Optional[str]
+    location: Optional[str]
+    custodian: Optional[str]
+    value: Optional[int]
+    registration_date: Optional[datetime]
+    warranty_end_date: Optional[datetime]
+    description: Optional[str]
+    status: AssetStatus
+    created_at: datetime
+    updated_at: datetime
+
+RFID_SCAN_BATCH_MAX = 1000
+
+class RfidScan(BaseModel):
+    rfid_tag: str
+    scanned_at: Optional[datetime] = None  # زمان خوانده شدن تگ روی دستگاه
+
+class RfidScanBatch(BaseModel):
+    device_id: Optional[str] = None  # شناسه دستگاه RFID خوان
+    scans: List[RfidScan] = Field(min_length=1, max_length=RFID_SCAN_BATCH_MAX)
+
+class RfidScanBatchResponse(BaseModel):
+    found: List[ProjectedAssetResponse]
+    unknown: List[str]
+
+class CompanyAssetStatsResponse(BaseModel):
+    company_id: int
+    total_assets: int
+    total_value: int
+    status_breakdown: Dict[str, int]
+    category_breakdown: Dict[int, int]
+
 class AssetLoanCreate(BaseModel):
     asset_id: int
     recipient_id: Optional[int] = None  # کاربر داخل شرکت
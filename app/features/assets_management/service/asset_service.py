@@ -1,31 +1,40 @@
 from fastapi import HTTPException, status
+from app.core.logger.audit_sink import audit_sink
+from app.core.pagination.cursor import decode_cursor
 from app.features.assets_management.data.repository import AssetRepository
-from app.features.assets_management.data.schemas import AssetCreate, AssetResponse, AssetCategoryCreate, AssetCategoryResponse
+from app.features.assets_management.data.read_repository import AssetReadRepository, AsyncAssetReadRepository, ASSET_FIELD_COLUMNS
+from app.features.assets_management.data.async_repository import AsyncAssetRepository
+from app.features.assets_management.data.asset_stats import AssetStatsRepository, AsyncAssetStatsRepository, asset_stats_snapshot
+from app.features.assets_management.data.rfid_cache import rfid_cache, RFID_CACHE_PREWARM_LIMIT
+from app.features.assets_management.data.schemas import AssetCreate, AssetResponse, ProjectedAssetResponse, AssetCategoryCreate, AssetCategoryResponse, RfidScanBatch, RfidScanBatchResponse, CompanyAssetStatsResponse
 from app.features.assets_management.data.models import Asset
-from app.features.auth.data.models import UserCompanyRole  # اضافه شده
-from app.features.logs.data.models import Log
+from app.core.security.permissions import permissions_for, async_permissions_for
+from app.core.security.policy import principal_policy
 from app.features.work_flow.data.repository import WorkFlowRepository
+from app.features.work_flow.data.async_repository import AsyncWorkFlowRepository
 from app.features.work_flow.data.models import WorkflowActionType
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 class AssetService:
     def __init__(self, repository: AssetRepository):
         self.repository = repository
         self.db = repository.db
         self.workflow_repository = WorkFlowRepository(self.db)
+        self.reader = AssetReadRepository(self.db)
 
     def create_category(self, category: AssetCategoryCreate, current_user: dict) -> AssetCategoryResponse:
         if current_user["role"] != "S":
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can create categories")
         
         db_category = self.repository.create_category(category)
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             action="CATEGORY_CREATE",
             entity_type="ASSET_CATEGORY",
             entity_id=db_category.id,
-            details=f"Created category {category.name}"
+            details=f"Created category {category.name}",
+            session=self.db
         )
         return AssetCategoryResponse.from_orm(db_category)
 
@@ -35,17 +44,20 @@ class AssetService:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can create assets")
         
         db_asset = self.repository.create_asset(asset, current_user["id"])
-        self._log_action(
+        rfid_cache.invalidate_on_commit(self.db, db_asset.rfid_tag)
+        audit_sink.log(
             user_id=current_user["id"],
             company_id=company_id,
             action="ASSET_CREATE",
             entity_type="ASSET",
             entity_id=db_asset.id,
-            details=f"Created asset {asset.name}"
+            details=f"Created asset {asset.name}",
+            session=self.db
         )
-        self.workflow_repository.create_workflow(
+        self.workflow_repository.record_workflow(
             company_id=company_id,
             user_id=current_user["id"],
+            admin_name=current_user["username"],
             asset_id=db_asset.id,
             asset_name=asset.name,
             action_type=WorkflowActionType.ADDED,
@@ -75,25 +87,29 @@ class AssetService:
             action_type = WorkflowActionType.STATUS_CHANGED
             details = f"Changed status to {asset_update['status']}"
         
+        rfid_cache.invalidate_on_commit(self.db, asset.rfid_tag, asset_update.get("rfid_tag"))
+        stats_before = asset_stats_snapshot(asset)
         for key, value in asset_update.items():
             if hasattr(asset, key):
                 setattr(asset, key, value)
         
         asset.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(asset)
+        self.db.flush()
+        AssetStatsRepository(self.db).apply(stats_before, asset_stats_snapshot(asset))
         
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             company_id=company_id,
             action="ASSET_UPDATE",
             entity_type="ASSET",
             entity_id=asset.id,
-            details=details
+            details=details,
+            session=self.db
         )
-        self.workflow_repository.create_workflow(
+        self.workflow_repository.record_workflow(
             company_id=company_id,
             user_id=current_user["id"],
+            admin_name=current_user["username"],
             asset_id=asset.id,
             asset_name=asset.name,
             action_type=action_type,
@@ -101,31 +117,38 @@ class AssetService:
         )
         return AssetResponse.from_orm(asset)
 
-    def list_assets(self, company_id: int, current_user: dict, page: int, per_page: int) -> List[AssetResponse]:
+    def list_assets(self, company_id: int, current_user: dict, page: int, per_page: int, cursor: Optional[str] = None) -> List[dict]:
         if current_user["role"] != "S" and current_user.get("company_id") != company_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
         
-        assets = self.repository.get_assets_by_company(company_id, page, per_page)
-        return [AssetResponse.from_orm(asset) for asset in assets]
+        after = decode_cursor(cursor) if cursor else None
+        columns = principal_policy(current_user).columns("assets", ASSET_FIELD_COLUMNS)
+        return self.reader.get_asset_rows_by_company(company_id, page, per_page, columns, after)
 
-    def get_asset_by_rfid(self, rfid_tag: str, current_user: dict) -> AssetResponse:
-        asset = self.repository.get_asset_by_rfid(rfid_tag)
-        if not asset:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+    def get_asset_by_rfid(self, rfid_tag: str, current_user: dict) -> ProjectedAssetResponse:
+        asset = rfid_cache.get(rfid_tag)
+        if asset is None:
+            db_asset = self.reader.get_asset_by_rfid(rfid_tag)
+            if not db_asset:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+            asset = rfid_cache.put(db_asset)
         
         if current_user["role"] != "S" and current_user.get("company_id") != asset.company_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
         
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
+            company_id=asset.company_id,
             action="ASSET_SCAN",
             entity_type="ASSET",
             entity_id=asset.id,
-            details=f"Scanned RFID tag {rfid_tag}"
+            details=f"Scanned RFID tag {rfid_tag}",
+            session=self.db
         )
-        self.workflow_repository.create_workflow(
+        self.workflow_repository.record_workflow(
             company_id=asset.company_id,
             user_id=current_user["id"],
+            admin_name=current_user["username"],
             asset_id=asset.id,
             asset_name=asset.name,
             action_type=WorkflowActionType.OFFLINE_SCAN,
@@ -133,26 +156,222 @@ class AssetService:
             is_offline=True,
             is_actionable=True
         )
-        return AssetResponse.from_orm(asset)
+        return ProjectedAssetResponse(**principal_policy(current_user).project("assets", asset.model_dump()))
+
+    def prewarm_rfid_cache(self, company_id: int, current_user: dict) -> dict:
+        if current_user["role"] != "S" and current_user.get("company_id") != company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
+
+        assets = self.reader.get_assets_by_company(company_id, 1, RFID_CACHE_PREWARM_LIMIT)
+        return {"company_id": company_id, "cached": rfid_cache.prewarm(assets)}
+
+    def scan_rfid_batch(self, batch: RfidScanBatch, current_user: dict) -> RfidScanBatchResponse:
+        scans = _latest_scans(batch)
+        cached, misses = rfid_cache.get_many(scans)
+        assets = list(cached.values())
+        if misses:
+            assets += rfid_cache.put_many(self.reader.get_assets_by_rfid_tags(misses))
+        response, workflows = _record_scan_batch(self.db, batch, scans, assets, current_user)
+        self.workflow_repository.create_workflows_bulk(workflows)
+        return response
+
+    def get_company_stats(self, company_id: int, current_user: dict) -> CompanyAssetStatsResponse:
+        if current_user["role"] != "S" and current_user.get("company_id") != company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
+        return CompanyAssetStatsResponse(**AssetStatsRepository(self.db).get_company_stats(company_id))
+
+    def reconcile_stats(self, company_id: Optional[int], current_user: dict) -> dict:
+        if current_user["role"] != "S":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can reconcile asset statistics")
+        return {"company_id": company_id, "rows": AssetStatsRepository(self.db).reconcile(company_id)}
 
     def _get_user_role(self, user_id: int, company_id: int) -> str:
-        role = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == user_id,
-            UserCompanyRole.company_id == company_id
-        ).first()
-        if not role:
+        membership = permissions_for(self.db, user_id).membership(company_id)
+        if not membership:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not associated with this company")
-        return role.role
+        return membership.role
+
+class AsyncAssetService:
+    def __init__(self, repository: AsyncAssetRepository):
+        self.repository = repository
+        self.db = repository.db
+        self.workflow_repository = AsyncWorkFlowRepository(self.db)
+        self.reader = AsyncAssetReadRepository(self.db)
+
+    async def create_category(self, category: AssetCategoryCreate, current_user: dict) -> AssetCategoryResponse:
+        if current_user["role"] != "S":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can create categories")
+
+        db_category = await self.repository.create_category(category)
+        audit_sink.log(
+            user_id=current_user["id"],
+            company_id=current_user.get("company_id"),
+            action="CATEGORY_CREATE",
+            entity_type="ASSET_CATEGORY",
+            entity_id=db_category.id,
+            details=f"Created category {category.name}",
+            session=self.db
+        )
+        return AssetCategoryResponse.from_orm(db_category)
+
+    async def create_asset(self, asset: AssetCreate, current_user: dict, company_id: int) -> AssetResponse:
+        role = await self._get_user_role(current_user["id"], company_id)
+        if role not in ["S", "A1", "A2"]:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can create assets")
 
-    def _log_action(self, user_id: int, company_id: int, action: str, entity_type: str, entity_id: int = None, details: str = ""):
-        log = Log(
-            user_id=user_id,
+        db_asset = await self.repository.create_asset(asset, current_user["id"])
+        rfid_cache.invalidate_on_commit(self.db, db_asset.rfid_tag)
+        audit_sink.log(
+            user_id=current_user["id"],
             company_id=company_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
+            action="ASSET_CREATE",
+            entity_type="ASSET",
+            entity_id=db_asset.id,
+            details=f"Created asset {asset.name}",
+            session=self.db
+        )
+        await self.workflow_repository.record_workflow(
+            company_id=company_id,
+            user_id=current_user["id"],
+            admin_name=current_user["username"],
+            asset_id=db_asset.id,
+            asset_name=db_asset.name,
+            action_type=WorkflowActionType.ADDED,
+            details=f"Created asset {asset.name}"
+        )
+        return AssetResponse.from_orm(db_asset)
+
+    async def list_assets(self, company_id: int, current_user: dict, page: int, per_page: int, cursor: Optional[str] = None) -> List[dict]:
+        if current_user["role"] != "S" and current_user.get("company_id") != company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
+
+        after = decode_cursor(cursor) if cursor else None
+        columns = principal_policy(current_user).columns("assets", ASSET_FIELD_COLUMNS)
+        return await self.reader.get_asset_rows_by_company(company_id, page, per_page, columns, after)
+
+    async def get_asset_by_rfid(self, rfid_tag: str, current_user: dict) -> ProjectedAssetResponse:
+        asset = rfid_cache.get(rfid_tag)
+        if asset is None:
+            db_asset = await self.reader.get_asset_by_rfid(rfid_tag)
+            if not db_asset:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+            asset = rfid_cache.put(db_asset)
+
+        if current_user["role"] != "S" and current_user.get("company_id") != asset.company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
+
+        audit_sink.log(
+            user_id=current_user["id"],
+            company_id=asset.company_id,
+            action="ASSET_SCAN",
+            entity_type="ASSET",
+            entity_id=asset.id,
+            details=f"Scanned RFID tag {rfid_tag}",
+            session=self.db
+        )
+        await self.workflow_repository.record_workflow(
+            company_id=asset.company_id,
+            user_id=current_user["id"],
+            admin_name=current_user["username"],
+            asset_id=asset.id,
+            asset_name=asset.name,
+            action_type=WorkflowActionType.OFFLINE_SCAN,
+            details=f"Scanned RFID tag {rfid_tag}",
+            is_offline=True,
+            is_actionable=True
+        )
+        return ProjectedAssetResponse(**principal_policy(current_user).project("assets", asset.model_dump()))
+
+    async def prewarm_rfid_cache(self, company_id: int, current_user: dict) -> dict:
+        if current_user["role"] != "S" and current_user.get("company_id") != company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
+
+        assets = await self.reader.get_assets_by_company(company_id, 1, RFID_CACHE_PREWARM_LIMIT)
+        return {"company_id": company_id, "cached": rfid_cache.prewarm(assets)}
+
+    async def scan_rfid_batch(self, batch: RfidScanBatch, current_user: dict) -> RfidScanBatchResponse:
+        scans = _latest_scans(batch)
+        cached, misses = rfid_cache.get_many(scans)
+        assets = list(cached.values())
+        if misses:
+            assets += rfid_cache.put_many(await self.reader.get_assets_by_rfid_tags(misses))
+        response, workflows = _record_scan_batch(self.db, batch, scans, assets, current_user)
+        await self.workflow_repository.create_workflows_bulk(workflows)
+        return response
+
+    async def get_company_stats(self, company_id: int, current_user: dict) -> CompanyAssetStatsResponse:
+        if current_user["role"] != "S" and current_user.get("company_id") != company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view assets of your own company")
+        return CompanyAssetStatsResponse(**await AsyncAssetStatsRepository(self.db).get_company_stats(company_id))
+
+    async def reconcile_stats(self, company_id: Optional[int], current_user: dict) -> dict:
+        if current_user["role"] != "S":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can reconcile asset statistics")
+        return {"company_id": company_id, "rows": await AsyncAssetStatsRepository(self.db).reconcile(company_id)}
+
+    async def _get_user_role(self, user_id: int, company_id: int) -> str:
+        membership = (await async_permissions_for(self.db, user_id)).membership(company_id)
+        if not membership:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not associated with this company")
+        return membership.role
+
+def rfid_cache_stats(current_user: dict) -> dict:
+    if current_user["role"] not in ["S", "A1", "A2"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can view cache statistics")
+    return rfid_cache.stats()
+
+def _utc(timestamp: Optional[datetime]) -> Optional[datetime]:
+    # Devices may send offsets; workflow timestamps are naive UTC.
+    if timestamp is not None and timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def _latest_scans(batch: RfidScanBatch) -> Dict[str, Optional[datetime]]:
+    # A sweep reports the same tag many times; keep one entry per tag with its latest read.
+    scans: Dict[str, Optional[datetime]] = {}
+    for scan in batch.scans:
+        previous, scanned_at = scans.get(scan.rfid_tag), _utc(scan.scanned_at)
+        if previous is None or (scanned_at and scanned_at > previous):
+            scans[scan.rfid_tag] = scanned_at
+    return scans
+
+def _record_scan_batch(session, batch: RfidScanBatch, scans: Dict[str, Optional[datetime]], assets: List[AssetResponse], current_user: dict) -> Tuple[RfidScanBatchResponse, List[dict]]:
+    now = datetime.utcnow()
+    device = f" by device {batch.device_id}" if batch.device_id else ""
+    by_tag = {
+        asset.rfid_tag: asset
+        for asset in assets
+        if current_user["role"] == "S" or current_user.get("company_id") == asset.company_id
+    }
+    found, workflows = [], []
+    for rfid_tag in scans:
+        asset = by_tag.get(rfid_tag)
+        if asset is None:
+            continue
+        details = f"Scanned RFID tag {rfid_tag}{device}"
+        found.append(asset)
+        workflows.append({
+            "company_id": asset.company_id,
+            "user_id": current_user["id"],
+            "admin_name": current_user["username"],
+            "asset_id": asset.id,
+            "asset_name": asset.name,
+            "action_type": WorkflowActionType.OFFLINE_SCAN,
+            "details": details,
+            "timestamp": scans[rfid_tag] or now,
+            "is_offline": True,
+            "is_actionable": True
+        })
+        audit_sink.log(
+            user_id=current_user["id"],
+            company_id=asset.company_id,
+            action="ASSET_SCAN",
+            entity_type="ASSET",
+            entity_id=asset.id,
             details=details,
-            timestamp=datetime.utcnow()
+            session=session
         )
-        self.db.add(log)
-        self.db.commit()
\ No newline at end of file
+    unknown = [rfid_tag for rfid_tag in scans if rfid_tag not in by_tag]
+    policy = principal_policy(current_user)
+    found = [ProjectedAssetResponse(**policy.project("assets", asset.model_dump())) for asset in found]
+    return RfidScanBatchResponse(found=found, unknown=unknown), workflows
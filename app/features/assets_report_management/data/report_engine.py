@@ -0,0 +1,114 @@
+from typing import Any, Callable, Dict, List, Sequence
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+from app.core.models.company import Company
+from app.features.assets_management.data.models import Asset, AssetCategory, AssetStatus
+from app.features.logs.data.models import Log
+
+ASSET_ACTIVITY_ENTITY_TYPES = ("ASSET", "ASSET_LOAN", "ASSET_LOCATION")
+
+
+class ReportEngine:
+    """Builds a company report from a fixed number of round-trips.
+
+    Scalar metrics become subqueries of a single SELECT that also checks the
+    company exists. Grouped metrics share one ``GROUP BY`` over the union of
+    the engine's dimensions; each metric folds the grouped rows in Python, so
+    adding a breakdown adds neither a query nor a scan.
+    """
+
+    def __init__(self, source, dimensions: Sequence[ColumnElement], aggregates: Dict[str, ColumnElement]):
+        self.source = source
+        self.dimensions = list(dimensions)
+        self.aggregates = aggregates
+        self.scalars: Dict[str, Callable[[int], ColumnElement]] = {}
+        self.metrics: Dict[str, Callable[[List[Any]], Any]] = {}
+
+    def scalar(self, name: str):
+        def register(build: Callable[[int], ColumnElement]):
+            self.scalars[name] = build
+            return build
+        return register
+
+    def metric(self, name: str):
+        def register(fold: Callable[[List[Any]], Any]):
+            self.metrics[name] = fold
+            return fold
+        return register
+
+    def scalar_query(self, company_id: int):
+        columns = [select(Company.id).where(Company.id == company_id).scalar_subquery().label("company_id")]
+        columns += [build(company_id).label(name) for name, build in self.scalars.items()]
+        return select(*columns)
+
+    def grouped_query(self, company_id: int):
+        return (
+            select(*self.dimensions, *(aggregate.label(name) for name, aggregate in self.aggregates.items()))
+            .select_from(self.source)
+            .where(Asset.company_id == company_id)
+            .group_by(*self.dimensions)
+        )
+
+    def run(self, db: Session, company_id: int):
+        scalars = db.execute(self.scalar_query(company_id)).one()
+        if scalars.company_id is None:
+            return None
+        rows = db.execute(self.grouped_query(company_id)).all()
+        report = {"company_id": company_id}
+        report.update({name: getattr(scalars, name) for name in self.scalars})
+        report.update({name: fold(rows) for name, fold in self.metrics.items()})
+        return report
+
+
+asset_report_engine = ReportEngine(
+    source=Asset.__table__.outerjoin(AssetCategory.__table__, Asset.category_id == AssetCategory.id),
+    dimensions=[Asset.status, Asset.category_id, AssetCategory.name.label("category_name"), Asset.location],
+    aggregates={"asset_count": func.count(Asset.id), "asset_value": func.coalesce(func.sum(Asset.value), 0)}
+)
+
+
+@asset_report_engine.scalar("last_activity")
+def _last_activity(company_id: int):
+    # Served by ix_logs_company_timestamp.
+    return (
+        select(func.max(Log.timestamp))
+        .where(Log.company_id == company_id, Log.entity_type.in_(ASSET_ACTIVITY_ENTITY_TYPES))
+        .scalar_subquery()
+    )
+
+
+def _count_where(status: AssetStatus):
+    return lambda rows: sum(row.asset_count for row in rows if row.status == status)
+
+
+asset_report_engine.metric("total_assets")(lambda rows: sum(row.asset_count for row in rows))
+asset_report_engine.metric("active_assets")(_count_where(AssetStatus.ACTIVE))
+asset_report_engine.metric("loaned_assets")(_count_where(AssetStatus.ON_LOAN))
+asset_report_engine.metric("total_value")(lambda rows: sum(row.asset_value for row in rows))
+
+
+@asset_report_engine.metric("status_breakdown")
+def _status_breakdown(rows) -> Dict[str, int]:
+    breakdown = {asset_status.value: 0 for asset_status in AssetStatus}
+    for row in rows:
+        if row.status is not None:
+            breakdown[row.status.value] += row.asset_count
+    return breakdown
+
+
+@asset_report_engine.metric("category_breakdown")
+def _category_breakdown(rows) -> List[dict]:
+    breakdown: Dict[int, dict] = {}
+    for row in rows:
+        entry = breakdown.setdefault(row.category_id, {"category_id": row.category_id, "category_name": row.category_name, "count": 0})
+        entry["count"] += row.asset_count
+    return sorted(breakdown.values(), key=lambda entry: -entry["count"])
+
+
+@asset_report_engine.metric("location_breakdown")
+def _location_breakdown(rows) -> List[dict]:
+    breakdown: Dict[Any, int] = {}
+    for row in rows:
+        breakdown[row.location] = breakdown.get(row.location, 0) + row.asset_count
+    return [{"location": location, "count": count} for location, count in sorted(breakdown.items(), key=lambda item: -item[1])]
@@ -1,10 +1,23 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
+
+class CategoryBreakdown(BaseModel):
+    category_id: Optional[int]
+    category_name: Optional[str]
+    count: int
+
+class LocationBreakdown(BaseModel):
+    location: Optional[str]
+    count: int
 
 class AssetReportResponse(BaseModel):
     company_id: int
     total_assets: int
     active_assets: int
     loaned_assets: int
-    last_activity: Optional[datetime]
\ No newline at end of file
+    last_activity: Optional[datetime]
+    total_value: int = 0
+    status_breakdown: Dict[str, int] = {}
+    category_breakdown: List[CategoryBreakdown] = []
+    location_breakdown: List[LocationBreakdown] = []
\ No newline at end of file
@@ -1,8 +1,7 @@
 from fastapi import HTTPException, status
+from app.core.logger.audit_sink import audit_sink
 from app.features.assets_report_management.data.repository import ReportRepository
 from app.features.assets_report_management.data.schemas import AssetReportResponse
-from app.features.logs.data.models import Log
-from datetime import datetime
 
 class ReportService:
     def __init__(self, repository: ReportRepository):
@@ -14,23 +13,11 @@ class ReportService:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can access reports")
         
         report = self.repository.get_company_report(company_id)
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             action="REPORT_ACCESS",
             entity_type="REPORT",
             entity_id=company_id,
             details=f"Accessed report for company {company_id}"
         )
-        return AssetReportResponse(**report)
-
-    def _log_action(self, user_id: int, action: str, entity_type: str, entity_id: int = None, details: str = ""):
-        log = Log(
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-            timestamp=datetime.utcnow()
-        )
-        self.db.add(log)
-        self.db.commit()
\ No newline at end of file
+        return AssetReportResponse(**report)
\ No newline at end of file
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
-from app.core.security import get_current_user, oauth2_scheme, SECRET_KEY, ALGORITHM
-from app.features.auth.data.models import User, LoginAttempt
+from app.core.security import (
+    get_current_user, oauth2_scheme, revocation_list, revoke_access_token, login_tracker,
+    SECRET_KEY, ALGORITHM, PRINCIPAL_TOKEN_TYPE, LOGIN_BAN_HOURS
+)
+from app.features.auth.data.models import User
 from app.features.auth.service.auth_service import AuthService
 from app.features.auth.data.schemas import (
     LoginAttemptResponse, UserCreate, UserResponse, VerifyOtpRequest, SignUpResponse, LoginResponse, ResetCodeResponse
@@ -9,7 +12,6 @@ from app.features.auth.data.schemas import (
 from app.db import get_db
 from typing import Dict
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -19,25 +21,31 @@ def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
 @router.post("/signup", response_model=SignUpResponse)
 async def signup(user: UserCreate, auth_service: AuthService = Depends(get_auth_service)):
     try:
-        return auth_service.signup(user)
+        return await auth_service.signup(user)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.post("/login", response_model=LoginResponse)
-async def login(username: str, password: str, auth_service: AuthService = Depends(get_auth_service)):
+async def login(request: Request, username: str, password: str, auth_service: AuthService = Depends(get_auth_service)):
     try:
-        return auth_service.login(username, password)
+        return await auth_service.login(username, password, client_ip=request.client.host)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @router.post("/verify-login-otp", response_model=dict)
-async def verify_login_otp(request: VerifyOtpRequest, auth_service: AuthService = Depends(get_auth_service)):
+async def verify_login_otp(request: VerifyOtpRequest, http_request: Request, auth_service: AuthService = Depends(get_auth_service)):
     try:
-        token = auth_service.verify_login_otp(request)
+        token = auth_service.verify_login_otp(request, client_ip=http_request.client.host)
         return {"access_token": token, "token_type": "bearer"}
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
+@router.post("/logout", response_model=dict)
+async def logout(token: str = Depends(oauth2_scheme), current_user: dict = Depends(get_current_user)):
+    # get_current_user has already validated the token.
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return {"revoked": revoke_access_token(token, payload)}
+
 @router.post("/reset-password", response_model=ResetCodeResponse)
 async def reset_password(identifier: str, auth_service: AuthService = Depends(get_auth_service)):
     try:
@@ -48,7 +56,7 @@ async def reset_password(identifier: str, auth_service: AuthService = Depends(ge
 @router.post("/verify-reset-code")
 async def verify_reset_code(user_id: int, code: str, new_password: str, auth_service: AuthService = Depends(get_auth_service)):
     try:
-        auth_service.verify_reset_code(user_id, code, new_password)
+        await auth_service.verify_reset_code(user_id, code, new_password)
         return {"message": "Password reset successfully"}
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -70,6 +78,13 @@ async def verify_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        if payload.get("typ") == PRINCIPAL_TOKEN_TYPE and revocation_list.is_revoked(payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
         user = db.query(User).filter(User.username == username).first()
         if user is None:
             raise HTTPException(
@@ -78,16 +93,10 @@ async def verify_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        client_ip = request.client.host
-        attempt_count = db.query(LoginAttempt).filter(
-            LoginAttempt.ip_address == client_ip,
-            LoginAttempt.timestamp > datetime.utcnow() - timedelta(minutes=30)
-        ).count()
-
-        if attempt_count >= 10:
+        if login_tracker.is_banned(request.client.host):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Too many attempts. IP banned for 5 hours."
+                detail=f"Too many attempts. IP banned for {LOGIN_BAN_HOURS} hours."
             )
 
         role = user.companies[0].role if user.companies else None
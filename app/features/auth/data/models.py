@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.models.base import Base
@@ -30,6 +30,10 @@ class UserCompanyRole(Base):
     
     #  رابطه جدید برای پیدا کردن دعوت‌کننده
     inviter = relationship("User", foreign_keys=[invited_by_id])
+
+    __table_args__ = (
+        Index('ix_user_company_roles_company_user', 'company_id', 'user_id'),
+    )
     
 class User(Base):
     __tablename__ = "users"
@@ -73,4 +77,8 @@ class LoginAttempt(Base):
     ip_address = Column(String(45), nullable=False)
     username = Column(String, nullable=False)
     successful = Column(Boolean, default=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_login_attempts_ip_timestamp', 'ip_address', 'timestamp'),
+    )
\ No newline at end of file
@@ -1,13 +1,27 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.features.auth.domain.entities import UserEntity, ResetCodeEntity
 from app.features.users.domain.entities import CompanyEntity
 from app.features.auth.domain.repositories import UserRepository
-from app.features.auth.data.models import User, ResetCode
+from app.features.auth.data.models import User, ResetCode, UserCompanyRole
 from app.core.models.company import Company
 from fastapi import HTTPException, status
 from datetime import datetime
 from typing import Optional, List
 
+USER_FIELD_COLUMNS = {
+    "id": User.id,
+    "username": User.username,
+    "phone_num": User.phone_num,
+    "email": User.email,
+    "is_active": User.is_active,
+    "role": UserCompanyRole.role,
+    "company_id": UserCompanyRole.company_id,
+    "can_delete_government": UserCompanyRole.can_delete_government,
+    "can_manage_government_admins": UserCompanyRole.can_manage_government_admins,
+    "can_manage_operators": UserCompanyRole.can_manage_operators
+}
+
 class SQLAlchemyUserRepository(UserRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -175,7 +189,9 @@ class SQLAlchemyUserRepository(UserRepository):
                 phone_num=db_user.phone_num,
                 email=db_user.email,
                 hashed_password=db_user.hashed_password,
-                is_active=db_user.is_active
+                is_active=db_user.is_active,
+                is_premium=db_user.is_premium,
+                subscription_id=db_user.subscription_id
             )
         return None
 
@@ -211,21 +227,21 @@ class SQLAlchemyUserRepository(UserRepository):
         db_user.is_active = False
         self.db.commit()
 
-    def get_users_by_company(self, company_id: Optional[int]) -> List[UserEntity]:
+    def get_users_by_company(self, company_id: Optional[int], page: int, per_page: int, columns: Optional[List] = None) -> List[dict]:
+        # One row per membership: without a company filter a user in several
+        # companies is listed once per company (and counted the same way), and
+        # a user without any membership appears once with null role columns.
+        query = select(*(columns or [column.label(name) for name, column in USER_FIELD_COLUMNS.items()])).select_from(User)
         if company_id:
-            db_users = self.db.query(User).filter(User.company_id == company_id).all()
+            query = query.join(UserCompanyRole, UserCompanyRole.user_id == User.id).where(UserCompanyRole.company_id == company_id)
         else:
-            db_users = self.db.query(User).all()
-        return [
-            UserEntity(
-                id=db_user.id,
-                username=db_user.username,
-                phone_num=db_user.phone_num,
-                email=db_user.email,
-                hashed_password=db_user.hashed_password,
-                is_active=db_user.is_active,
-                is_premium=db_user.is_premium,
-                subscription_id=db_user.subscription_id
-            )
-            for db_user in db_users
-        ]
\ No newline at end of file
+            query = query.outerjoin(UserCompanyRole, UserCompanyRole.user_id == User.id)
+        query = query.order_by(User.id, UserCompanyRole.company_id).offset((page - 1) * per_page).limit(per_page)
+        return [dict(row) for row in self.db.execute(query).mappings()]
+
+    def count_users_by_company(self, company_id: Optional[int]) -> int:
+        if company_id:
+            query = select(func.count()).select_from(UserCompanyRole).where(UserCompanyRole.company_id == company_id)
+        else:
+            query = select(func.count()).select_from(User).outerjoin(UserCompanyRole, UserCompanyRole.user_id == User.id)
+        return self.db.scalar(query)
@@ -10,6 +10,8 @@ class UserEntity:
     email: Optional[str]
     hashed_password: str
     is_active: bool
+    is_premium: bool = False
+    subscription_id: Optional[int] = None
 
 
 @dataclass
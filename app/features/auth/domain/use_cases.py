@@ -1,7 +1,7 @@
 from app.features.auth.data.schemas import Role
 from app.features.auth.domain.entities import UserEntity, ResetCodeEntity
 from app.features.auth.domain.repositories import UserRepository
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import password_hasher, create_access_token
 from app.core.email.email import send_reset_code
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
@@ -15,9 +15,9 @@ class LoginUseCase:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    def execute(self, username: str, password: str) -> dict:
+    async def execute(self, username: str, password: str) -> dict:
         user = self.repository.get_user_by_username(username)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
         access_token = create_access_token(data={"sub": user.username, "role": user.role, "id": user.id})
         return {"access_token": access_token, "token_type": "bearer"}
@@ -26,7 +26,7 @@ class SignupUseCase:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    def execute(self, username: str, phone_num: Optional[str], email: Optional[str], password: str, company_name: str) -> UserEntity:
+    async def execute(self, username: str, phone_num: Optional[str], email: Optional[str], password: str, company_name: str) -> UserEntity:
         if not email and not phone_num:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one of email or phone number must be provided")
         if self.repository.get_user_by_username(username) or (email and self.repository.get_user_by_email(email)):
@@ -45,7 +45,7 @@ class SignupUseCase:
             )
         )
         
-        hashed_password = get_password_hash(password)
+        hashed_password = await password_hasher.hash(password)
         user = UserEntity(
             id=None,
             username=username,
@@ -98,7 +98,7 @@ class ResetPasswordUseCase:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    def execute(self, reset_code: str, new_password: str) -> None:
+    async def execute(self, reset_code: str, new_password: str) -> None:
         reset_code_entity = self.repository.get_reset_code(reset_code)
         if not reset_code_entity:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reset code")
@@ -111,7 +111,7 @@ class ResetPasswordUseCase:
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await password_hasher.hash(new_password)
         self.repository.update_user(user)
         
         self.repository.delete_reset_code(reset_code)
\ No newline at end of file
@@ -2,10 +2,15 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from app.features.auth.data.models import User, OtpToken, ResetCode, LoginAttempt
 from app.features.auth.data.schemas import UserCreate, UserResponse, VerifyOtpRequest, SignUpResponse, LoginResponse, ResetCodeResponse
-from app.core.security import get_password_hash, verify_password, SECRET_KEY, ALGORITHM
+from app.core.security import (
+    password_hasher, invalidate_principal_on_commit, create_principal_token, login_tracker,
+    SECRET_KEY, ALGORITHM, STATELESS_TOKENS, LOGIN_BAN_HOURS
+)
+from app.core.security.membership import MembershipResolver
 from app.core.logger.logger import DatabaseLogger
 from datetime import datetime, timedelta
 import secrets
+import uuid
 import jwt
 from typing import Optional
 
@@ -16,7 +21,7 @@ class AuthService:
         self.db = db
         self.logger = DatabaseLogger(db)
 
-    def signup(self, user: UserCreate) -> SignUpResponse:
+    async def signup(self, user: UserCreate) -> SignUpResponse:
         if self.db.query(User).filter(User.username == user.username).first():
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
         if user.email and self.db.query(User).filter(User.email == user.email).first():
@@ -24,7 +29,7 @@ class AuthService:
         if user.phone_num and self.db.query(User).filter(User.phone_num == user.phone_num).first():
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Phone number already exists")
 
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await password_hasher.hash(user.password)
         db_user = User(
             username=user.username,
             phone_num=user.phone_num,
@@ -64,12 +69,20 @@ class AuthService:
             temp_token=temp_token_str
         )
 
-    def login(self, username: str, password: str) -> LoginResponse:
+    async def login(self, username: str, password: str, client_ip: Optional[str] = None) -> LoginResponse:
+        if client_ip and login_tracker.is_banned(client_ip):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Too many attempts. IP banned for {LOGIN_BAN_HOURS} hours.")
+
         user = self.db.query(User).filter(User.username == username).first()
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
+            if client_ip:
+                login_tracker.record_failure(client_ip, username)
             self.logger.log(action="LOGIN_FAILED", details=f"Failed login for {username}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid username or password")
 
+        if client_ip:
+            login_tracker.record_success(client_ip, username)
+
         # Remove is_active check to allow OTP verification to activate the user
         otp = secrets.token_hex(3)
         temp_token_str = secrets.token_urlsafe(32)
@@ -96,7 +109,10 @@ class AuthService:
             temp_token=temp_token_str
         )
 
-    def verify_login_otp(self, request: VerifyOtpRequest) -> str:
+    def verify_login_otp(self, request: VerifyOtpRequest, client_ip: Optional[str] = None) -> str:
+        if client_ip and login_tracker.is_banned(client_ip):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Too many attempts. IP banned for {LOGIN_BAN_HOURS} hours.")
+
         otp_token = self.db.query(OtpToken).filter(
             OtpToken.user_id == request.user_id,
             OtpToken.token == request.otp,
@@ -106,6 +122,8 @@ class AuthService:
         ).first()
 
         if not otp_token:
+            if client_ip:
+                login_tracker.record_failure(client_ip, str(request.user_id))
             print(f"OTP verification failed for user_id={request.user_id}, otp={request.otp}, temp_token={request.temp_token}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid, expired, or incorrect OTP/Session")
 
@@ -119,17 +137,22 @@ class AuthService:
             user.is_active = True
             self.logger.log(action="USER_ACTIVATED", user_id=user.id, details=f"User {user.username} activated")
         
+        invalidate_principal_on_commit(self.db, user.id)
         self.db.commit()
         self.db.refresh(user)
         print(f"User {user.username} processed, is_active={user.is_active}")
 
-        payload = {
-            "sub": str(user.id),
-            "username": user.username,
-            "is_premium": user.is_premium,
-            "exp": datetime.utcnow() + timedelta(hours=24)
-        }
-        token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+        if STATELESS_TOKENS:
+            token = create_principal_token(user, MembershipResolver(self.db).for_user(user.id))
+        else:
+            payload = {
+                "sub": str(user.id),
+                "username": user.username,
+                "is_premium": user.is_premium,
+                "exp": datetime.utcnow() + timedelta(hours=24),
+                "jti": uuid.uuid4().hex
+            }
+            token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
         self.logger.log(action="LOGIN_SUCCESS", user_id=user.id, details=f"User {user.username} logged in")
 
@@ -168,7 +191,7 @@ class AuthService:
 
         return ResetCodeResponse.from_orm(reset_code)
 
-    def verify_reset_code(self, user_id: int, code: str, new_password: str):
+    async def verify_reset_code(self, user_id: int, code: str, new_password: str):
         reset_code = self.db.query(ResetCode).filter(
             ResetCode.user_id == user_id,
             ResetCode.code == code,
@@ -183,7 +206,7 @@ class AuthService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
         reset_code.is_used = True
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await password_hasher.hash(new_password)
         self.db.commit()
 
         self.logger.log(action="PASSWORD_RESET", user_id=user_id, details=f"Password reset for {user.username}")
\ No newline at end of file
@@ -3,10 +3,11 @@ from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from app.features.company.data.repository import CompanyRepository
-from app.features.company.data.schemas import CompanyCreate, CompanyOverviewResponse, CompanyUpdate, CompanyResponse
+from app.features.company.data.schemas import CompanyCreate, CompanyOverviewResponse, CompanyUpdate, CompanyResponse, CompanyRow
 from app.features.company.service.company_service import CompanyService
 from app.db import get_db
 from app.core.security import get_current_user
+from app.core.responses.rows import RowsJSONResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from typing import Optional, List
@@ -63,7 +64,7 @@ async def list_companies(
     company_service: CompanyService = Depends(get_company_service),
     current_user: dict = Depends(get_current_user)
 ):
-    return company_service.list_companies(current_user, page, per_page)
+    return RowsJSONResponse(company_service.list_companies(current_user, page, per_page), CompanyRow)
 
 @router.get("/who_is")
 @limiter.limit("10/minute")
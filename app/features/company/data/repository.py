@@ -1,3 +1,4 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.features.auth.data.models import UserCompanyRole
 from app.features.company.domain.entities import CompanyEntity
@@ -53,27 +54,14 @@ class CompanyRepository:
     def get_companies_for_user(self, user_id: int, page: int, per_page: int) -> List[dict]:
  
         offset = (page - 1) * per_page
-        results = (
-            self.db.query(Company, UserCompanyRole.role)
+        query = (
+            select(Company.id, Company.name, Company.is_active, Company.created_at, Company.updated_at, UserCompanyRole.role)
             .join(UserCompanyRole, Company.id == UserCompanyRole.company_id)
-            .filter(UserCompanyRole.user_id == user_id, Company.is_active == True)
+            .where(UserCompanyRole.user_id == user_id, Company.is_active == True)
             .offset(offset)
             .limit(per_page)
-            .all()
         )
-        companies_with_roles = []
-        for company, role in results:
-            companies_with_roles.append(
-                {
-                    "id": company.id,
-                    "name": company.name,
-                    "is_active": company.is_active,
-                    "created_at": company.created_at,
-                    "updated_at": company.updated_at,
-                    "role": role,
-                }
-            )
-        return companies_with_roles
+        return [dict(row) for row in self.db.execute(query).mappings()]
 
     def update_company(self, company: CompanyEntity) -> CompanyEntity:
         db_company = self.db.query(Company).filter(Company.id == company.id).first()
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
+from typing_extensions import TypedDict
 from datetime import datetime
 
 class CompanyBase(BaseModel):
@@ -22,6 +23,16 @@ class CompanyResponse(CompanyBase):
     class Config:
         from_attributes = True
 
+class CompanyRow(TypedDict):
+    """One company of the caller as served by the list endpoint; same shape as CompanyResponse."""
+    id: int
+    name: str
+    is_active: bool
+    government_admin_id: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+    role: Optional[str]
+
 class CompanyWithRoleResponse(BaseModel):
     id: int
     name: str
@@ -36,6 +47,8 @@ class CompanyOverviewResponse(BaseModel):
     is_active: bool
     user_count: int
     assets_count: int
+    assets_value: int = 0
+    assets_by_status: Dict[str, int] = {}
     
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,5 +1,5 @@
 from app.core.validators.role_validator import RoleValidator
-from app.db import get_db
+from app.core.security.permissions import permissions_for
 from app.features.company.domain.entities import CompanyEntity
 from app.features.company.data.repository import CompanyRepository
 from fastapi import HTTPException, status
@@ -32,14 +32,7 @@ class UpdateCompanyUseCase:
         self.company_repository = company_repository
 
     def execute(self, company_id: int, name: str, is_active: Optional[bool], current_user: dict) -> CompanyEntity:
-        from app.features.auth.data.models import UserCompanyRole
-        from sqlalchemy.orm import Session
-        db = next(get_db())
-        
-        role = db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"],
-            UserCompanyRole.company_id == company_id
-        ).first()
+        role = permissions_for(self.company_repository.db, current_user["id"]).membership(company_id)
         if not role or role.role not in ["A1", "S"] or (role.role == "A1" and not role.can_manage_government_admins):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins or authorized Admins can update companies")
         
@@ -57,14 +50,7 @@ class DeleteCompanyUseCase:
         self.repository = repository
 
     def execute(self, company_id: int, current_user: dict) -> None:
-        from app.features.auth.data.models import UserCompanyRole
-        from sqlalchemy.orm import Session
-        db = next(get_db())
-        
-        role = db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"],
-            UserCompanyRole.company_id == company_id
-        ).first()
+        role = permissions_for(self.repository.db, current_user["id"]).membership(company_id)
         if not role or (role.role != "S" and not role.can_delete_government):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins or authorized users can delete companies")
         
@@ -78,14 +64,7 @@ class ListCompaniesUseCase:
         self.repository = repository
 
     def execute(self, current_user: dict, page: int, per_page: int) -> List[CompanyEntity]:
-        from app.features.auth.data.models import UserCompanyRole
-        from sqlalchemy.orm import Session
-        db = next(get_db())
-        
-        role = db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"]
-        ).first()
-        if not role or role.role != "S":
+        if not permissions_for(self.repository.db, current_user["id"]).is_super_admin:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can list companies")
         
         companies = self.repository.get_companies(page, per_page)
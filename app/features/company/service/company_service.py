@@ -2,13 +2,17 @@ from datetime import datetime
 from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from app.core.logger.audit_sink import audit_sink
 from app.core.models.company import Company
 from app.features.company.domain.entities import CompanyEntity
 from app.features.company.data.repository import CompanyRepository
 from app.features.company.data.schemas import CompanyResponse
 from app.features.auth.data.models import User, UserCompanyRole
-from app.features.logs.data.models import Log
+from app.features.assets_management.data.asset_stats import AssetStatsRepository
 from app.features.subscription.service.subscription_service import SubscriptionService
+from app.core.security import invalidate_principal_on_commit
+from app.core.security.membership import MembershipResolver
+from app.core.security.permissions import permissions_for
 
 
 class CompanyService:
@@ -44,9 +48,10 @@ class CompanyService:
             can_delete_government=True
         )
         self.db.add(user_company_role)
+        invalidate_principal_on_commit(self.db, current_user["id"])
         self.db.commit()
 
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             company_id=db_company.id,
             action="COMPANY_CREATE",
@@ -65,10 +70,7 @@ class CompanyService:
         )
 
     def update_company(self, company_id: int, name: str, government_admin_id: Optional[int], is_active: bool, current_user: dict) -> CompanyResponse:
-        role = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"],
-            UserCompanyRole.company_id == company_id
-        ).first()
+        role = permissions_for(self.db, current_user["id"]).membership(company_id)
         if not role or role.role not in ["A1", "S"] or (role.role == "A1" and not role.can_manage_government_admins):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized to update company")
@@ -83,7 +85,7 @@ class CompanyService:
         company.updated_at = datetime.utcnow()
         db_company = self.repository.update_company(company)
 
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             company_id=company_id,
             action="COMPANY_UPDATE",
@@ -101,20 +103,13 @@ class CompanyService:
         )
 
     def delete_company(self, company_id: int, current_user: dict) -> None:
-        role = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"],
-            UserCompanyRole.company_id == company_id
-        ).first()
-
-        is_super_admin = "S" in [r.role for r in self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"]).all()]
-
-        if not (is_super_admin or (role and role.can_delete_government)):
+        permissions = permissions_for(self.db, current_user["id"])
+        if not (permissions.is_super_admin or permissions.can_delete_government(company_id)):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized to delete company")
 
         self.repository.delete_company(company_id)
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             company_id=company_id,
             action="COMPANY_DELETE",
@@ -123,54 +118,33 @@ class CompanyService:
             details=f"Deleted company {company_id}"
         )
 
-    def list_companies(self, current_user: dict, page: int, per_page: int) -> List[CompanyResponse]:
+    def list_companies(self, current_user: dict, page: int, per_page: int) -> List[dict]:
     
         user_id = current_user["id"]
         companies_data = self.repository.get_companies_for_user(
             user_id, page, per_page)
 
-        response_list = []
         for company_data in companies_data:
-            response_list.append(CompanyResponse(
-                **company_data, government_admin_id=None))
+            company_data["government_admin_id"] = None
 
-        return response_list
+        return companies_data
 
     def who_is(self, current_user: dict) -> list:
-        roles = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"]).all()
+        memberships = MembershipResolver(self.db).for_user(current_user["id"])
         return [
             {
-                "company_id": role.company_id,
-                "company_name": self.repository.get_company_by_id(role.company_id).name,
-                "role": role.role,
-                "can_delete_government": role.can_delete_government,
-                "can_manage_government_admins": role.can_manage_government_admins,
-                "can_manage_operators": role.can_manage_operators
+                "company_id": membership.company_id,
+                "company_name": membership.company_name,
+                "role": membership.role,
+                "can_delete_government": membership.can_delete_government,
+                "can_manage_government_admins": membership.can_manage_government_admins,
+                "can_manage_operators": membership.can_manage_operators
             }
-            for role in roles
+            for membership in memberships
         ]
 
-    def _log_action(self, user_id: int, company_id: int, action: str, entity_type: str, entity_id: int = None, details: str = ""):
-        log = Log(
-            user_id=user_id,
-            company_id=company_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-            timestamp=datetime.utcnow()
-        )
-        self.db.add(log)
-        self.db.commit()
-    
     def get_company_overview(self, company_id: int, current_user: dict) -> dict:
-        user_role_in_company = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"],
-            UserCompanyRole.company_id == company_id
-        ).first()
-
-        if not user_role_in_company and current_user.get("role") != "S":
+        if not permissions_for(self.db, current_user["id"]).is_member(company_id) and current_user.get("role") != "S":
              raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
         company = self.repository.get_company_by_id(company_id)
@@ -180,13 +154,14 @@ class CompanyService:
         # تعداد کاربران شرکت را محاسبه می‌کنیم
         user_count = self.db.query(UserCompanyRole).filter(UserCompanyRole.company_id == company_id).count()
         
-        # TODO: تعداد اموال در آینده محاسبه خواهد شد
-        assets_count = 0 
+        asset_stats = AssetStatsRepository(self.db).get_company_stats(company_id)
 
         return {
             "id": company.id,
             "name": company.name,
             "is_active": company.is_active,
             "user_count": user_count,
-            "assets_count": assets_count
+            "assets_count": asset_stats["total_assets"],
+            "assets_value": asset_stats["total_value"],
+            "assets_by_status": asset_stats["status_breakdown"]
         }
\ No newline at end of file
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.features.logs.service.log_service import LogService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.features.logs.service.log_service import LogService, AsyncLogService
 from app.features.logs.data.repository import LogRepository
-from app.db import get_db
+from app.features.logs.data.async_repository import AsyncLogRepository
+from app.features.logs.data.read_repository import LogRecord
+from app.db import get_db, get_async_db, use_async_db, call_service
+from app.core.pagination.cursor import set_next_cursor
+from app.core.responses.rows import RowsJSONResponse
 from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel
@@ -30,10 +35,18 @@ class LogResponse(BaseModel):
     class Config:
         from_attributes = True
 
+def get_log_service(db: Session = Depends(get_db)) -> LogService:
+    return LogService(LogRepository(db), db)
+
+def get_async_log_service(db: AsyncSession = Depends(get_async_db)) -> AsyncLogService:
+    return AsyncLogService(AsyncLogRepository(db))
+
+log_service_dependency = get_async_log_service if use_async_db("logs") else get_log_service
+
 @router.post("/", response_model=LogResponse)
-def create_log(log: LogCreate, db: Session = Depends(get_db)):
-    service = LogService(LogRepository(db), db)
-    return service.create_log(
+async def create_log(log: LogCreate, service: LogService = Depends(log_service_dependency)):
+    return await call_service(
+        service.create_log,
         user_id=log.user_id,
         company_id=log.company_id,
         action=log.action,
@@ -43,20 +56,22 @@ def create_log(log: LogCreate, db: Session = Depends(get_db)):
     )
 
 @router.delete("/{log_id}")
-def delete_log(log_id: int, current_user: dict = Depends(lambda: {"id": 1, "role": "S"}), db: Session = Depends(get_db)):
-    service = LogService(LogRepository(db), db)
-    service.delete_log(log_id, current_user)
+async def delete_log(log_id: int, current_user: dict = Depends(lambda: {"id": 1, "role": "S"}), service: LogService = Depends(log_service_dependency)):
+    await call_service(service.delete_log, log_id, current_user)
     return {"message": "Log deleted successfully"}
 
 @router.get("/", response_model=List[LogResponse])
-def get_logs(
+async def get_logs(
     company_id: Optional[int] = None,
     page: int = 1,
     per_page: int = 10,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(lambda: {"id": 1, "role": "S"}),
-    db: Session = Depends(get_db)
+    service: LogService = Depends(log_service_dependency)
 ):
-    service = LogService(LogRepository(db), db)
-    return service.get_logs(company_id, current_user, page, per_page, start_date, end_date)
\ No newline at end of file
+    logs = await call_service(service.get_logs, company_id, current_user, page, per_page, start_date, end_date, cursor)
+    response = RowsJSONResponse(logs, LogRecord)
+    set_next_cursor(response, logs, per_page, "timestamp")
+    return response
\ No newline at end of file
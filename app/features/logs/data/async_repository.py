@@ -0,0 +1,55 @@
+from sqlalchemy import select, and_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from app.features.logs.data.models import Log
+from app.core.security.permissions import async_permissions_for
+from typing import List, Optional
+from datetime import datetime
+
+class AsyncLogRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_log(self, user_id: Optional[int], company_id: Optional[int], action: str, entity_type: str, entity_id: Optional[int], details: Optional[str]) -> Log:
+        log = Log(
+            user_id=user_id,
+            company_id=company_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            details=details,
+            timestamp=datetime.utcnow()
+        )
+        self.db.add(log)
+        await self.db.commit()
+        await self.db.refresh(log)
+        return log
+
+    async def delete_log(self, log_id: int, current_user: dict) -> None:
+        if not (await async_permissions_for(self.db, current_user["id"])).is_super_admin:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can delete logs")
+
+        log = await self.db.get(Log, log_id)
+        if not log:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Log not found")
+
+        await self.db.delete(log)
+        await self.db.commit()
+
+    async def get_logs(self, company_id: Optional[int], page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, after: Optional[dict] = None) -> List[Log]:
+        query = select(Log)
+        if company_id:
+            query = query.where(Log.company_id == company_id)
+
+        if start_date and end_date:
+            query = query.where(and_(
+                Log.timestamp >= start_date,
+                Log.timestamp <= end_date
+            ))
+
+        query = query.order_by(Log.timestamp.desc(), Log.id.desc()).limit(per_page)
+        if after:
+            query = query.where(tuple_(Log.timestamp, Log.id) < tuple_(after["timestamp"], after["id"]))
+        else:
+            query = query.offset((page - 1) * per_page)
+        return list(await self.db.scalars(query))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from datetime import datetime
 from app.core.models.base import Base
 
@@ -11,4 +11,8 @@ class Log(Base):
     entity_type = Column(String)
     entity_id = Column(Integer, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    details = Column(String, nullable=True)
\ No newline at end of file
+    details = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index('ix_logs_company_timestamp', 'company_id', 'timestamp'),
+    )
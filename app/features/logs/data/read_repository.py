@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import and_, lambda_stmt, select, tuple_
+from app.core.readonly.repository import AsyncReadOnlyRepository, ReadOnlyRepository, record_columns
+from app.features.logs.data.models import Log
+
+
+@dataclass(frozen=True, slots=True)
+class LogRecord:
+    id: int
+    user_id: Optional[int]
+    company_id: Optional[int]
+    action: str
+    entity_type: str
+    entity_id: Optional[int]
+    details: Optional[str]
+    timestamp: datetime
+
+
+LOG_RECORD_COLUMNS = record_columns(LogRecord, Log.__table__)
+
+
+def logs_page_statement(
+    company_id: Optional[int],
+    page: int,
+    per_page: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    after: Optional[dict] = None
+):
+    statement = lambda_stmt(lambda: select(*LOG_RECORD_COLUMNS).order_by(Log.timestamp.desc(), Log.id.desc()).limit(per_page))
+    if company_id:
+        statement += lambda s: s.where(Log.company_id == company_id)
+    if start_date and end_date:
+        statement += lambda s: s.where(and_(Log.timestamp >= start_date, Log.timestamp <= end_date))
+    if after:
+        after_timestamp, after_id = after["timestamp"], after["id"]
+        return statement + (lambda s: s.where(tuple_(Log.timestamp, Log.id) < tuple_(after_timestamp, after_id)))
+    offset = (page - 1) * per_page
+    return statement + (lambda s: s.offset(offset))
+
+
+class LogReadRepository(ReadOnlyRepository):
+    """Read-only log listing returning ``LogRecord`` rows."""
+
+    def get_logs(self, company_id: Optional[int], page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, after: Optional[dict] = None) -> List[LogRecord]:
+        return self.fetch(logs_page_statement(company_id, page, per_page, start_date, end_date, after), LogRecord)
+
+
+class AsyncLogReadRepository(AsyncReadOnlyRepository):
+    async def get_logs(self, company_id: Optional[int], page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, after: Optional[dict] = None) -> List[LogRecord]:
+        return await self.fetch(logs_page_statement(company_id, page, per_page, start_date, end_date, after), LogRecord)
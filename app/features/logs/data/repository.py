@@ -1,8 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_
 from fastapi import HTTPException, status
 from app.features.logs.data.models import Log
-from app.features.auth.data.models import UserCompanyRole
+from app.core.security.permissions import permissions_for
 from typing import List, Optional
 from datetime import datetime
 
@@ -26,10 +26,7 @@ class LogRepository:
         return log
 
     def delete_log(self, log_id: int, current_user: dict) -> None:
-        role = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"]
-        ).first()
-        if not role or role.role != "S":
+        if not permissions_for(self.db, current_user["id"]).is_super_admin:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins can delete logs")
         
         log = self.db.query(Log).filter(Log.id == log_id).first()
@@ -39,7 +36,7 @@ class LogRepository:
         self.db.delete(log)
         self.db.commit()
 
-    def get_logs(self, company_id: Optional[int], page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Log]:
+    def get_logs(self, company_id: Optional[int], page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, after: Optional[dict] = None) -> List[Log]:
         query = self.db.query(Log)
         if company_id:
             query = query.filter(Log.company_id == company_id)
@@ -50,5 +47,8 @@ class LogRepository:
                 Log.timestamp <= end_date
             ))
         
+        query = query.order_by(Log.timestamp.desc(), Log.id.desc())
+        if after:
+            return query.filter(tuple_(Log.timestamp, Log.id) < tuple_(after["timestamp"], after["id"])).limit(per_page).all()
         offset = (page - 1) * per_page
-        return query.order_by(Log.timestamp.desc()).offset(offset).limit(per_page).all()
\ No newline at end of file
+        return query.offset(offset).limit(per_page).all()
\ No newline at end of file
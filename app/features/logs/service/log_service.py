@@ -1,7 +1,10 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from app.core.pagination.cursor import decode_cursor
 from app.features.logs.data.repository import LogRepository
-from app.features.auth.data.models import UserCompanyRole
+from app.features.logs.data.async_repository import AsyncLogRepository
+from app.features.logs.data.read_repository import AsyncLogReadRepository, LogReadRepository, LogRecord
+from app.core.security.permissions import permissions_for, async_permissions_for
 from typing import List, Optional
 from datetime import datetime
 
@@ -9,6 +12,7 @@ class LogService:
     def __init__(self, repository: LogRepository, db: Session):
         self.repository = repository
         self.db = db
+        self.reader = LogReadRepository(db)
 
     def create_log(self, user_id: Optional[int], company_id: Optional[int], action: str, entity_type: str, entity_id: Optional[int], details: Optional[str]) -> dict:
         log = self.repository.create_log(user_id, company_id, action, entity_type, entity_id, details)
@@ -26,28 +30,42 @@ class LogService:
     def delete_log(self, log_id: int, current_user: dict) -> None:
         self.repository.delete_log(log_id, current_user)
 
-    def get_logs(self, company_id: Optional[int], current_user: dict, page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[dict]:
-        role = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == current_user["id"]
-        ).first()
-        if not role or role.role != "S":
-            if company_id is None or not self.db.query(UserCompanyRole).filter(
-                UserCompanyRole.user_id == current_user["id"],
-                UserCompanyRole.company_id == company_id
-            ).first():
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized to view logs")
+    def get_logs(self, company_id: Optional[int], current_user: dict, page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, cursor: Optional[str] = None) -> List[LogRecord]:
+        permissions = permissions_for(self.db, current_user["id"])
+        if not permissions.is_super_admin and not permissions.is_member(company_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized to view logs")
         
-        logs = self.repository.get_logs(company_id, page, per_page, start_date, end_date)
-        return [
-            {
-                "id": log.id,
-                "user_id": log.user_id,
-                "company_id": log.company_id,
-                "action": log.action,
-                "entity_type": log.entity_type,
-                "entity_id": log.entity_id,
-                "details": log.details,
-                "timestamp": log.timestamp
-            }
-            for log in logs
-        ]
\ No newline at end of file
+        after = decode_cursor(cursor, "timestamp") if cursor else None
+        return self.reader.get_logs(company_id, page, per_page, start_date, end_date, after)
+
+class AsyncLogService:
+    def __init__(self, repository: AsyncLogRepository):
+        self.repository = repository
+        self.reader = AsyncLogReadRepository(repository.db)
+
+    async def create_log(self, user_id: Optional[int], company_id: Optional[int], action: str, entity_type: str, entity_id: Optional[int], details: Optional[str]) -> dict:
+        log = await self.repository.create_log(user_id, company_id, action, entity_type, entity_id, details)
+        return _log_to_dict(log)
+
+    async def delete_log(self, log_id: int, current_user: dict) -> None:
+        await self.repository.delete_log(log_id, current_user)
+
+    async def get_logs(self, company_id: Optional[int], current_user: dict, page: int, per_page: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, cursor: Optional[str] = None) -> List[LogRecord]:
+        permissions = await async_permissions_for(self.repository.db, current_user["id"])
+        if not permissions.is_super_admin and not permissions.is_member(company_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized to view logs")
+
+        after = decode_cursor(cursor, "timestamp") if cursor else None
+        return await self.reader.get_logs(company_id, page, per_page, start_date, end_date, after)
+
+def _log_to_dict(log) -> dict:
+    return {
+        "id": log.id,
+        "user_id": log.user_id,
+        "company_id": log.company_id,
+        "action": log.action,
+        "entity_type": log.entity_type,
+        "entity_id": log.entity_id,
+        "details": log.details,
+        "timestamp": log.timestamp
+    }
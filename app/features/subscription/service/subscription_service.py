@@ -2,10 +2,10 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from app.core.logger.audit_sink import audit_sink
 from app.features.subscription.data.models import Subscription
 from app.features.subscription.data.repository import SubscriptionRepository
 from app.features.subscription.data.schemas import SubscriptionResponse
-from app.features.logs.data.models import Log
 from app.features.auth.data.models import User
 from app.core.security import get_current_user
 import uuid
@@ -62,7 +62,7 @@ class SubscriptionService:
         self.db.commit()
         self.db.refresh(subscription)
 
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             action="SUBSCRIPTION_CREATE",
             entity_type="SUBSCRIPTION",
@@ -99,7 +99,7 @@ class SubscriptionService:
         self.db.commit()
         self.db.refresh(subscription)
 
-        self._log_action(
+        audit_sink.log(
             user_id=subscription.user_id,
             action="SUBSCRIPTION_ACTIVATED",
             entity_type="SUBSCRIPTION",
@@ -150,18 +150,6 @@ class SubscriptionService:
     def user_can_create_company(self, user_id: int) -> bool:
         return self.user_has_active_subscription(user_id)
 
-    def _log_action(self, user_id: int, action: str, entity_type: str, entity_id: int = None, details: str = ""):
-        log = Log(
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-            timestamp=datetime.utcnow()
-        )
-        self.db.add(log)
-        self.db.commit()
-        
     def get_user_active_subscription_details(self, user_id: int) -> Optional[Subscription]:
         active_subscription = self.db.query(Subscription).filter(
             Subscription.user_id == user_id,
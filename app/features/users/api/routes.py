@@ -1,11 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
 from app.features.auth.data.repository import SQLAlchemyUserRepository 
 from app.features.subscription.api.routes import get_subscription_service
 from app.features.subscription.service.subscription_service import SubscriptionService
-from app.features.users.data.schemas import UserCreate, UserProfileResponse, UserUpdate, UserResponse
+from app.features.users.data.schemas import UserCreate, UserListResponse, UserProfileResponse, UserUpdate, UserResponse
 from app.features.users.service.user_service import UserService
-from app.db import get_db
+from app.db.unit_of_work import UnitOfWork, get_unit_of_work
 from app.core.security import get_current_user
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -15,10 +14,10 @@ router = APIRouter(prefix="/users", tags=["users"])
 limiter = Limiter(key_func=get_remote_address)
 
 def get_user_service(
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     subscription_service: SubscriptionService = Depends(get_subscription_service)
 ) -> UserService:
-    repository = SQLAlchemyUserRepository(db) 
+    repository = SQLAlchemyUserRepository(uow.session) 
     return UserService(repository=repository, subscription_service=subscription_service)
 
 
@@ -30,7 +29,7 @@ async def create_user(
     user_service: UserService = Depends(get_user_service),
     current_user: dict = Depends(get_current_user)
 ):
-    return user_service.create_user(
+    return await user_service.create_user(
         user.username,
         user.phone_num,
         user.email,
@@ -59,7 +58,7 @@ async def update_user(
     user_service: UserService = Depends(get_user_service),
     current_user: dict = Depends(get_current_user)
 ):
-    return user_service.update_user(
+    return await user_service.update_user(
         user_id,
         user.username,
         user.phone_num,
@@ -85,7 +84,7 @@ async def delete_user(
     user_service.delete_user(user_id, current_user)
     return {"message": "User deleted successfully"}
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=UserListResponse, response_model_exclude_unset=True)
 async def list_users(
     company_id: Optional[int] = None,
     page: int = 1,
@@ -107,7 +106,7 @@ async def change_user_role(
     user_service: UserService = Depends(get_user_service),
     current_user: dict = Depends(get_current_user)
 ):
-    return user_service.change_user_role(
+    return await user_service.change_user_role(
         user_id=user_id,
         new_role=new_role,
         current_user=current_user
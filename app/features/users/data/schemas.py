@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from app.core.models.user_rules import Role
@@ -60,4 +60,27 @@ class UserResponse(UserBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PaginationMeta(BaseModel):
+    total: int
+    page: int
+    per_page: int
+    total_pages: int
+
+class ProjectedUserResponse(BaseModel):
+    """UserResponse restricted to the fields the caller's role may see; unset fields are omitted."""
+    id: Optional[int] = None
+    username: Optional[str] = None
+    phone_num: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[Role] = None
+    company_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    can_delete_government: Optional[bool] = None
+    can_manage_government_admins: Optional[bool] = None
+    can_manage_operators: Optional[bool] = None
+
+class UserListResponse(BaseModel):
+    data: List[ProjectedUserResponse]
+    pagination: PaginationMeta
\ No newline at end of file
@@ -1,16 +1,19 @@
 from app.core.validators.role_validator import RoleValidator
 from app.features.users.domain.entities import UserEntity
-from app.features.auth.data.repository import UserRepository
-from app.core.security import get_password_hash
+from app.features.auth.data.repository import UserRepository, USER_FIELD_COLUMNS
+from app.core.models.user_rules import Role
+from app.core.security import password_hasher
+from app.core.security.permissions import permissions_for
+from app.core.security.policy import principal_policy
 from fastapi import HTTPException, status
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 class CreateUserUseCase:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    def execute(
+    async def execute(
         self,
         username: str,
         phone_num: Optional[str],
@@ -51,7 +54,7 @@ class CreateUserUseCase:
         else:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can create users")
         
-        hashed_password = get_password_hash(password)
+        hashed_password = await password_hasher.hash(password)
         user = UserEntity(
             id=None,
             username=username,
@@ -71,7 +74,7 @@ class UpdateUserUseCase:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    def execute(
+    async def execute(
         self,
         user_id: int,
         username: Optional[str],
@@ -90,33 +93,68 @@ class UpdateUserUseCase:
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
+        # Role, company and flags live on the membership, not on the user row.
+        requested_role = role.name if isinstance(role, Role) else role
+        target_permissions = permissions_for(self.repository.db, user_id)
         if current_user["role"] == "S":
-            pass
+            target = target_permissions.membership(company_id) or next(iter(target_permissions.memberships), None)
         elif current_user["role"] == "A1":
-            user_company = self.repository.get_user_by_id(current_user["id"]).company_id
-            if user.company_id != user_company or (role and role not in ["A2", "O"]):
+            target = target_permissions.membership(current_user["company_id"])
+            if target is None or (requested_role and requested_role not in ["A2", "O"]):
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Owners can only edit Non-Owner Government Admins or Operators in their own company")
         elif current_user["role"] == "A2":
-            current_user_entity = self.repository.get_user_by_id(current_user["id"])
-            if not current_user_entity.can_manage_operators:
+            if not permissions_for(self.repository.db, current_user["id"]).can_manage_operators(current_user["company_id"]):
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You are not authorized to manage operators")
-            user_company = current_user_entity.company_id
-            if user.company_id != user_company or user.role != "O":
+            target = target_permissions.membership(current_user["company_id"])
+            if target is None or target.role != "O":
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Non-Owner Government Admins can only edit Operators in their own company")
         else:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can update users")
         
+        # UserUpdate always carries every field, so only values that actually change need edit rights.
+        current = {
+            "username": user.username,
+            "phone_num": user.phone_num,
+            "email": user.email,
+            "role": target.role if target else None,
+            "company_id": target.company_id if target else None,
+            "is_active": user.is_active,
+            "can_delete_government": bool(target and target.can_delete_government),
+            "can_manage_government_admins": bool(target and target.can_manage_government_admins),
+            "can_manage_operators": bool(target and target.can_manage_operators)
+        }
+        requested = {
+            "username": username,
+            "phone_num": phone_num,
+            "email": email,
+            "role": requested_role,
+            "company_id": company_id,
+            "is_active": is_active,
+            "can_delete_government": can_delete_government,
+            "can_manage_government_admins": can_manage_government_admins,
+            "can_manage_operators": can_manage_operators
+        }
+        principal_policy(current_user).check_editable("users", [name for name, value in requested.items() if value is not None and value != current[name]])
+        
         user.username = username or user.username
         user.phone_num = phone_num or user.phone_num
         user.email = email or user.email
-        user.hashed_password = get_password_hash(password) if password else user.hashed_password
-        user.role = role or user.role
-        user.company_id = company_id or user.company_id
+        user.hashed_password = await password_hasher.hash(password) if password else user.hashed_password
         user.is_active = is_active if is_active is not None else user.is_active
-        user.can_delete_government = can_delete_government if can_delete_government is not None else user.can_delete_government
-        user.can_manage_government_admins = can_manage_government_admins if can_manage_government_admins is not None else user.can_manage_government_admins
-        user.can_manage_operators = can_manage_operators if can_manage_operators is not None else user.can_manage_operators
-        return self.repository.update_user(user)
+        updated = self.repository.update_user(user)
+        return UserEntity(
+            id=updated.id,
+            username=updated.username,
+            phone_num=updated.phone_num,
+            email=updated.email,
+            hashed_password=updated.hashed_password,
+            role=current["role"],
+            company_id=current["company_id"],
+            is_active=updated.is_active,
+            can_delete_government=current["can_delete_government"],
+            can_manage_government_admins=current["can_manage_government_admins"],
+            can_manage_operators=current["can_manage_operators"]
+        )
 
 class DeleteUserUseCase:
     def __init__(self, repository: UserRepository):
@@ -153,13 +191,19 @@ class ListUsersUseCase:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    def execute(self, company_id: Optional[int], current_user: dict, page: int, per_page: int) -> List[UserEntity]:
+    def execute(self, company_id: Optional[int], current_user: dict, page: int, per_page: int) -> Tuple[List[dict], int]:
         if current_user["role"] == "S":
-            return self.repository.get_users_by_company(company_id)
+            pass
         elif current_user["role"] in ["A1", "A2"]:
-            user_company = self.repository.get_user_by_id(current_user["id"]).company_id
+            user_company = current_user["company_id"]
             if company_id and company_id != user_company:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only view users in your own company")
-            return self.repository.get_users_by_company(user_company)
+            company_id = user_company
         else:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can list users")
\ No newline at end of file
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only authorized users can list users")
+        columns = principal_policy(current_user).columns("users", USER_FIELD_COLUMNS)
+        users = self.repository.get_users_by_company(company_id, page, per_page, columns)
+        if 0 < len(users) < per_page or (not users and page == 1):
+            # A short page is the last one, so the total follows without a COUNT.
+            return users, (page - 1) * per_page + len(users)
+        return users, self.repository.count_users_by_company(company_id)
\ No newline at end of file
@@ -1,14 +1,31 @@
 from datetime import datetime
+from app.core.logger.audit_sink import audit_sink
 from app.features.auth.data.models import UserCompanyRole
-from app.features.logs.data.models import Log
 from app.features.auth.data.repository import UserRepository
 from app.features.subscription.service.subscription_service import SubscriptionService
 from app.features.users.domain.user_cases import CreateUserUseCase, UpdateUserUseCase, DeleteUserUseCase, ListUsersUseCase
 from typing import Optional, List
 from app.features.users.domain.entities import UserEntity
+from app.core.security import invalidate_principal_on_commit
+from app.core.security.permissions import permissions_for
+from app.core.models.user_rules import Role
 from fastapi import HTTPException, status, Request
 
 from app.features.work_flow.data.models import WorkflowActionType
+from app.features.work_flow.data.repository import WorkFlowRepository
+
+_USER_FLAGS = ("can_delete_government", "can_manage_government_admins", "can_manage_operators")
+
+def _user_row(user: dict) -> dict:
+    # Rows only carry the columns the caller's role may see. Users without a
+    # membership come from the outer join with no role and no flags.
+    row = dict(user)
+    if "role" in row:
+        row["role"] = Role[row["role"]] if row["role"] in Role.__members__ else None
+    for flag in _USER_FLAGS:
+        if flag in row and row[flag] is not None:
+            row[flag] = bool(row[flag])
+    return row
 
 class UserService:
     
@@ -16,8 +33,9 @@ class UserService:
         self.repository = repository
         self.db = repository.db
         self.subscription_service = subscription_service
+        self.workflow_repository = WorkFlowRepository(self.db)
 
-    def create_user(
+    async def create_user(
         self,
         username: str,
         phone_num: Optional[str],
@@ -32,7 +50,7 @@ class UserService:
     ) -> dict:
         try:
             use_case = CreateUserUseCase(self.repository)
-            user = use_case.execute(
+            user = await use_case.execute(
                 username,
                 phone_num,
                 email,
@@ -44,12 +62,13 @@ class UserService:
                 can_manage_operators,
                 current_user
             )
-            self._log_action(
+            audit_sink.log(
                 user_id=current_user["id"],
                 action="USER_CREATE",
                 entity_type="USER",
                 entity_id=user.id,
-                details=f"Created user {user.username}"
+                details=f"Created user {user.username}",
+                session=self.db
             )
             return {
                 "id": user.id,
@@ -64,7 +83,7 @@ class UserService:
                 "can_manage_operators": user.can_manage_operators
             }
         except Exception as e:
-            self._log_action(
+            audit_sink.log(
                 user_id=current_user["id"],
                 action="USER_CREATE_FAILED",
                 entity_type="USER",
@@ -72,7 +91,7 @@ class UserService:
             )
             raise
 
-    def update_user(
+    async def update_user(
         self,
         user_id: int,
         username: Optional[str],
@@ -88,7 +107,7 @@ class UserService:
         current_user: dict
     ) -> dict:
         use_case = UpdateUserUseCase(self.repository)
-        user = use_case.execute(
+        user = await use_case.execute(
             user_id,
             username,
             phone_num,
@@ -102,14 +121,16 @@ class UserService:
             can_manage_operators,
             current_user
         )
-        self._log_action(
+        invalidate_principal_on_commit(self.db, user.id)
+        audit_sink.log(
             user_id=current_user["id"],
             action="USER_UPDATE",
             entity_type="USER",
             entity_id=user.id,
-            details=f"Updated user {user.username}"
+            details=f"Updated user {user.username}",
+            session=self.db
         )
-        return {
+        return _user_row({
             "id": user.id,
             "username": user.username,
             "phone_num": user.phone_num,
@@ -120,57 +141,44 @@ class UserService:
             "can_delete_government": user.can_delete_government,
             "can_manage_government_admins": user.can_manage_government_admins,
             "can_manage_operators": user.can_manage_operators
-        }
+        })
 
     def delete_user(self, user_id: int, current_user: dict) -> None:
         use_case = DeleteUserUseCase(self.repository)
         use_case.execute(user_id, current_user)
-        self._log_action(
+        invalidate_principal_on_commit(self.db, user_id)
+        audit_sink.log(
             user_id=current_user["id"],
             action="USER_DELETE",
             entity_type="USER",
             entity_id=user_id,
-            details=f"Deleted user {user_id}"
+            details=f"Deleted user {user_id}",
+            session=self.db
         )
 
-    def list_users(self, company_id: Optional[int], current_user: dict, page: int, per_page: int) -> List[dict]:
+    def list_users(self, company_id: Optional[int], current_user: dict, page: int, per_page: int) -> dict:
+        if page < 1 or per_page < 1:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="page and per_page must be positive")
         use_case = ListUsersUseCase(self.repository)
-        all_users = use_case.execute(company_id, current_user, page, per_page)
-        
-        start = (page - 1) * per_page
-        end = start + per_page
+        users, total = use_case.execute(company_id, current_user, page, per_page)
         
         return {
-            "data": [
-                {
-                    "id": user.id,
-                    "username": user.username,
-                    "phone_num": user.phone_num,
-                    "email": user.email,
-                    "role": user.role,
-                    "company_id": user.company_id,
-                    "is_active": user.is_active,
-                    "can_delete_government": user.can_delete_government,
-                    "can_manage_government_admins": user.can_manage_government_admins,
-                    "can_manage_operators": user.can_manage_operators
-                }
-                for user in all_users[start:end]
-            ],
+            "data": [_user_row(user) for user in users],
             "pagination": {
-                "total": len(all_users),
+                "total": total,
                 "page": page,
                 "per_page": per_page,
-                "total_pages": (len(all_users) + per_page - 1) // per_page
+                "total_pages": (total + per_page - 1) // per_page
             }
         }
 
-    def change_user_role(self, user_id: int, new_role: str, current_user: dict) -> dict:
+    async def change_user_role(self, user_id: int, new_role: str, current_user: dict) -> dict:
         use_case = UpdateUserUseCase(self.repository)
         user = self.repository.get_user_by_id(user_id)
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
-        user = use_case.execute(
+        user = await use_case.execute(
             user_id=user_id,
             username=user.username,
             phone_num=user.phone_num,
@@ -184,12 +192,14 @@ class UserService:
             can_manage_operators=user.can_manage_operators,
             current_user=current_user
         )
-        self._log_action(
+        invalidate_principal_on_commit(self.db, user.id)
+        audit_sink.log(
             user_id=current_user["id"],
             action="USER_ROLE_CHANGE",
             entity_type="USER",
             entity_id=user.id,
-            details=f"Changed role of user {user.username} to {new_role}"
+            details=f"Changed role of user {user.username} to {new_role}",
+            session=self.db
         )
         return {
             "id": user.id,
@@ -205,8 +215,8 @@ class UserService:
         }
         
     def update_user_role(self, user_id: int, company_id: int, new_role: str, current_user: dict) -> dict:
-        current_role = self._get_user_role(current_user["id"], company_id)
-        if current_role != "S" and not self._can_manage_roles(current_user["id"], company_id):
+        permissions = permissions_for(self.db, current_user["id"])
+        if permissions.role_in(company_id) != "S" and not self._can_manage_roles(current_user["id"], company_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only SuperAdmins or authorized users can change roles")
         
         if new_role not in ["A1", "A2", "O"]:
@@ -222,15 +232,17 @@ class UserService:
         old_role = target_user_role.role
         target_user_role.role = new_role
         target_user_role.updated_at = datetime.utcnow()
-        self.db.commit()
+        self.db.flush()
+        invalidate_principal_on_commit(self.db, user_id)
         
-        self._log_action(
+        audit_sink.log(
             user_id=current_user["id"],
             company_id=company_id,
             action="USER_ROLE_UPDATE",
             entity_type="USER",
             entity_id=user_id,
-            details=f"Changed role from {old_role} to {new_role}"
+            details=f"Changed role from {old_role} to {new_role}",
+            session=self.db
         )
         self.workflow_repository.create_workflow(
             company_id=company_id,
@@ -243,24 +255,8 @@ class UserService:
         return {"user_id": user_id, "company_id": company_id, "role": new_role}
     
     def _can_manage_roles(self, user_id: int, company_id: int) -> bool:
-        role = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == user_id,
-            UserCompanyRole.company_id == company_id
-        ).first()
-        return role and (role.can_manage_government_admins or role.can_manage_operators)
-
-    def _log_action(self, user_id: int, company_id: int, action: str, entity_type: str, entity_id: int = None, details: str = ""):
-        log = Log(
-            user_id=user_id,
-            company_id=company_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-            timestamp=datetime.utcnow()
-        )
-        self.db.add(log)
-        self.db.commit()
+        permissions = permissions_for(self.db, user_id)
+        return permissions.can_manage_government_admins(company_id) or permissions.can_manage_operators(company_id)
 
     def get_current_user_profile(self, current_user: dict) -> dict:
         user = self.repository.get_user_by_id(current_user["id"])
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.features.work_flow.data.repository import WorkFlowRepository
+from app.features.work_flow.data.async_repository import AsyncWorkFlowRepository
 from app.features.work_flow.data.schemas import WorkFlowResponse
+from app.features.work_flow.data.read_repository import WorkFlowRecord
 from app.features.work_flow.data.models import WorkflowActionType
-from app.features.work_flow.service.work_flow_service import WorkFlowService
-from app.db import get_db
+from app.features.work_flow.service.work_flow_service import WorkFlowService, AsyncWorkFlowService
+from app.db import get_db, get_async_db, use_async_db, call_service
 from app.core.security import get_current_user
+from app.core.pagination.cursor import set_next_cursor
+from app.core.responses.rows import RowsJSONResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from typing import List, Optional
@@ -18,6 +23,12 @@ def get_workflow_service(db: Session = Depends(get_db)) -> WorkFlowService:
     repository = WorkFlowRepository(db)
     return WorkFlowService(repository)
 
+def get_async_workflow_service(db: AsyncSession = Depends(get_async_db)) -> AsyncWorkFlowService:
+    repository = AsyncWorkFlowRepository(db)
+    return AsyncWorkFlowService(repository)
+
+workflow_service_dependency = get_async_workflow_service if use_async_db("workflows") else get_workflow_service
+
 @router.get("/", response_model=List[WorkFlowResponse])
 @limiter.limit("5/minute")
 async def list_workflows(
@@ -28,7 +39,11 @@ async def list_workflows(
     action_type: Optional[WorkflowActionType] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    workflow_service: WorkFlowService = Depends(get_workflow_service),
+    cursor: Optional[str] = None,
+    workflow_service: WorkFlowService = Depends(workflow_service_dependency),
     current_user: dict = Depends(get_current_user)
 ):
-    return workflow_service.list_workflows(company_id, current_user, page, per_page, action_type, start_date, end_date)
\ No newline at end of file
+    workflows = await call_service(workflow_service.list_workflows, company_id, current_user, page, per_page, action_type, start_date, end_date, cursor)
+    response = RowsJSONResponse(workflows, WorkFlowRecord)
+    set_next_cursor(response, workflows, per_page, "timestamp")
+    return response
\ No newline at end of file
@@ -0,0 +1,78 @@
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from app.features.work_flow.data.models import WorkFlow, WorkflowActionType
+from app.features.assets_management.data.models import Asset
+from app.features.auth.data.models import User
+from app.core.security.permissions import async_permissions_for
+from app.core.models.company import Company
+from app.features.work_flow.data.repository import workflows_page_query
+from typing import List, Optional
+from datetime import datetime
+
+class AsyncWorkFlowRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_workflows(
+        self,
+        company_id: int,
+        page: int,
+        per_page: int,
+        action_type: Optional[WorkflowActionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after: Optional[dict] = None
+    ) -> List[WorkFlow]:
+        query = workflows_page_query(company_id, page, per_page, action_type, start_date, end_date, after)
+        return list(await self.db.scalars(query))
+
+    async def create_workflow(self, company_id: int, user_id: int, asset_id: int, action_type: WorkflowActionType, details: Optional[str] = None, is_offline: bool = False, is_actionable: bool = False, asset_name: Optional[str] = None) -> WorkFlow:
+        if asset_name is None:
+            asset_name = await self.db.scalar(select(Asset.name).where(Asset.id == asset_id))
+        if asset_name is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+
+        username = await self.db.scalar(select(User.username).where(User.id == user_id))
+        if username is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+        if await self.db.scalar(select(Company.id).where(Company.id == company_id)) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+
+        if not (await async_permissions_for(self.db, user_id)).is_member(company_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not associated with this company")
+
+        return await self.record_workflow(
+            company_id=company_id,
+            user_id=user_id,
+            admin_name=username,
+            asset_id=asset_id,
+            asset_name=asset_name,
+            action_type=action_type,
+            details=details,
+            is_offline=is_offline,
+            is_actionable=is_actionable
+        )
+
+    async def record_workflow(self, company_id: int, user_id: int, admin_name: str, asset_id: int, asset_name: str, action_type: WorkflowActionType, details: Optional[str] = None, is_offline: bool = False, is_actionable: bool = False) -> WorkFlow:
+        workflow = WorkFlow(
+            company_id=company_id,
+            user_id=user_id,
+            admin_name=admin_name,
+            asset_id=asset_id,
+            asset_name=asset_name,
+            action_type=action_type,
+            details=details,
+            is_offline=is_offline,
+            is_actionable=is_actionable
+        )
+        self.db.add(workflow)
+        await self.db.flush()
+        return workflow
+
+    async def create_workflows_bulk(self, workflows: List[dict]) -> int:
+        if not workflows:
+            return 0
+        await self.db.execute(insert(WorkFlow), workflows)
+        return len(workflows)
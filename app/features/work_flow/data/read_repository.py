@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import and_, lambda_stmt, select, tuple_
+from app.core.readonly.repository import AsyncReadOnlyRepository, ReadOnlyRepository, record_columns
+from app.features.work_flow.data.models import WorkFlow, WorkflowActionType
+
+
+@dataclass(frozen=True, slots=True)
+class WorkFlowRecord:
+    id: int
+    company_id: int
+    user_id: Optional[int]
+    admin_name: str
+    asset_id: int
+    asset_name: str
+    action_type: WorkflowActionType
+    details: Optional[str]
+    timestamp: datetime
+    is_offline: bool
+    is_actionable: bool
+
+
+WORKFLOW_RECORD_COLUMNS = record_columns(WorkFlowRecord, WorkFlow.__table__)
+
+
+def workflows_page_statement(
+    company_id: int,
+    page: int,
+    per_page: int,
+    action_type: Optional[WorkflowActionType] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    after: Optional[dict] = None
+):
+    statement = lambda_stmt(lambda: (
+        select(*WORKFLOW_RECORD_COLUMNS)
+        .where(WorkFlow.company_id == company_id)
+        .order_by(WorkFlow.timestamp.desc(), WorkFlow.id.desc())
+        .limit(per_page)
+    ))
+    if action_type:
+        statement += lambda s: s.where(WorkFlow.action_type == action_type)
+    if start_date and end_date:
+        statement += lambda s: s.where(and_(WorkFlow.timestamp >= start_date, WorkFlow.timestamp <= end_date))
+    if after:
+        after_timestamp, after_id = after["timestamp"], after["id"]
+        return statement + (lambda s: s.where(tuple_(WorkFlow.timestamp, WorkFlow.id) < tuple_(after_timestamp, after_id)))
+    offset = (page - 1) * per_page
+    return statement + (lambda s: s.offset(offset))
+
+
+class WorkFlowReadRepository(ReadOnlyRepository):
+    """Read-only workflow listing returning ``WorkFlowRecord`` rows."""
+
+    def get_workflows(
+        self,
+        company_id: int,
+        page: int,
+        per_page: int,
+        action_type: Optional[WorkflowActionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after: Optional[dict] = None
+    ) -> List[WorkFlowRecord]:
+        return self.fetch(workflows_page_statement(company_id, page, per_page, action_type, start_date, end_date, after), WorkFlowRecord)
+
+
+class AsyncWorkFlowReadRepository(AsyncReadOnlyRepository):
+    async def get_workflows(
+        self,
+        company_id: int,
+        page: int,
+        per_page: int,
+        action_type: Optional[WorkflowActionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after: Optional[dict] = None
+    ) -> List[WorkFlowRecord]:
+        return await self.fetch(workflows_page_statement(company_id, page, per_page, action_type, start_date, end_date, after), WorkFlowRecord)
@@ -1,13 +1,39 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, select, tuple_
 from fastapi import HTTPException, status
 from app.features.work_flow.data.models import WorkFlow, WorkflowActionType
 from app.features.assets_management.data.models import Asset
-from app.features.auth.data.models import User, UserCompanyRole
+from app.features.auth.data.models import User
+from app.core.security.permissions import permissions_for
 from app.core.models.company import Company
 from typing import List, Optional
 from datetime import datetime
 
+def workflows_page_query(
+    company_id: int,
+    page: int,
+    per_page: int,
+    action_type: Optional[WorkflowActionType] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    after: Optional[dict] = None
+):
+    query = select(WorkFlow).where(WorkFlow.company_id == company_id)
+    
+    if action_type:
+        query = query.where(WorkFlow.action_type == action_type)
+    
+    if start_date and end_date:
+        query = query.where(and_(
+            WorkFlow.timestamp >= start_date,
+            WorkFlow.timestamp <= end_date
+        ))
+    
+    query = query.order_by(WorkFlow.timestamp.desc(), WorkFlow.id.desc()).limit(per_page)
+    if after:
+        return query.where(tuple_(WorkFlow.timestamp, WorkFlow.id) < tuple_(after["timestamp"], after["id"]))
+    return query.offset((page - 1) * per_page)
+
 class WorkFlowRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -19,26 +45,18 @@ class WorkFlowRepository:
         per_page: int,
         action_type: Optional[WorkflowActionType] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        after: Optional[dict] = None
     ) -> List[WorkFlow]:
-        query = self.db.query(WorkFlow).filter(WorkFlow.company_id == company_id)
-        
-        if action_type:
-            query = query.filter(WorkFlow.action_type == action_type)
-        
-        if start_date and end_date:
-            query = query.filter(and_(
-                WorkFlow.timestamp >= start_date,
-                WorkFlow.timestamp <= end_date
-            ))
-        
-        offset = (page - 1) * per_page
-        return query.order_by(WorkFlow.timestamp.desc()).offset(offset).limit(per_page).all()
+        query = workflows_page_query(company_id, page, per_page, action_type, start_date, end_date, after)
+        return list(self.db.scalars(query))
 
-    def create_workflow(self, company_id: int, user_id: int, asset_id: int, action_type: WorkflowActionType, details: Optional[str] = None, is_offline: bool = False, is_actionable: bool = False) -> WorkFlow:
-        asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
-        if not asset:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+    def create_workflow(self, company_id: int, user_id: int, asset_id: int, action_type: WorkflowActionType, details: Optional[str] = None, is_offline: bool = False, is_actionable: bool = False, asset_name: Optional[str] = None) -> WorkFlow:
+        if asset_name is None:
+            asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
+            if not asset:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+            asset_name = asset.name
         
         user = self.db.query(User).filter(User.id == user_id).first()
         if not user:
@@ -48,25 +66,41 @@ class WorkFlowRepository:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
         
         # بررسی دسترسی کاربر به شرکت
-        user_role = self.db.query(UserCompanyRole).filter(
-            UserCompanyRole.user_id == user_id,
-            UserCompanyRole.company_id == company_id
-        ).first()
-        if not user_role:
+        if not permissions_for(self.db, user_id).is_member(company_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not associated with this company")
         
-        workflow = WorkFlow(
+        return self.record_workflow(
             company_id=company_id,
             user_id=user_id,
             admin_name=user.username,
             asset_id=asset_id,
-            asset_name=asset.name,
+            asset_name=asset_name,
+            action_type=action_type,
+            details=details,
+            is_offline=is_offline,
+            is_actionable=is_actionable
+        )
+
+    def record_workflow(self, company_id: int, user_id: int, admin_name: str, asset_id: int, asset_name: str, action_type: WorkflowActionType, details: Optional[str] = None, is_offline: bool = False, is_actionable: bool = False) -> WorkFlow:
+        # Fast path: the caller has already resolved the asset, the acting user and
+        # their membership, so the row is inserted without re-validating them.
+        workflow = WorkFlow(
+            company_id=company_id,
+            user_id=user_id,
+            admin_name=admin_name,
+            asset_id=asset_id,
+            asset_name=asset_name,
             action_type=action_type,
             details=details,
             is_offline=is_offline,
             is_actionable=is_actionable
         )
         self.db.add(workflow)
-        self.db.commit()
-        self.db.refresh(workflow)
-        return workflow
\ No newline at end of file
+        self.db.flush()
+        return workflow
+
+    def create_workflows_bulk(self, workflows: List[dict]) -> int:
+        if not workflows:
+            return 0
+        self.db.execute(insert(WorkFlow), workflows)
+        return len(workflows)
\ No newline at end of file
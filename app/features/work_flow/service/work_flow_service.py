@@ -1,8 +1,10 @@
 from fastapi import HTTPException, status
+from app.core.logger.audit_sink import audit_sink
+from app.core.pagination.cursor import decode_cursor
 from app.features.work_flow.data.repository import WorkFlowRepository
-from app.features.work_flow.data.schemas import WorkFlowResponse
+from app.features.work_flow.data.async_repository import AsyncWorkFlowRepository
+from app.features.work_flow.data.read_repository import AsyncWorkFlowReadRepository, WorkFlowReadRepository, WorkFlowRecord
 from app.features.work_flow.data.models import WorkflowActionType
-from app.features.logs.data.models import Log
 from datetime import datetime
 from typing import List, Optional
 
@@ -10,6 +12,7 @@ class WorkFlowService:
     def __init__(self, repository: WorkFlowRepository):
         self.repository = repository
         self.db = repository.db
+        self.reader = WorkFlowReadRepository(self.db)
 
     def list_workflows(
         self,
@@ -19,32 +22,56 @@ class WorkFlowService:
         per_page: int,
         action_type: Optional[WorkflowActionType] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> List[WorkFlowResponse]:
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None
+    ) -> List[WorkFlowRecord]:
         if current_user["role"] not in ["S", "A1", "A2"]:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can access workflows")
         
         if current_user["role"] != "S" and current_user.get("company_id") != company_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only access workflows of your own company")
         
-        workflows = self.repository.get_workflows(company_id, page, per_page, action_type, start_date, end_date)
-        self._log_action(
+        after = decode_cursor(cursor, "timestamp") if cursor else None
+        workflows = self.reader.get_workflows(company_id, page, per_page, action_type, start_date, end_date, after)
+        audit_sink.log(
             user_id=current_user["id"],
             action="WORKFLOW_ACCESS",
             entity_type="WORKFLOW",
             entity_id=company_id,
             details=f"Accessed workflows for company {company_id}"
         )
-        return [WorkFlowResponse.from_orm(workflow) for workflow in workflows]
+        return workflows
 
-    def _log_action(self, user_id: int, action: str, entity_type: str, entity_id: int = None, details: str = ""):
-        log = Log(
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-            timestamp=datetime.utcnow()
+class AsyncWorkFlowService:
+    def __init__(self, repository: AsyncWorkFlowRepository):
+        self.repository = repository
+        self.db = repository.db
+        self.reader = AsyncWorkFlowReadRepository(self.db)
+
+    async def list_workflows(
+        self,
+        company_id: int,
+        current_user: dict,
+        page: int,
+        per_page: int,
+        action_type: Optional[WorkflowActionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None
+    ) -> List[WorkFlowRecord]:
+        if current_user["role"] not in ["S", "A1", "A2"]:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can access workflows")
+
+        if current_user["role"] != "S" and current_user.get("company_id") != company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can only access workflows of your own company")
+
+        after = decode_cursor(cursor, "timestamp") if cursor else None
+        workflows = await self.reader.get_workflows(company_id, page, per_page, action_type, start_date, end_date, after)
+        audit_sink.log(
+            user_id=current_user["id"],
+            action="WORKFLOW_ACCESS",
+            entity_type="WORKFLOW",
+            entity_id=company_id,
+            details=f"Accessed workflows for company {company_id}"
         )
-        self.db.add(log)
-        self.db.commit()
\ No newline at end of file
+        return workflows
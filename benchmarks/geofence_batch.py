@@ -0,0 +1,42 @@
+"""Fleet-wide geofence sweep: one scalar haversine per fix vs one vectorized pass.
+
+scalar: CheckGeofenceUseCase's per-asset computation, looped over every fix
+engine:  GeofenceEngine.evaluate over the whole batch
+
+Run from the repository root:  python benchmarks/geofence_batch.py [assets] [repeats]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from app.features.assets_gps_management.domain.geofence import GeofenceEngine, haversine
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = np.random.default_rng(0)
+    anchors = [(i, lat, lon, radius) for i, lat, lon, radius in zip(
+        range(count), rng.uniform(25, 40, count), rng.uniform(44, 63, count), rng.uniform(100, 5000, count)
+    )]
+    ids = rng.permutation(count)
+    latitudes = [anchors[i][1] + offset for i, offset in zip(ids, rng.normal(0, 0.02, count))]
+    longitudes = [anchors[i][2] + offset for i, offset in zip(ids, rng.normal(0, 0.02, count))]
+    engine = GeofenceEngine(anchors)
+
+    def scalar():
+        return [
+            haversine(anchors[i][1], anchors[i][2], lat, lon) <= anchors[i][3]
+            for i, lat, lon in zip(ids, latitudes, longitudes)
+        ]
+
+    def vectorized():
+        return engine.evaluate(ids, latitudes, longitudes)[3]
+
+    assert scalar() == vectorized().tolist()
+    for label, run in (("scalar", scalar), ("engine", vectorized)):
+        best = min(timeit.repeat(run, number=1, repeat=repeats))
+        print(f"{label:<8} {best * 1e3:8.2f} ms/sweep  {best / count * 1e9:8.1f} ns/fix")
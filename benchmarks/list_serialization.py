@@ -0,0 +1,81 @@
+"""Per-row cost of serializing a 1,000-row list page.
+
+before: ORM rows -> Model.from_orm per row -> response_model re-validation
+        -> jsonable dump -> json.dumps (what the list routes used to do)
+after:  Core rows / read records -> RowsJSONResponse (one TypeAdapter.dump_json call)
+
+Run from the repository root:  python benchmarks/list_serialization.py [rows] [repeats]
+"""
+import json
+from dataclasses import is_dataclass
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+from app.core.responses.rows import RowsJSONResponse
+from app.features.assets_management.data.models import Asset, AssetStatus
+from app.features.assets_management.data.schemas import AssetResponse, AssetRow
+from app.features.work_flow.data.models import WorkFlow, WorkflowActionType
+from app.features.work_flow.data.read_repository import WorkFlowRecord
+from app.features.work_flow.data.schemas import WorkFlowResponse
+
+
+def workflow_rows(count: int) -> List[dict]:
+    start = datetime(2026, 1, 1)
+    return [
+        {
+            "id": i, "company_id": 1, "user_id": 7, "admin_name": "admin", "asset_id": i, "asset_name": f"Asset {i}",
+            "action_type": WorkflowActionType.OFFLINE_SCAN, "details": f"Scanned RFID tag T{i}",
+            "timestamp": start + timedelta(seconds=i), "is_offline": True, "is_actionable": True
+        }
+        for i in range(count)
+    ]
+
+
+def asset_rows(count: int) -> List[dict]:
+    now = datetime(2026, 1, 1)
+    return [
+        {
+            "id": i, "company_id": 1, "asset_id": f"P-{i}", "category_id": 1, "name": f"Asset {i}", "rfid_tag": f"T{i}",
+            "model": "XPS 15", "serial_number": f"SN{i}", "technical_specs": None, "location": "Room 4", "custodian": None,
+            "value": 1000 + i, "registration_date": now, "warranty_end_date": None, "description": None,
+            "status": AssetStatus.ACTIVE, "created_at": now, "updated_at": now
+        }
+        for i in range(count)
+    ]
+
+
+def before(orm_rows, model):
+    adapter = TypeAdapter(List[model])
+
+    def run():
+        content = [model.from_orm(row) for row in orm_rows]
+        validated = adapter.validate_python(content, from_attributes=True)
+        return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode()
+    return run
+
+
+def after(rows, row_type):
+    if is_dataclass(row_type):
+        rows = [row_type(**row) for row in rows]
+    return lambda: RowsJSONResponse(rows, row_type).body
+
+
+def report(name: str, orm_type, model, row_type, rows: List[dict], repeats: int) -> None:
+    orm_rows = [orm_type(**row) for row in rows]
+    assert json.loads(before(orm_rows, model)()) == json.loads(after(rows, row_type)())
+    for label, run in (("before", before(orm_rows, model)), ("after", after(rows, row_type))):
+        best = min(timeit.repeat(run, number=1, repeat=repeats))
+        print(f"{name:<10} {label:<7} {best * 1e3:8.2f} ms/page  {best / len(rows) * 1e6:6.2f} us/row")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    report("workflows", WorkFlow, WorkFlowResponse, WorkFlowRecord, workflow_rows(count), repeats)
+    report("assets", Asset, AssetResponse, AssetRow, asset_rows(count), repeats)
@@ -0,0 +1,78 @@
+"""Per-row CPU and peak memory of the ORM vs the read-only Core path.
+
+orm:  session.query(WorkFlow) / select(Log) entities -> identity-mapped instances
+core: WorkFlowReadRepository / LogReadRepository -> cached lambda statements -> __slots__ records
+
+Runs against an in-memory SQLite database from the repository root:
+    python benchmarks/read_path.py [rows] [repeats]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+# Importing the repositories loads app.db, which connects on import.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+import app.db  # noqa: F401  (registers every table)
+from app.core.models.base import Base
+from app.features.logs.data.models import Log
+from app.features.logs.data.read_repository import LogReadRepository
+from app.features.work_flow.data.models import WorkFlow, WorkflowActionType
+from app.features.work_flow.data.read_repository import WorkFlowReadRepository
+from app.features.work_flow.data.repository import WorkFlowRepository
+
+
+def seed(session, count: int) -> None:
+    start = datetime(2026, 1, 1)
+    session.execute(insert(WorkFlow), [
+        {
+            "company_id": 1, "user_id": 1, "admin_name": "admin", "asset_id": i, "asset_name": f"Asset {i}",
+            "action_type": WorkflowActionType.OFFLINE_SCAN, "details": f"Scanned RFID tag T{i}",
+            "timestamp": start + timedelta(seconds=i), "is_offline": True, "is_actionable": True
+        }
+        for i in range(count)
+    ])
+    session.execute(insert(Log), [
+        {"user_id": 1, "company_id": 1, "action": "ASSET_SCAN", "entity_type": "ASSET", "entity_id": i,
+         "details": f"Scanned RFID tag T{i}", "timestamp": start + timedelta(seconds=i)}
+        for i in range(count)
+    ])
+    session.commit()
+
+
+def measure(label: str, make_session, run, count: int, repeats: int) -> None:
+    def once():
+        session = make_session()
+        try:
+            rows = run(session)
+            assert len(rows) == count
+        finally:
+            session.close()
+
+    best = min(timeit.repeat(once, number=1, repeat=repeats))
+    tracemalloc.start()
+    once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<16} {best * 1e3:8.2f} ms/page  {best / count * 1e6:6.2f} us/row  peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    make_session = sessionmaker(bind=engine)
+    seed(make_session(), count)
+
+    measure("workflows orm", make_session, lambda db: WorkFlowRepository(db).get_workflows(1, 1, count), count, repeats)
+    measure("workflows core", make_session, lambda db: WorkFlowReadRepository(db).get_workflows(1, 1, count), count, repeats)
+    orm_logs = lambda db: list(db.scalars(select(Log).where(Log.company_id == 1).order_by(Log.timestamp.desc(), Log.id.desc()).limit(count)))
+    measure("logs orm", make_session, orm_logs, count, repeats)
+    measure("logs core", make_session, lambda db: LogReadRepository(db).get_logs(1, 1, count), count, repeats)
@@ -0,0 +1,43 @@
+""""What's around me" over a 50k-asset company: full haversine scan vs the geohash grid.
+
+scan: vectorized haversine over every located asset, then filter and sort
+grid: CompanyGrid.within_radius / nearest (cell cover -> bisect ranges -> exact filter)
+
+Run from the repository root:  python benchmarks/spatial_query.py [assets] [repeats]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from app.features.assets_gps_management.data.spatial_index import CompanyGrid
+from app.features.assets_gps_management.domain.geofence import haversine_many
+from app.features.assets_gps_management.domain.geohash import GEOHASH_PRECISION, encode
+
+CENTER = (35.6892, 51.3890)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = np.random.default_rng(0)
+    latitudes, longitudes = rng.uniform(34, 37, count), rng.uniform(50, 53, count)
+    grid = CompanyGrid(
+        (i, lat, lon, encode(lat, lon, GEOHASH_PRECISION))
+        for i, lat, lon in zip(range(count), latitudes.tolist(), longitudes.tolist())
+    )
+
+    def scan(radius_m):
+        distances = haversine_many(np.full(count, CENTER[0]), np.full(count, CENTER[1]), latitudes, longitudes)
+        inside = (distances <= radius_m).nonzero()[0]
+        return inside[np.argsort(distances[inside], kind="stable")].tolist()
+
+    for radius_m in (500, 2000, 10000):
+        assert scan(radius_m) == [row["asset_id"] for row in grid.within_radius(*CENTER, radius_m)]
+        for label, run in (("scan", lambda: scan(radius_m)), ("grid", lambda: grid.within_radius(*CENTER, radius_m))):
+            best = min(timeit.repeat(run, number=1, repeat=repeats))
+            print(f"radius {radius_m:>6} m  {label:<5} {best * 1e3:8.3f} ms")
+    best = min(timeit.repeat(lambda: grid.nearest(*CENTER, 10), number=1, repeat=repeats))
+    print(f"nearest 10      grid  {best * 1e3:8.3f} ms")
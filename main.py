@@ -4,7 +4,14 @@ from app.routes.routes import register_routes
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.middleware import SlowAPIMiddleware
-from app.db import get_db
+from app.db import get_db, SessionLocal, dispose_async_engine
+from app.core.security import login_tracker, password_hasher, LOGIN_ATTEMPT_FLUSH_SECONDS
+from app.core.security.permissions import PermissionContextMiddleware
+from app.core.logger.audit_sink import audit_sink
+from app.features.assets_management.data.asset_stats import asset_stats_reconciler, ASSET_STATS_RECONCILE_SECONDS
+from app.features.assets_gps_management.data.location_history import location_history_partitioner, LOCATION_HISTORY_PARTITION_SECONDS
+from app.features.assets_gps_management.data.track_repository import track_compactor, TRACK_COMPACTION_SECONDS
+from app.core.pagination.cursor import NEXT_CURSOR_HEADER
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 from app.features.subscription.api.routes import router as subscription_router
@@ -21,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 app.mount("/static", StaticFiles(directory="app/templates/subscription/static"), name="static")
 templates = Jinja2Templates(directory="app/templates/subscription")
@@ -28,13 +36,37 @@ templates = Jinja2Templates(directory="app/templates/subscription")
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(PermissionContextMiddleware)
 
 register_routes(app)
 
+@app.on_event("startup")
+async def start_background_flushers():
+    login_tracker.start(SessionLocal, LOGIN_ATTEMPT_FLUSH_SECONDS)
+    audit_sink.start()
+    asset_stats_reconciler.start(SessionLocal, ASSET_STATS_RECONCILE_SECONDS)
+    location_history_partitioner.start(SessionLocal, LOCATION_HISTORY_PARTITION_SECONDS)
+    track_compactor.start(SessionLocal, TRACK_COMPACTION_SECONDS)
+
+@app.on_event("shutdown")
+async def stop_background_flushers():
+    login_tracker.stop(SessionLocal)
+    audit_sink.stop()
+    asset_stats_reconciler.stop()
+    location_history_partitioner.stop()
+    track_compactor.stop()
+    password_hasher.shutdown()
+    await dispose_async_engine()
+
 @app.get("/")
 async def root():
     return {"message": "Asset Management Backend, Beta Version"}
 
 @app.get("/health")
 async def health_check(db: Session = Depends(get_db)):
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "password_hashing": password_hasher.stats(),
+        "audit_log": audit_sink.stats(),
+        "login_attempts": login_tracker.stats()
+    }
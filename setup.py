@@ -14,6 +14,9 @@ setup(
         "python-dotenv==1.0.1",
         "slowapi==0.1.9",
         "emails==0.6",
-        "pyjwt==2.10.1"
+        "pyjwt==2.10.1",
+        "asyncpg==0.30.0",
+        "aiosqlite==0.20.0",
+        "numpy==2.1.3"
     ],
 )
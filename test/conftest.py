@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+import app.db
+from app.core.models.base import Base
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def statements(engine):
+    # Every SQL statement sent to the test engine; fixtures that seed data clear it.
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+@pytest.fixture
+def db(engine, statements):
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.models.company import Company
+from app.features.assets_management.data.asset_stats import AssetStatsRepository, asset_stats_deltas, asset_stats_snapshot
+from app.features.assets_management.data.models import Asset, AssetCategory, AssetStatus
+from app.features.assets_management.data.repository import AssetRepository
+from app.features.assets_management.data.schemas import AssetCreate
+from app.features.assets_loan_management.data.repository import LoanRepository
+from app.features.assets_loan_management.data.schemas import AssetLoanCreate
+
+@pytest.fixture
+def db(db):
+    db.add_all([Company(name="Acme"), AssetCategory(name="Laptops", code=100), AssetCategory(name="Phones", code=200)])
+    db.commit()
+    return db
+
+def create_asset(db, asset_id, category_id=1, value=100, asset_status=AssetStatus.ACTIVE):
+    return AssetRepository(db).create_asset(AssetCreate(
+        company_id=1, asset_id=asset_id, category_id=category_id, name=asset_id, rfid_tag=asset_id, value=value, status=asset_status
+    ), user_id=None)
+
+class TestAssetStatsDeltas:
+    def test_value_change_in_same_bucket_is_one_delta(self):
+        before = (1, AssetStatus.ACTIVE, 1, 100)
+        after = (1, AssetStatus.ACTIVE, 1, 250)
+        assert asset_stats_deltas(before, after) == {(1, AssetStatus.ACTIVE, 1): (0, 150)}
+
+    def test_unchanged_asset_has_no_deltas(self):
+        snapshot = (1, AssetStatus.ACTIVE, 1, 100)
+        assert asset_stats_deltas(snapshot, snapshot) == {}
+
+class TestAssetStatsRepository:
+    def test_counters_follow_asset_and_loan_writes(self, db):
+        laptop = create_asset(db, "L-1", value=1000)
+        create_asset(db, "L-2", value=500)
+        phone = create_asset(db, "P-1", category_id=2, value=None, asset_status=AssetStatus.MAINTENANCE)
+        db.commit()
+
+        loan = LoanRepository(db).create_loan(AssetLoanCreate(asset_id=laptop.id, company_id=1, external_recipient="Contractor"), user_id=None)
+        before = asset_stats_snapshot(phone)
+        phone.status, phone.category_id, phone.value = AssetStatus.ACTIVE, 1, 300
+        AssetStatsRepository(db).apply(before, asset_stats_snapshot(phone))
+        db.commit()
+
+        stats = AssetStatsRepository(db).get_company_stats(1)
+        assert stats["total_assets"] == 3
+        assert stats["total_value"] == 1800
+        assert stats["status_breakdown"]["on_loan"] == 1
+        assert stats["status_breakdown"]["active"] == 2
+        assert stats["status_breakdown"]["maintenance"] == 0
+        assert stats["category_breakdown"] == {1: 3}
+
+        LoanRepository(db).return_loan(loan.id, user_id=None)
+        db.commit()
+        assert AssetStatsRepository(db).get_company_stats(1)["status_breakdown"]["active"] == 3
+
+    def test_reconcile_matches_incremental_counters(self, db):
+        create_asset(db, "L-1", value=1000)
+        create_asset(db, "P-1", category_id=2, value=200, asset_status=AssetStatus.DISPOSED)
+        db.commit()
+        incremental = AssetStatsRepository(db).get_company_stats(1)
+
+        db.query(Asset).filter(Asset.asset_id == "L-1").update({"value": 10})
+        drifted = AssetStatsRepository(db).get_company_stats(1)
+        assert drifted == incremental
+
+        AssetStatsRepository(db).reconcile()
+        db.commit()
+        rebuilt = AssetStatsRepository(db).get_company_stats(1)
+        assert rebuilt["total_value"] == 210
+        assert rebuilt["status_breakdown"] == incremental["status_breakdown"]
+        assert rebuilt["category_breakdown"] == incremental["category_breakdown"]
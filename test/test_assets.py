@@ -0,0 +1,153 @@
+import sys
+from pathlib import Path
+from datetime import datetime
+import pytest
+from unittest.mock import MagicMock
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.features.assets_management.data.models import Asset, AssetStatus
+from app.features.assets_management.data.schemas import RfidScanBatch
+from app.features.assets_management.data.rfid_cache import RfidTagCache, rfid_cache
+from app.features.assets_management.data.read_repository import ASSET_FIELD_COLUMNS, assets_page_query
+from app.features.assets_management.service.asset_service import AssetService
+from app.features.work_flow.data.models import WorkflowActionType
+
+def make_asset(id, rfid_tag, company_id=1):
+    now = datetime.utcnow()
+    return Asset(
+        id=id, company_id=company_id, asset_id=f"P-{id}", category_id=1, name=f"Asset {id}",
+        rfid_tag=rfid_tag, status=AssetStatus.ACTIVE, created_at=now, updated_at=now
+    )
+
+@pytest.fixture(autouse=True)
+def clear_rfid_cache():
+    rfid_cache.clear()
+    yield
+    rfid_cache.clear()
+
+@pytest.fixture
+def asset_service():
+    repository = MagicMock()
+    service = AssetService(repository)
+    service.reader = repository
+    service.workflow_repository = MagicMock()
+    return service
+
+@pytest.fixture
+def operator():
+    return {"id": 7, "username": "op", "role": "O", "company_id": 1}
+
+class TestScanRfidBatch:
+    def test_resolves_tags_in_one_lookup(self, asset_service, operator):
+        asset_service.repository.get_assets_by_rfid_tags.return_value = [make_asset(1, "TAG1"), make_asset(2, "TAG2")]
+        batch = RfidScanBatch(device_id="R-7", scans=[
+            {"rfid_tag": "TAG1", "scanned_at": "2026-01-01T10:00:00"},
+            {"rfid_tag": "TAG1", "scanned_at": "2026-01-01T10:00:05"},
+            {"rfid_tag": "TAG2"},
+            {"rfid_tag": "NOPE"}
+        ])
+
+        result = asset_service.scan_rfid_batch(batch, operator)
+
+        asset_service.repository.get_assets_by_rfid_tags.assert_called_once_with(["TAG1", "TAG2", "NOPE"])
+        assert [asset.id for asset in result.found] == [1, 2]
+        assert result.found[0].model_fields_set == {"id", "name", "asset_id", "location"}
+        assert result.unknown == ["NOPE"]
+
+        rows = asset_service.workflow_repository.create_workflows_bulk.call_args[0][0]
+        assert len(rows) == 2
+        assert rows[0]["timestamp"] == datetime(2026, 1, 1, 10, 0, 5)
+        assert rows[0]["action_type"] == WorkflowActionType.OFFLINE_SCAN
+        assert rows[0]["admin_name"] == "op"
+        assert "device R-7" in rows[0]["details"]
+
+    def test_mixed_timezones_are_normalized_to_naive_utc(self, asset_service, operator):
+        asset_service.repository.get_assets_by_rfid_tags.return_value = [make_asset(1, "TAG1")]
+        batch = RfidScanBatch(scans=[
+            {"rfid_tag": "TAG1", "scanned_at": "2026-01-01T00:00:00"},
+            {"rfid_tag": "TAG1", "scanned_at": "2026-01-01T00:00:01Z"},
+            {"rfid_tag": "TAG1", "scanned_at": "2026-01-01T03:30:00+03:30"}
+        ])
+
+        asset_service.scan_rfid_batch(batch, operator)
+
+        rows = asset_service.workflow_repository.create_workflows_bulk.call_args[0][0]
+        assert rows[0]["timestamp"] == datetime(2026, 1, 1, 0, 0, 1)
+        assert rows[0]["timestamp"].tzinfo is None
+
+    def test_other_company_tags_are_reported_unknown(self, asset_service, operator):
+        asset_service.repository.get_assets_by_rfid_tags.return_value = [make_asset(1, "TAG1", company_id=2)]
+
+        result = asset_service.scan_rfid_batch(RfidScanBatch(scans=[{"rfid_tag": "TAG1"}]), operator)
+
+        assert result.found == []
+        assert result.unknown == ["TAG1"]
+        asset_service.workflow_repository.create_workflows_bulk.assert_called_once_with([])
+
+class TestRfidTagCache:
+    def test_get_many_splits_hits_and_misses(self):
+        cache = RfidTagCache(max_size=10, ttl=60)
+        cache.put(make_asset(1, "TAG1"))
+
+        hits, misses = cache.get_many(["TAG1", "TAG2"])
+
+        assert list(hits) == ["TAG1"]
+        assert hits["TAG1"].id == 1
+        assert misses == ["TAG2"]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_invalidate(self):
+        cache = RfidTagCache(max_size=10, ttl=60)
+        cache.prewarm([make_asset(1, "TAG1"), make_asset(2, "TAG2")])
+        cache.invalidate("TAG1", None)
+
+        assert cache.get("TAG1") is None
+        assert cache.get("TAG2") is not None
+        assert cache.stats()["prewarmed"] == 2
+
+    def test_repeated_scans_are_served_from_memory(self, asset_service, operator):
+        asset_service.repository.get_asset_by_rfid.return_value = make_asset(1, "TAG1")
+
+        first = asset_service.get_asset_by_rfid("TAG1", operator)
+        second = asset_service.get_asset_by_rfid("TAG1", operator)
+
+        assert first.id == second.id == 1
+        asset_service.repository.get_asset_by_rfid.assert_called_once_with("TAG1")
+
+    def test_batch_only_queries_misses(self, asset_service, operator):
+        rfid_cache.put(make_asset(1, "TAG1"))
+        asset_service.repository.get_assets_by_rfid_tags.return_value = [make_asset(2, "TAG2")]
+
+        result = asset_service.scan_rfid_batch(RfidScanBatch(scans=[{"rfid_tag": "TAG1"}, {"rfid_tag": "TAG2"}]), operator)
+
+        asset_service.repository.get_assets_by_rfid_tags.assert_called_once_with(["TAG2"])
+        assert [asset.id for asset in result.found] == [1, 2]
+
+class TestRoleProjection:
+    def test_operators_list_only_their_columns(self, asset_service, operator):
+        asset_service.repository.get_asset_rows_by_company.return_value = []
+
+        asset_service.list_assets(1, operator, 1, 20)
+
+        columns = asset_service.repository.get_asset_rows_by_company.call_args[0][3]
+        query = str(assets_page_query(columns, 1, 1, 20))
+        assert [column.name for column in columns] == ["id", "asset_id", "name", "location"]
+        assert "rfid_tag" not in query and "value" not in query
+
+    def test_detail_is_projected_for_operators(self, asset_service, operator):
+        asset_service.repository.get_asset_by_rfid.return_value = make_asset(1, "TAG1")
+
+        asset = asset_service.get_asset_by_rfid("TAG1", operator)
+
+        assert asset.model_dump(exclude_unset=True) == {"id": 1, "asset_id": "P-1", "name": "Asset 1", "location": None}
+
+    def test_super_admins_see_every_column(self, asset_service):
+        asset_service.repository.get_asset_rows_by_company.return_value = []
+
+        asset_service.list_assets(1, {"id": 1, "username": "root", "role": "S", "company_id": None}, 1, 20)
+
+        columns = asset_service.repository.get_asset_rows_by_company.call_args[0][3]
+        assert {column.name for column in columns} == set(ASSET_FIELD_COLUMNS)
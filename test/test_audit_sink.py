@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.logger.audit_sink import AuditLogSink
+from app.db.unit_of_work import UnitOfWork, UnitOfWorkSession
+from app.features.logs.data.models import Log
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+class TestAuditLogSink:
+    def test_flush_writes_in_batches(self, session_factory):
+        sink = AuditLogSink(session_factory, max_queue=100, batch_size=2, flush_interval=60, autostart=False)
+        for i in range(5):
+            assert sink.log(action="ASSET_SCAN", user_id=1, company_id=1, entity_type="ASSET", entity_id=i)
+
+        assert sink.flush() == 5
+        db = session_factory()
+        assert db.query(Log).count() == 5
+        assert sink.stats()["pending"] == 0
+        assert sink.stats()["written"] == 5
+
+    def test_drops_when_queue_is_full(self, session_factory):
+        sink = AuditLogSink(session_factory, max_queue=2, batch_size=10, flush_interval=60, autostart=False)
+        assert sink.log(action="A")
+        assert sink.log(action="B")
+        assert not sink.log(action="C")
+
+        stats = sink.stats()
+        assert stats["queued"] == 2
+        assert stats["dropped"] == 1
+
+    def test_stop_flushes_pending_entries(self, session_factory):
+        sink = AuditLogSink(session_factory, max_queue=100, batch_size=50, flush_interval=60)
+        sink.log(action="USER_CREATE", user_id=1, entity_type="USER")
+        sink.stop()
+
+        db = session_factory()
+        assert db.query(Log).filter(Log.action == "USER_CREATE").count() == 1
+
+    def test_session_entries_wait_for_commit(self, engine, session_factory):
+        sink = AuditLogSink(session_factory, max_queue=100, batch_size=50, flush_interval=60, autostart=False)
+        uow = UnitOfWork(sessionmaker(class_=UnitOfWorkSession, bind=engine)())
+        sink.log(action="ASSET_CREATE", user_id=1, entity_type="ASSET", session=uow.session)
+        uow.session.commit()
+        assert sink.stats()["pending"] == 0
+        uow.commit()
+        assert sink.flush() == 1
+
+    def test_rolled_back_unit_of_work_writes_no_log(self, engine, session_factory):
+        sink = AuditLogSink(session_factory, max_queue=100, batch_size=50, flush_interval=60, autostart=False)
+        uow = UnitOfWork(sessionmaker(class_=UnitOfWorkSession, bind=engine)())
+        with pytest.raises(RuntimeError):
+            try:
+                sink.log(action="ASSET_CREATE", user_id=1, entity_type="ASSET", entity_id=1, session=uow.session)
+                uow.session.commit()
+                raise RuntimeError("403 after logging")
+            except Exception:
+                uow.rollback()
+                raise
+        uow.commit()
+        assert sink.flush() == 0
+        assert session_factory().query(Log).count() == 0
+
+    def test_failed_batch_is_counted(self):
+        sink = AuditLogSink(lambda: BrokenSession(), max_queue=10, batch_size=10, flush_interval=60, autostart=False)
+        sink.log(action="A")
+        assert sink.flush() == 0
+        assert sink.stats()["failed"] == 1
+
+class BrokenSession:
+    def bulk_insert_mappings(self, *args):
+        raise RuntimeError("db down")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
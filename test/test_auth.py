@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+import asyncio
 import pytest
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
@@ -88,7 +89,7 @@ class TestAuthService:
             hashed_password=get_password_hash(test_user_data["password"])
         )
         
-        result = auth_service.signup(UserCreate(**test_user_data))
+        result = asyncio.run(auth_service.signup(UserCreate(**test_user_data)))
         
         assert "user_id" in result
         assert result["user_id"] == 1
@@ -99,10 +100,10 @@ class TestAuthService:
             hashed_password=get_password_hash(test_user_data["password"])
         )
         
-        result = auth_service.login(
+        result = asyncio.run(auth_service.login(
             username=test_user_data["username"],
             password=test_user_data["password"]
-        )
+        ))
         
         assert "access_token" in result
         assert result["token_type"] == "bearer"
@@ -0,0 +1,349 @@
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.models.company import Company
+from app.features.assets_management.data.models import Asset, AssetCategory
+from app.features.assets_gps_management.data.location_history import LocationHistoryRepository, latest_fixes, partition_statements
+from app.features.assets_gps_management.data.models import AssetLocation, AssetLocationHistory, AssetTrackSegment
+from app.features.assets_gps_management.data.repository import GpsRepository
+from app.features.assets_gps_management.data.schemas import AssetLocationCreate, GeofenceCheck, GeofenceFix, GpsPingBatch
+from app.features.assets_gps_management.data.spatial_index import CompanyGrid, spatial_index
+from app.features.assets_gps_management.data.track_repository import TrackCompactor, TrackRepository
+from app.features.assets_gps_management.domain.breach_detector import ENTER, EXIT, GeofenceBreachDetector, breach_detector
+from app.features.assets_gps_management.domain.geofence import GeofenceEngine, haversine, haversine_many
+from app.features.assets_gps_management.domain.geohash import GEOHASH_PRECISION, covering_cells, encode
+from app.features.assets_gps_management.domain.trajectory import decode_track, encode_track, simplify
+from app.features.assets_gps_management.domain.use_cases import BatchCheckGeofenceUseCase
+from app.features.assets_gps_management.service.gps_service import GpsService
+from app.features.work_flow.data.models import WorkFlow
+
+TEHRAN = (35.6892, 51.3890)
+
+@pytest.fixture
+def db(db):
+    session = db
+    session.add_all([Company(name="Acme"), Company(name="Other"), AssetCategory(name="Vehicles", code=100)])
+    session.flush()
+    for id, company_id in ((1, 1), (2, 1), (3, 1), (4, 2)):
+        session.add(Asset(id=id, company_id=company_id, asset_id=f"V-{id}", category_id=1, name=f"Vehicle {id}", rfid_tag=f"T{id}"))
+    session.flush()
+    session.add_all([
+        AssetLocation(asset_id=1, latitude=TEHRAN[0], longitude=TEHRAN[1], geofence_radius=500),
+        AssetLocation(asset_id=2, latitude=TEHRAN[0], longitude=TEHRAN[1], geofence_radius=None),
+        AssetLocation(asset_id=4, latitude=TEHRAN[0], longitude=TEHRAN[1], geofence_radius=500),
+    ])
+    session.commit()
+    return session
+
+class TestGeofenceEngine:
+    def test_vectorized_distances_match_scalar_haversine(self):
+        rng = np.random.default_rng(7)
+        lat1, lat2 = rng.uniform(-80, 80, 100), rng.uniform(-80, 80, 100)
+        lon1, lon2 = rng.uniform(-180, 180, 100), rng.uniform(-180, 180, 100)
+        expected = [haversine(*point) for point in zip(lat1, lon1, lat2, lon2)]
+        assert np.allclose(haversine_many(lat1, lon1, lat2, lon2), expected, rtol=1e-9, atol=1e-6)
+
+    def test_fixes_are_matched_to_their_anchor(self):
+        engine = GeofenceEngine([(30, 0.0, 0.0, 1000.0), (10, 0.0, 0.0, 0.0), (20, 0.0, 0.0, None)])
+        known, distances, radii, within = engine.evaluate([20, 30, 30, 10, 99], [0.0, 0.005, 0.05, 1.0, 0.0], [0.0] * 5)
+        assert known.tolist() == [True, True, True, True, False]
+        assert within[:4].tolist() == [True, True, False, True]
+        assert distances[2] == pytest.approx(haversine(0.0, 0.0, 0.05, 0.0))
+        assert radii[2] == 1000.0
+
+    def test_empty_engine_knows_no_assets(self):
+        known, _, _, _ = GeofenceEngine([]).evaluate([1, 2], [0.0, 0.0], [0.0, 0.0])
+        assert not known.any()
+
+class TestBatchCheckGeofence:
+    def test_anchors_are_loaded_per_company(self, db):
+        anchors = GpsRepository(db).get_geofence_anchors(1)
+        assert sorted(anchor[0] for anchor in anchors) == [1, 2]
+
+    def test_batch_reports_breaches_and_unknown_assets(self, db):
+        far = (TEHRAN[0] + 0.01, TEHRAN[1])
+        result = BatchCheckGeofenceUseCase(GpsRepository(db)).execute(1, [
+            GeofenceFix(asset_id=1, latitude=far[0], longitude=far[1]),
+            GeofenceFix(asset_id=2, latitude=far[0], longitude=far[1]),
+            GeofenceFix(asset_id=3, latitude=far[0], longitude=far[1]),
+            GeofenceFix(asset_id=4, latitude=far[0], longitude=far[1]),
+        ])
+        assert result["checked"] == 2
+        assert result["within_count"] == 1
+        assert [breach["asset_id"] for breach in result["outside"]] == [1]
+        assert result["outside"][0]["distance_m"] == pytest.approx(1112, abs=1)
+        assert result["unknown_asset_ids"] == [3, 4]
+
+def random_points(count, seed=3):
+    rng = np.random.default_rng(seed)
+    latitudes = rng.uniform(TEHRAN[0] - 0.5, TEHRAN[0] + 0.5, count)
+    longitudes = rng.uniform(TEHRAN[1] - 0.5, TEHRAN[1] + 0.5, count)
+    return [(i, lat, lon, encode(lat, lon, GEOHASH_PRECISION)) for i, lat, lon in zip(range(count), latitudes.tolist(), longitudes.tolist())]
+
+class TestGeohash:
+    def test_encode_matches_reference_values(self):
+        assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+        assert encode(-25.382708, -49.265506, 8) == "6gkzwgjz"
+
+    def test_covering_cells_contain_every_point_in_the_box(self):
+        cells = set(covering_cells(35.60, 51.30, 35.75, 51.45, 5))
+        for _, lat, lon, _ in random_points(200):
+            if 35.60 <= lat <= 35.75 and 51.30 <= lon <= 51.45:
+                assert encode(lat, lon, 5) in cells
+
+class TestCompanyGrid:
+    def test_radius_query_matches_a_full_scan(self):
+        points = random_points(2000)
+        grid = CompanyGrid(points)
+        found = grid.within_radius(*TEHRAN, 5000)
+        expected = sorted((haversine(*TEHRAN, lat, lon), id) for id, lat, lon, _ in points if haversine(*TEHRAN, lat, lon) <= 5000)
+        assert [row["asset_id"] for row in found] == [id for _, id in expected]
+
+    def test_nearest_matches_a_full_scan(self):
+        points = random_points(2000)
+        expected = sorted((haversine(35.0, 51.0, lat, lon), id) for id, lat, lon, _ in points)[:5]
+        assert [row["asset_id"] for row in CompanyGrid(points).nearest(35.0, 51.0, 5)] == [id for _, id in expected]
+
+    def test_bbox_crossing_the_antimeridian(self):
+        grid = CompanyGrid([(id, 10.0, lon, encode(10.0, lon, GEOHASH_PRECISION)) for id, lon in ((1, 179.5), (2, -179.5), (3, 0.0))])
+        assert [row["asset_id"] for row in grid.within_bbox(9.0, 179.0, 11.0, -179.0)] == [1, 2]
+
+    def test_moved_asset_is_found_at_its_new_cell(self):
+        grid = CompanyGrid(random_points(100))
+        grid.move(7, 0.0, 0.0, encode(0.0, 0.0, GEOHASH_PRECISION))
+        assert [row["asset_id"] for row in grid.nearest(0.0, 0.0, 1)] == [7]
+        assert len(grid) == 100
+        assert 7 not in [row["asset_id"] for row in grid.within_radius(*TEHRAN, 200000)]
+
+class TestSpatialPoints:
+    def test_points_carry_geohash_and_legacy_rows_are_hashed(self, db):
+        db.add(Asset(id=5, company_id=1, asset_id="V-5", category_id=1, name="Vehicle 5", rfid_tag="T5"))
+        GpsRepository(db).create_location(AssetLocationCreate(asset_id=5, latitude=35.7, longitude=51.4))
+        points = {point[0]: point for point in GpsRepository(db).get_spatial_points(1)}
+        assert sorted(points) == [1, 2, 5]
+        assert points[5][3] == encode(35.7, 51.4, GEOHASH_PRECISION)
+        assert points[1][3] == encode(*TEHRAN, GEOHASH_PRECISION)
+
+class TestLocationHistory:
+    def test_latest_fix_per_asset(self):
+        start = datetime(2026, 1, 1)
+        pings = [(1, start, 1.0, 1.0), (1, start + timedelta(seconds=30), 2.0, 2.0), (2, start, 3.0, 3.0), (1, start + timedelta(seconds=10), 4.0, 4.0)]
+        assert latest_fixes(pings) == {1: pings[1], 2: pings[2]}
+
+    def test_ingest_appends_history_and_upserts_latest_position(self, db):
+        start = datetime(2026, 1, 1)
+        repository = LocationHistoryRepository(db)
+        latest = repository.ingest([(1, start, 35.70, 51.40), (1, start + timedelta(seconds=30), 35.71, 51.41), (3, start, 35.0, 51.0)])
+        assert sorted(point[0] for point in latest) == [1, 3]
+        # A re-sent ping is ignored and an older fix never moves the latest position back.
+        assert repository.ingest([(1, start, 35.70, 51.40), (1, start + timedelta(seconds=15), 35.9, 51.9)]) == []
+        db.commit()
+        assert db.query(AssetLocationHistory).filter(AssetLocationHistory.asset_id == 1).count() == 3
+        anchored = db.query(AssetLocation).filter(AssetLocation.asset_id == 1).one()
+        assert (anchored.latitude, anchored.geofence_radius) == (TEHRAN[0], 500)
+        assert (anchored.last_latitude, anchored.last_longitude, anchored.last_seen_at) == (35.71, 51.41, start + timedelta(seconds=30))
+        assert anchored.geohash == encode(35.71, 51.41, GEOHASH_PRECISION)
+        tracked = db.query(AssetLocation).filter(AssetLocation.asset_id == 3).one()
+        assert tracked.latitude is None and tracked.last_latitude == 35.0
+
+    def test_backfilled_batch_does_not_move_the_grid(self, db, admin):
+        spatial_index.clear()
+        service = GpsService(GpsRepository(db))
+        now = datetime.utcnow()
+        service.ingest_pings(GpsPingBatch(company_id=1, pings=[{"asset_id": 3, "latitude": 10, "longitude": 10, "timestamp": now}]), admin)
+        db.commit()
+        assert [asset["asset_id"] for asset in service.assets_within_radius(1, 10, 10, 1000, 10, admin)] == [3]
+
+        older = now - timedelta(hours=1)
+        service.ingest_pings(GpsPingBatch(company_id=1, pings=[{"asset_id": 3, "latitude": 50, "longitude": 50, "timestamp": older}]), admin)
+        db.commit()
+        assert [asset["asset_id"] for asset in service.assets_within_radius(1, 10, 10, 1000, 10, admin)] == [3]
+        assert service.assets_within_radius(1, 50, 50, 1000, 10, admin) == []
+        spatial_index.clear()
+
+    def test_tracked_asset_can_be_given_a_geofence(self, db):
+        LocationHistoryRepository(db).ingest([(3, datetime(2026, 1, 1), 35.0, 51.0)])
+        location = GpsRepository(db).create_location(AssetLocationCreate(asset_id=3, latitude=35.1, longitude=51.1, geofence_radius=200))
+        assert (location.latitude, location.last_latitude, location.geofence_radius) == (35.1, 35.0, 200)
+        assert sorted(anchor[0] for anchor in GpsRepository(db).get_geofence_anchors(1)) == [1, 2, 3]
+
+    def test_monthly_partitions_roll_over_the_year(self):
+        statements = partition_statements(date(2026, 11, 17), 2)
+        assert "DEFAULT" in statements[0]
+        assert [statement.split("FROM ")[1] for statement in statements[1:]] == [
+            "('2026-11-01') TO ('2026-12-01')", "('2026-12-01') TO ('2027-01-01')", "('2027-01-01') TO ('2027-02-01')"
+        ]
+
+def drive(start, count, seed=5):
+    # A random walk of 30 s pings.
+    rng = np.random.default_rng(seed)
+    latitudes = 35.7 + np.cumsum(rng.normal(0, 0.0003, count))
+    longitudes = 51.4 + np.cumsum(rng.normal(0, 0.0003, count))
+    return [(1, start + timedelta(seconds=30 * i), lat, lon) for i, lat, lon in zip(range(count), latitudes.tolist(), longitudes.tolist())]
+
+class TestTrajectory:
+    def test_track_encoding_round_trips_to_micro_degrees(self):
+        pings = drive(datetime(2026, 1, 1), 500)
+        seconds = np.array([ping[1] for ping in pings], dtype="datetime64[s]").astype(np.int64)
+        latitudes, longitudes = np.array([ping[2] for ping in pings]), np.array([ping[3] for ping in pings])
+        data = encode_track(seconds, latitudes, longitudes)
+        assert len(data) < 8 * len(pings)
+        decoded = decode_track(data)
+        assert (decoded[0] == seconds).all()
+        assert np.abs(decoded[1] - latitudes).max() <= 5e-7 and np.abs(decoded[2] - longitudes).max() <= 5e-7
+
+    def test_simplified_track_stays_within_tolerance(self):
+        pings = drive(datetime(2026, 1, 1), 300)
+        latitudes, longitudes = np.array([ping[2] for ping in pings]), np.array([ping[3] for ping in pings])
+        kept = simplify(latitudes, longitudes, 50)
+        assert kept[0] == 0 and kept[-1] == len(pings) - 1 and len(kept) < len(pings)
+        # Every dropped fix lies within the tolerance of the chord that replaced it.
+        y = np.radians(latitudes) * 6371000
+        x = np.radians(longitudes) * 6371000 * np.cos(np.radians(latitudes.mean()))
+        for first, last in zip(kept[:-1], kept[1:]):
+            a, b = np.array([x[first], y[first]]), np.array([x[last], y[last]])
+            for i in range(first + 1, last):
+                p = np.array([x[i], y[i]])
+                t = np.clip(np.dot(p - a, b - a) / np.dot(b - a, b - a), 0, 1)
+                assert np.linalg.norm(p - (a + t * (b - a))) <= 50
+        assert len(simplify(latitudes, longitudes, 0)) == len(pings)
+
+    def test_straight_line_collapses_to_its_ends(self):
+        latitudes, longitudes = np.linspace(35.0, 35.1, 100), np.linspace(51.0, 51.1, 100)
+        assert simplify(latitudes, longitudes, 1).tolist() == [0, 99]
+
+class TestTrackCompaction:
+    def test_old_history_is_compacted_and_still_readable(self, db):
+        start = datetime(2026, 1, 1)
+        pings = drive(start, 2 * 2880)
+        LocationHistoryRepository(db).ingest(pings)
+        db.commit()
+        before = TrackRepository(db).get_track(1, start, start + timedelta(days=2))
+        assert len(before[0]) == len(pings)
+
+        factory = sessionmaker(bind=db.get_bind())
+        assert TrackCompactor().run_once(factory, now=datetime(2026, 1, 4, 12)) == 1
+        db.expire_all()
+        segment = db.query(AssetTrackSegment).one()
+        assert (segment.start_time, segment.raw_count) == (start, 2880)
+        assert segment.point_count <= 24 * 60
+        assert db.query(AssetLocationHistory).count() == 2880
+
+        seconds, latitudes, longitudes = TrackRepository(db).get_track(1, start, start + timedelta(days=2))
+        assert len(seconds) == segment.point_count + 2880
+        assert (np.diff(seconds) > 0).all()
+
+    def test_segment_holds_exactly_the_deleted_pings(self, db):
+        start = datetime(2026, 1, 1)
+        LocationHistoryRepository(db).ingest(drive(start, 100))
+        db.commit()
+        repository = TrackRepository(db)
+
+        assert repository.compact(1, start, start + timedelta(days=1), 60, 5) == 100
+        # A second compactor of the same window finds nothing left to fold.
+        assert repository.compact(1, start, start + timedelta(days=1), 60, 5) == 0
+        assert db.query(AssetTrackSegment).count() == 1
+
+        LocationHistoryRepository(db).ingest(drive(start + timedelta(hours=5), 1))
+        assert repository.compact(1, start, start + timedelta(days=1), 60, 5) == 1
+        assert [segment.raw_count for segment in db.query(AssetTrackSegment).order_by(AssetTrackSegment.id)] == [100, 1]
+        assert db.query(AssetLocationHistory).count() == 0
+
+@pytest.fixture
+def admin():
+    return {"id": 1, "username": "admin", "role": "S", "company_id": 1, "companies": [{"company_id": 1, "role": "S"}]}
+
+@pytest.fixture
+def clean_detector():
+    breach_detector.clear()
+    yield
+    breach_detector.clear()
+
+class TestGeofenceBreachDetector:
+    def test_jitter_around_the_edge_is_ignored(self):
+        detector = GeofenceBreachDetector(hysteresis_m=25, confirm_fixes=2)
+        assert [detector.observe(1, distance, 500) for distance in (490, 510, 520, 480, 515, 505)] == [None] * 6
+        assert detector.is_inside(1)
+
+    def test_exit_and_reentry_need_confirmed_fixes_past_the_band(self):
+        detector = GeofenceBreachDetector(hysteresis_m=25, confirm_fixes=2)
+        assert [detector.observe(1, distance, 500) for distance in (600, 400, 600, 650, 700)] == [None, None, None, EXIT, None]
+        assert not detector.is_inside(1)
+        # Back inside the fence but not past the band yet.
+        assert [detector.observe(1, distance, 500) for distance in (490, 480, 470, 460)] == [None, None, None, ENTER]
+
+    def test_assets_without_a_radius_are_not_tracked(self):
+        detector = GeofenceBreachDetector(hysteresis_m=25, confirm_fixes=1)
+        assert detector.observe(1, 1e6, None) is None
+        assert detector.observe(1, 1e6, float("nan")) is None
+        assert detector.stats()["tracked"] == 0
+
+    def test_overlapping_stages_build_on_each_other(self):
+        detector = GeofenceBreachDetector(hysteresis_m=25, confirm_fixes=2)
+        first, second = detector.stage([1], [600], [500]), detector.stage([1], [600], [500])
+        assert (first[0], second[0]) == ({}, {1: EXIT})
+        # A third request staged before either commits must not emit the exit again.
+        assert detector.stage([1], [700], [500])[0] == {}
+        assert not detector.is_inside(1)
+
+    def test_revert_restores_only_uncommitted_fixes(self):
+        detector = GeofenceBreachDetector(hysteresis_m=25, confirm_fixes=2)
+        committed = detector.stage([1], [600], [500])[1]
+        detector.apply(committed)
+        first, second = detector.stage([1], [600], [500])[1], detector.stage([1], [400], [500])[1]
+        # Rolled back underneath a later request: the later state stays for now ...
+        detector.revert(first)
+        assert not detector.is_inside(1)
+        # ... and its own rollback skips past the reverted one to the committed state.
+        detector.revert(second)
+        assert detector.observe(1, 600, 500) == EXIT
+
+class TestGeofenceEvents:
+    def test_check_only_writes_on_transitions(self, db, admin, clean_detector):
+        service = GpsService(GpsRepository(db))
+        far = GeofenceCheck(latitude=TEHRAN[0] + 0.01, longitude=TEHRAN[1])
+        home = GeofenceCheck(latitude=TEHRAN[0], longitude=TEHRAN[1])
+
+        def check(location):
+            result = service.check_geofence(1, location, admin)
+            db.commit()
+            return result
+
+        results = [check(location) for location in (home, home, far, far, far, home, home)]
+        assert [result["is_within_geofence"] for result in results] == [True, True, False, False, False, True, True]
+        assert [result["geofence_state"] for result in results] == ["inside"] * 3 + ["outside"] * 3 + ["inside"]
+        assert [workflow.details for workflow in db.query(WorkFlow).order_by(WorkFlow.id)] == ["Left geofence", "Re-entered geofence"]
+
+    def test_rolled_back_transition_is_not_lost(self, db, admin, clean_detector):
+        service = GpsService(GpsRepository(db))
+        far = GeofenceCheck(latitude=TEHRAN[0] + 0.01, longitude=TEHRAN[1])
+        service.check_geofence(1, far, admin)
+        db.commit()
+        assert service.check_geofence(1, far, admin)["geofence_state"] == "outside"
+        db.rollback()
+        assert breach_detector.is_inside(1)
+        assert db.query(WorkFlow).count() == 0
+
+        assert service.check_geofence(1, far, admin)["geofence_state"] == "outside"
+        db.commit()
+        assert not breach_detector.is_inside(1)
+        assert [workflow.details for workflow in db.query(WorkFlow)] == ["Left geofence"]
+
+    def test_pings_are_streamed_through_the_detector(self, db, admin, clean_detector):
+        start = datetime(2026, 1, 1)
+        far = TEHRAN[0] + 0.01
+        batch = GpsPingBatch(company_id=1, pings=[
+            {"asset_id": asset_id, "latitude": latitude, "longitude": TEHRAN[1], "timestamp": start + timedelta(seconds=30 * i)}
+            for i, latitude in enumerate((far, far))
+            for asset_id in (1, 2)
+        ])
+        GpsService(GpsRepository(db)).ingest_pings(batch, admin)
+        workflows = db.query(WorkFlow).all()
+        assert [(workflow.asset_id, workflow.asset_name, workflow.details) for workflow in workflows] == [(1, "Vehicle 1", "Left geofence")]
@@ -0,0 +1,30 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+import pytest
+from fastapi import HTTPException, Response
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.pagination.cursor import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, set_next_cursor
+
+class TestCursor:
+    def test_round_trip_restores_datetimes(self):
+        timestamp = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        token = encode_cursor(id=42, timestamp=timestamp)
+        assert decode_cursor(token, "timestamp") == {"id": 42, "timestamp": timestamp}
+
+    @pytest.mark.parametrize("token", ["not-a-cursor", encode_cursor(timestamp="2024-05-01"), encode_cursor(id="1"), encode_cursor(id=1)])
+    def test_invalid_cursor_is_a_bad_request(self, token):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(token, "timestamp")
+        assert exc.value.status_code == 400
+
+    def test_next_cursor_only_for_full_pages(self):
+        response = Response()
+        set_next_cursor(response, [{"id": 1}], per_page=2)
+        assert NEXT_CURSOR_HEADER not in response.headers
+
+        set_next_cursor(response, [{"id": 1}, {"id": 2}], per_page=2)
+        assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == {"id": 2}
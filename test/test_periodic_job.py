@@ -0,0 +1,61 @@
+import sys
+import threading
+from pathlib import Path
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.jobs.periodic import PeriodicJob, run_in_session
+from app.core.models.company import Company
+
+class _Job(PeriodicJob):
+    name = "test-job"
+
+    def __init__(self, run_at_start: bool):
+        super().__init__()
+        self.run_at_start = run_at_start
+        self.ran = threading.Event()
+
+    def run_once(self, session_factory):
+        self.ran.set()
+        raise RuntimeError("swallowed by the loop")
+
+class TestPeriodicJob:
+    def test_run_in_session_commits(self, engine):
+        factory = sessionmaker(bind=engine)
+        assert run_in_session(factory, lambda db: db.add(Company(name="Acme")) or 1, "failed") == 1
+        assert factory().query(Company).count() == 1
+
+    def test_run_in_session_rolls_back_and_reraises(self, engine):
+        factory = sessionmaker(bind=engine)
+
+        def fail(db):
+            db.add(Company(name="Acme"))
+            db.flush()
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            run_in_session(factory, fail, "failed")
+        assert factory().query(Company).count() == 0
+
+    def test_run_at_start_runs_before_the_first_interval(self):
+        job = _Job(run_at_start=True)
+        job.start(None, 3600)
+        try:
+            assert job.ran.wait(5)
+        finally:
+            job.stop()
+        assert job._thread is None
+
+    def test_waits_a_full_interval_by_default(self):
+        job = _Job(run_at_start=False)
+        job.start(None, 3600)
+        job.stop()
+        assert not job.ran.is_set()
+
+    def test_non_positive_interval_does_not_start(self):
+        job = _Job(run_at_start=True)
+        job.start(None, 0)
+        assert job._thread is None
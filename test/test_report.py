@@ -0,0 +1,69 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+import pytest
+from fastapi import HTTPException
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.models.company import Company
+from app.features.assets_management.data.models import Asset, AssetCategory, AssetStatus
+from app.features.logs.data.models import Log
+from app.features.assets_report_management.data.repository import ReportRepository
+
+@pytest.fixture
+def company(db):
+    acme, other = Company(name="Acme"), Company(name="Other")
+    laptops, phones = AssetCategory(name="Laptops", code=100), AssetCategory(name="Phones", code=200)
+    db.add_all([acme, other, laptops, phones])
+    db.flush()
+    rows = [
+        ("L-1", laptops, AssetStatus.ACTIVE, "HQ", 1000),
+        ("L-2", laptops, AssetStatus.ACTIVE, "HQ", 1200),
+        ("L-3", laptops, AssetStatus.ON_LOAN, None, 900),
+        ("P-1", phones, AssetStatus.MAINTENANCE, "Depot", None),
+    ]
+    for asset_id, category, asset_status, location, value in rows:
+        db.add(Asset(company_id=acme.id, asset_id=asset_id, category_id=category.id, name=asset_id, rfid_tag=asset_id, status=asset_status, location=location, value=value))
+    db.add(Asset(company_id=other.id, asset_id="X-1", category_id=phones.id, name="X-1", rfid_tag="X-1"))
+    db.add_all([
+        Log(company_id=acme.id, action="ASSET_CREATE", entity_type="ASSET", timestamp=datetime(2024, 1, 1)),
+        Log(company_id=acme.id, action="LOAN_CREATE", entity_type="ASSET_LOAN", timestamp=datetime(2024, 2, 1)),
+        Log(company_id=acme.id, action="REPORT_ACCESS", entity_type="REPORT", timestamp=datetime(2024, 3, 1)),
+        Log(company_id=other.id, action="ASSET_CREATE", entity_type="ASSET", timestamp=datetime(2024, 4, 1)),
+    ])
+    db.commit()
+    company_id = acme.id
+    db.statements.clear()
+    return company_id
+
+class TestReportRepository:
+    def test_report_is_built_from_two_statements(self, db, company):
+        report = ReportRepository(db).get_company_report(company)
+
+        assert len(db.statements) == 2
+        assert report["total_assets"] == 4
+        assert report["active_assets"] == 2
+        assert report["loaned_assets"] == 1
+        assert report["total_value"] == 3100
+        assert report["last_activity"] == datetime(2024, 2, 1)
+        assert report["status_breakdown"] == {"active": 2, "inactive": 0, "maintenance": 1, "disposed": 0, "on_loan": 1}
+        assert [(entry["category_name"], entry["count"]) for entry in report["category_breakdown"]] == [("Laptops", 3), ("Phones", 1)]
+        assert {entry["location"]: entry["count"] for entry in report["location_breakdown"]} == {"HQ": 2, None: 1, "Depot": 1}
+
+    def test_company_without_assets_reports_zeroes(self, db, company):
+        empty = Company(name="Empty")
+        db.add(empty)
+        db.commit()
+
+        report = ReportRepository(db).get_company_report(empty.id)
+
+        assert report["total_assets"] == 0
+        assert report["last_activity"] is None
+        assert set(report["status_breakdown"].values()) == {0}
+
+    def test_unknown_company_is_not_found(self, db, company):
+        with pytest.raises(HTTPException) as exc:
+            ReportRepository(db).get_company_report(999)
+        assert exc.value.status_code == 404
@@ -0,0 +1,305 @@
+import sys
+import asyncio
+from pathlib import Path
+import time
+import pytest
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+from jose import jwt
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.cache.ttl_cache import TTLCache
+from app.core.security.principal_cache import PrincipalCache
+from app.core.security.token_revocation import TokenRevocationList
+from app.core.security.login_tracker import LoginAttemptTracker
+from app.core.security.hashing import PasswordHasher
+from app.core.security import (
+    SECRET_KEY, ALGORITHM, create_access_token, create_principal_token, get_user_rules, _principal_from_claims,
+    revocation_list, revoke_access_token, principal_cache, invalidate_principal_on_commit
+)
+from app.core.security.membership import MembershipResolver
+from app.core.security.permissions import PermissionContextMiddleware, invalidate_permissions, permissions_for
+from app.core.models.company import Company
+from app.features.auth.data.models import User, UserCompanyRole
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def principal():
+    return {"id": 7, "username": "operator", "role": "O", "company_id": 3}
+
+class TestTTLCache:
+    def test_entries_expire_after_ttl(self, clock):
+        cache = TTLCache(max_size=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self, clock):
+        evicted = []
+        cache = TTLCache(max_size=2, ttl=60, on_evict=lambda k, v: evicted.append(k), clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert evicted == ["b"]
+
+class TestPrincipalCache:
+    def test_get_returns_copy(self, principal):
+        cache = PrincipalCache(max_size=10, ttl=60)
+        cache.set("token", principal)
+        cached = cache.get("token")
+        cached["role"] = "S"
+        assert cache.get("token")["role"] == "O"
+
+    def test_invalidate_user_drops_all_tokens(self, principal):
+        cache = PrincipalCache(max_size=10, ttl=60)
+        cache.set("token-1", principal)
+        cache.set("token-2", principal)
+        cache.set("other", {**principal, "id": 8})
+        cache.invalidate_user(7)
+        assert cache.get("token-1") is None
+        assert cache.get("token-2") is None
+        assert cache.get("other") is not None
+
+class TestTokenRevocation:
+    def test_revoke_user_only_affects_earlier_tokens(self):
+        revocations = TokenRevocationList(token_lifetime_seconds=900)
+        now = time.time()
+        revocations.revoke_user(7, issued_before=now)
+        assert revocations.is_revoked({"sub": "7", "jti": "a", "iat": now - 1})
+        assert not revocations.is_revoked({"sub": "7", "jti": "b", "iat": now + 1})
+        assert not revocations.is_revoked({"sub": "8", "jti": "c", "iat": now - 1})
+
+    def test_revoke_token_by_jti(self):
+        revocations = TokenRevocationList(token_lifetime_seconds=900)
+        revocations.revoke_token("a", expires_at=time.time() + 60)
+        assert revocations.is_revoked({"sub": "7", "jti": "a", "iat": time.time()})
+        assert not revocations.is_revoked({"sub": "7", "jti": "b", "iat": time.time()})
+
+    def test_logout_revokes_only_that_token(self):
+        token = create_access_token({"sub": "7", "username": "admin"})
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        other = jwt.decode(create_access_token({"sub": "7"}), SECRET_KEY, algorithms=[ALGORITHM])
+        assert revoke_access_token(token, payload)
+        assert revocation_list.is_token_revoked(payload["jti"])
+        assert not revocation_list.is_token_revoked(other["jti"])
+        assert not revoke_access_token("legacy", {"sub": "7"})
+
+    def test_principal_token_carries_company_claims(self):
+        user = User(id=7, username="admin", email="a@example.com", phone_num=None, is_active=True, is_premium=False)
+        user.companies = [UserCompanyRole(company_id=3, role="A2", can_manage_operators=True)]
+        payload = jwt.decode(create_principal_token(user), SECRET_KEY, algorithms=[ALGORITHM])
+        principal = _principal_from_claims(payload)
+        assert principal["id"] == 7
+        assert principal["role"] == "A2"
+        assert principal["company_id"] == 3
+        assert principal["companies"][0]["can_manage_operators"] is True
+
+class TestLoginAttemptTracker:
+    def test_ban_after_max_failures_in_window(self, clock):
+        tracker = LoginAttemptTracker(max_attempts=3, window_seconds=60, ban_seconds=300, clock=clock)
+        for _ in range(2):
+            tracker.record_failure("10.0.0.1", "alice")
+        assert not tracker.is_banned("10.0.0.1")
+        tracker.record_failure("10.0.0.1", "alice")
+        assert tracker.is_banned("10.0.0.1")
+        assert not tracker.is_banned("10.0.0.2")
+        clock.now = 300
+        assert not tracker.is_banned("10.0.0.1")
+
+    def test_failures_outside_window_do_not_count(self, clock):
+        tracker = LoginAttemptTracker(max_attempts=3, window_seconds=60, ban_seconds=300, clock=clock)
+        tracker.record_failure("10.0.0.1", "alice")
+        tracker.record_failure("10.0.0.1", "alice")
+        clock.now = 61
+        tracker.record_failure("10.0.0.1", "alice")
+        assert not tracker.is_banned("10.0.0.1")
+
+    def test_flush_writes_pending_attempts_in_one_batch(self, clock):
+        tracker = LoginAttemptTracker(max_attempts=3, window_seconds=60, ban_seconds=300, clock=clock)
+        tracker.record_failure("10.0.0.1", "alice")
+        tracker.record_success("10.0.0.1", "alice")
+        session = MagicMock()
+        assert tracker.flush(lambda: session) == 2
+        assert session.bulk_insert_mappings.call_count == 1
+        assert session.commit.called
+        assert tracker.flush(lambda: session) == 0
+        assert tracker.stats()["written"] == 2
+
+    def test_dropped_attempts_are_counted(self, clock):
+        tracker = LoginAttemptTracker(max_attempts=3, window_seconds=60, ban_seconds=300, max_pending=2, clock=clock)
+        for _ in range(3):
+            tracker.record_success("10.0.0.1", "alice")
+        assert tracker.stats() == {"pending": 2, "max_pending": 2, "written": 0, "dropped": 1}
+
+        session = MagicMock()
+        session.bulk_insert_mappings.side_effect = RuntimeError("db down")
+        assert tracker.flush(lambda: session) == 0
+        assert tracker.stats()["pending"] == 0
+        assert tracker.stats()["dropped"] == 3
+
+class TestPasswordHasher:
+    def test_hash_and_verify_off_loop(self):
+        hasher = PasswordHasher(workers=2, max_queue=4)
+
+        async def run():
+            hashed = await hasher.hash("secret")
+            return await hasher.verify("secret", hashed), await hasher.verify("wrong", hashed)
+
+        try:
+            assert asyncio.run(run()) == (True, False)
+            assert hasher.stats()["completed"] == 3
+            assert hasher.stats()["in_flight"] == 0
+        finally:
+            hasher.shutdown()
+
+    def test_rejects_when_queue_full(self):
+        hasher = PasswordHasher(workers=1, max_queue=0)
+
+        async def run():
+            first = asyncio.create_task(hasher.hash("secret"))
+            await asyncio.sleep(0)
+            with pytest.raises(HTTPException) as exc:
+                await hasher.hash("other")
+            await first
+            return exc.value.status_code
+
+        try:
+            assert asyncio.run(run()) == 503
+            assert hasher.stats()["rejected"] == 1
+        finally:
+            hasher.shutdown()
+
+@pytest.fixture
+def db(db):
+    session = db
+    session.add(User(username="consultant", email="c@example.com", is_active=True))
+    session.add_all([Company(name=f"Company {index}") for index in range(1, 21)])
+    session.flush()
+    session.add_all([
+        UserCompanyRole(user_id=1, company_id=company_id, role="A1" if company_id == 4 else "O", can_manage_operators=company_id == 4)
+        for company_id in (4, *range(5, 21))
+    ])
+    session.commit()
+    session.statements.clear()
+    return session
+
+class TestMembershipResolver:
+    def test_all_memberships_resolve_in_one_query(self, db):
+        resolver = MembershipResolver(db)
+
+        memberships = resolver.for_user(1)
+        assert len(memberships) == 17
+        assert memberships[0].company_id == 4 and memberships[0].company_name == "Company 4"
+        assert resolver.for_company(1, 4).can_manage_operators is True
+        assert resolver.for_company(1, 20).role == "O"
+        assert resolver.for_company(1, 1) is None
+        assert len(db.statements) == 1
+
+    def test_user_and_memberships_load_together(self, db):
+        user, memberships = MembershipResolver(db).user_with_memberships("consultant")
+
+        assert user.id == 1
+        assert [membership.company_id for membership in memberships][:2] == [4, 5]
+        assert len(db.statements) == 1
+
+    def test_user_without_memberships(self, db):
+        db.add(User(username="loner", email="l@example.com"))
+        db.commit()
+        db.statements.clear()
+
+        user, memberships = MembershipResolver(db).user_with_memberships("loner")
+        assert user.username == "loner"
+        assert memberships == []
+        assert MembershipResolver(db).user_with_memberships("ghost") == (None, [])
+
+class TestInvalidateOnCommit:
+    def test_principal_recached_before_commit_is_dropped(self, db, principal):
+        principal_cache.set("stale", {**principal, "id": 1})
+        invalidate_principal_on_commit(db, 1)
+        assert principal_cache.get("stale") is None
+        principal_cache.set("stale", {**principal, "id": 1})
+        db.get(User, 1).email = "new@example.com"
+        db.commit()
+        assert principal_cache.get("stale") is None
+        assert revocation_list.is_revoked({"sub": "1", "iat": time.time() - 1})
+
+    def test_rollback_keeps_principal_tokens(self, db):
+        invalidate_principal_on_commit(db, 901)
+        db.get(User, 1).email = "new@example.com"
+        db.rollback()
+        db.commit()
+        assert not revocation_list.is_revoked({"sub": "901", "iat": time.time() - 1})
+
+class TestPermissionContext:
+    def test_memberships_load_once_per_request(self, db):
+        seen = []
+
+        async def endpoint(scope, receive, send):
+            first = permissions_for(db, 1)
+            assert permissions_for(db, 1) is first
+            seen.append(len(db.statements))
+            invalidate_permissions(1)
+            assert permissions_for(db, 1) is not first
+            seen.append(len(db.statements))
+
+        asyncio.run(PermissionContextMiddleware(endpoint)({"type": "http"}, None, None))
+        assert seen == [1, 2]
+
+    def test_answers_come_from_memberships(self, db):
+        permissions = permissions_for(db, 1)
+
+        assert permissions.role_in(4) == "A1"
+        assert permissions.can_manage_operators(4) is True
+        assert permissions.can_manage_operators(5) is False
+        assert permissions.is_member(20) and not permissions.is_member(1)
+        assert not permissions.is_super_admin
+
+    def test_outside_a_request_nothing_is_memoized(self, db):
+        assert permissions_for(db, 1) is not permissions_for(db, 1)
+        assert len(db.statements) == 2
+
+class TestUserPolicy:
+    def test_policies_are_compiled_once_per_role_flags_and_company(self):
+        first = get_user_rules("A2", 4, {"can_manage_operators": True})
+
+        assert get_user_rules("A2", 4, {"can_manage_operators": True}) is first
+        assert get_user_rules("A2", 4) is not first
+        assert hash(first) == hash(get_user_rules("A2", 4, {"can_manage_operators": True}))
+        assert isinstance(first.allowed("users"), frozenset)
+
+    def test_edit_rights_follow_role_and_flags(self):
+        manager = get_user_rules("A2", 4, {"can_manage_operators": True})
+
+        assert manager.can_edit("users", "email")
+        assert not get_user_rules("A2", 4).can_edit("users", "email")
+        assert manager.forbidden_edits("users", ["email", "role"]) == {"role"}
+        with pytest.raises(HTTPException) as exc:
+            manager.check_editable("users", ["role"])
+        assert exc.value.status_code == 403
+
+    def test_projection_keeps_only_allowed_fields(self):
+        operator = get_user_rules("unknown")
+
+        assert operator.role == "O"
+        assert operator.project("assets", {"id": 1, "name": "Laptop", "rfid_tag": "T1"}) == {"id": 1, "name": "Laptop"}
+        assert operator.project("users", {"id": 1}) == {}
+        assert operator.to_rules().allowed_fields["assets"] == ["asset_id", "id", "location", "name"]
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.models.company import Company
+from app.db import unit_of_work
+from app.db.unit_of_work import UnitOfWork, UnitOfWorkSession, get_unit_of_work
+
+@pytest.fixture
+def uow_factory(engine, monkeypatch):
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    factory = sessionmaker(class_=UnitOfWorkSession, autoflush=False, bind=engine)
+    monkeypatch.setattr(unit_of_work, "UnitOfWorkSessionLocal", factory)
+    return factory, commits
+
+class TestUnitOfWork:
+    def test_inner_commits_collapse_into_one(self, uow_factory):
+        factory, commits = uow_factory
+        dependency = get_unit_of_work()
+        uow = next(dependency)
+        for name in ("Acme", "Globex", "Initech"):
+            uow.session.add(Company(name=name))
+            uow.session.commit()
+        assert commits == []
+
+        with pytest.raises(StopIteration):
+            next(dependency)
+        assert len(commits) == 1
+        assert factory().query(Company).count() == 3
+
+    def test_error_rolls_back_everything(self, uow_factory):
+        factory, commits = uow_factory
+        dependency = get_unit_of_work()
+        uow = next(dependency)
+        uow.session.add(Company(name="Acme"))
+        uow.session.commit()
+
+        with pytest.raises(HTTPException):
+            dependency.throw(HTTPException(status_code=404, detail="Asset not found"))
+        assert commits == []
+        assert factory().query(Company).count() == 0
+
+    def test_explicit_commit(self, uow_factory):
+        factory, commits = uow_factory
+        uow = UnitOfWork(factory())
+        uow.session.add(Company(name="Acme"))
+        uow.commit()
+        uow.close()
+        assert len(commits) == 1
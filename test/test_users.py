@@ -0,0 +1,97 @@
+import sys
+import asyncio
+from pathlib import Path
+import pytest
+from fastapi import HTTPException
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.core.models.company import Company
+from app.features.auth.data.models import User, UserCompanyRole
+from app.features.auth.data.repository import SQLAlchemyUserRepository
+from app.features.users.domain.user_cases import ListUsersUseCase, UpdateUserUseCase
+from app.features.users.service.user_service import _user_row
+from app.core.models.user_rules import Role
+
+@pytest.fixture
+def db(db):
+    session = db
+    session.add_all([Company(name="Acme"), Company(name="Other")])
+    for index in range(7):
+        user = User(username=f"user{index}", email=f"user{index}@example.com", is_active=True)
+        session.add(user)
+        session.flush()
+        session.add(UserCompanyRole(user_id=user.id, company_id=1 if index < 5 else 2, role="O"))
+    session.commit()
+    session.statements.clear()
+    return session
+
+@pytest.fixture
+def use_case(db):
+    return ListUsersUseCase(SQLAlchemyUserRepository(db))
+
+class TestListUsersUseCase:
+    def test_full_page_is_one_query_plus_count(self, db, use_case):
+        users, total = use_case.execute(1, {"id": 1, "role": "S", "company_id": 1}, page=1, per_page=2)
+
+        assert [user["username"] for user in users] == ["user0", "user1"]
+        assert users[0]["role"] == "O" and users[0]["company_id"] == 1
+        assert total == 5
+        assert len(db.statements) == 2
+
+    def test_last_page_skips_the_count(self, db, use_case):
+        users, total = use_case.execute(1, {"id": 1, "role": "S", "company_id": 1}, page=3, per_page=2)
+
+        assert [user["username"] for user in users] == ["user4"]
+        assert total == 5
+        assert len(db.statements) == 1
+
+    def test_users_without_membership_have_no_role(self, db, use_case):
+        db.add(User(username="loner", email="loner@example.com", is_active=True))
+        db.add(UserCompanyRole(user_id=1, company_id=2, role="A2"))
+        db.commit()
+
+        users, total = use_case.execute(None, {"id": 1, "role": "S", "company_id": 1}, page=1, per_page=20)
+        rows = [_user_row(user) for user in users]
+        assert [row["username"] for row in rows].count("user0") == 2
+        assert rows[-1]["username"] == "loner"
+        assert rows[-1]["role"] is None and rows[-1]["can_manage_operators"] is None
+        assert total == len(rows) == 9
+
+    def test_admins_are_scoped_to_their_company(self, use_case):
+        admin = {"id": 1, "role": "A2", "company_id": 2}
+
+        users, total = use_case.execute(None, admin, page=1, per_page=20)
+        assert [user["username"] for user in users] == ["user5", "user6"]
+        assert total == 2
+
+        with pytest.raises(HTTPException) as exc:
+            use_case.execute(1, admin, page=1, per_page=20)
+        assert exc.value.status_code == 403
+
+class TestUpdateUserUseCase:
+    def update(self, db, user_id, current_user, **changes):
+        # Mirrors a PUT with a full UserUpdate body: untouched fields keep their defaults.
+        fields = dict(username=f"user{user_id - 1}", phone_num=None, email=None, password=None, role=Role.O, company_id=None,
+                      is_active=True, can_delete_government=False, can_manage_government_admins=False, can_manage_operators=False)
+        fields.update(changes)
+        return asyncio.run(UpdateUserUseCase(SQLAlchemyUserRepository(db)).execute(user_id, current_user=current_user, **fields))
+
+    def test_operator_manager_can_edit_only_an_email(self, db):
+        db.query(UserCompanyRole).filter(UserCompanyRole.user_id == 6).update({"role": "A2", "can_manage_operators": True})
+        db.commit()
+        manager = {"id": 6, "username": "user5", "role": "A2", "company_id": 2,
+                   "companies": [{"company_id": 2, "role": "A2", "can_manage_operators": True}]}
+
+        user = self.update(db, 7, manager, email="new@example.com")
+        assert user.email == "new@example.com"
+        assert user.role == "O" and user.company_id == 2 and user.can_manage_operators is False
+        assert db.get(User, 7).email == "new@example.com"
+
+        with pytest.raises(HTTPException) as exc:
+            self.update(db, 7, manager, role=Role.A2)
+        assert exc.value.status_code == 403
+        with pytest.raises(HTTPException) as exc:
+            self.update(db, 1, manager, email="other@example.com")
+        assert exc.value.status_code == 403
@@ -0,0 +1,137 @@
+import sys
+import json
+from datetime import datetime
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from app.features.work_flow.data.models import WorkFlow, WorkflowActionType
+from app.features.work_flow.data.repository import WorkFlowRepository
+from app.features.work_flow.data.schemas import WorkFlowResponse
+from app.features.work_flow.data.read_repository import WorkFlowReadRepository, WorkFlowRecord
+from app.core.responses.rows import RowsJSONResponse
+
+class TestWorkFlowRepository:
+    def test_record_workflow_is_a_single_insert(self, db):
+        repository = WorkFlowRepository(db)
+        workflow = repository.record_workflow(
+            company_id=1,
+            user_id=1,
+            admin_name="admin",
+            asset_id=1,
+            asset_name="Dell XPS 15",
+            action_type=WorkflowActionType.OFFLINE_SCAN,
+            details="Scanned RFID tag TAG1",
+            is_offline=True,
+            is_actionable=True
+        )
+
+        assert workflow.id is not None
+        assert workflow.timestamp is not None
+        assert [s.split()[0] for s in db.statements] == ["INSERT"]
+
+    def test_create_workflows_bulk(self, db):
+        repository = WorkFlowRepository(db)
+        rows = [
+            {
+                "company_id": 1,
+                "user_id": 1,
+                "admin_name": "admin",
+                "asset_id": asset_id,
+                "asset_name": f"Asset {asset_id}",
+                "action_type": WorkflowActionType.OFFLINE_SCAN,
+                "details": "Batch scan",
+                "is_offline": True,
+                "is_actionable": True
+            }
+            for asset_id in range(1, 51)
+        ]
+
+        assert repository.create_workflows_bulk(rows) == 50
+        assert len([s for s in db.statements if s.startswith("INSERT")]) == 1
+        assert db.query(WorkFlow).count() == 50
+        assert db.query(WorkFlow).filter(WorkFlow.timestamp.is_(None)).count() == 0
+
+    def test_create_workflows_bulk_empty(self, db):
+        assert WorkFlowRepository(db).create_workflows_bulk([]) == 0
+        assert db.statements == []
+
+    def test_keyset_pages_walk_newest_first_without_gaps(self, db):
+        repository = WorkFlowRepository(db)
+        same_second = datetime(2024, 1, 1, 12, 0, 0)
+        repository.create_workflows_bulk([
+            {
+                "company_id": 1,
+                "user_id": 1,
+                "admin_name": "admin",
+                "asset_id": index,
+                "asset_name": f"Asset {index}",
+                "action_type": WorkflowActionType.OFFLINE_SCAN,
+                "timestamp": same_second if index % 2 else datetime(2024, 1, 1, 12, 0, index)
+            }
+            for index in range(1, 8)
+        ])
+        db.commit()
+
+        seen, after = [], None
+        while True:
+            page = repository.get_workflows(company_id=1, page=1, per_page=3, after=after)
+            seen.extend(workflow.id for workflow in page)
+            if len(page) < 3:
+                break
+            after = {"timestamp": page[-1].timestamp, "id": page[-1].id}
+
+        expected = [workflow.id for workflow in repository.get_workflows(company_id=1, page=1, per_page=100)]
+        assert seen == expected
+        assert len(seen) == 7
+
+    def test_records_serialize_without_models(self, db):
+        repository = WorkFlowRepository(db)
+        repository.record_workflow(
+            company_id=1,
+            user_id=1,
+            admin_name="admin",
+            asset_id=5,
+            asset_name="Laptop",
+            action_type=WorkflowActionType.OFFLINE_SCAN
+        )
+        db.commit()
+
+        records = WorkFlowReadRepository(db).get_workflows(company_id=1, page=1, per_page=10)
+        body = json.loads(RowsJSONResponse(records, WorkFlowRecord).body)
+
+        assert body == [WorkFlowResponse.model_validate(record, from_attributes=True).model_dump(mode="json") for record in records]
+        assert body[0]["action_type"] == "offline_scan"
+        assert body[0]["timestamp"] == records[0].timestamp.isoformat()
+
+    def test_read_path_matches_orm_path_and_skips_identity_map(self, db):
+        repository = WorkFlowRepository(db)
+        repository.create_workflows_bulk([
+            {
+                "company_id": 1,
+                "user_id": 1,
+                "admin_name": "admin",
+                "asset_id": index,
+                "asset_name": f"Asset {index}",
+                "action_type": WorkflowActionType.OFFLINE_SCAN if index % 2 else WorkflowActionType.EDITED,
+                "timestamp": datetime(2024, 1, 1, 12, 0, index // 2)
+            }
+            for index in range(1, 9)
+        ])
+        db.commit()
+        reader = WorkFlowReadRepository(db)
+
+        for kwargs in (
+            {"page": 1, "per_page": 3},
+            {"page": 2, "per_page": 3},
+            {"page": 1, "per_page": 5, "action_type": WorkflowActionType.EDITED},
+            {"page": 1, "per_page": 3, "after": {"timestamp": datetime(2024, 1, 1, 12, 0, 2), "id": 5}}
+        ):
+            records = reader.get_workflows(company_id=1, **kwargs)
+            assert [record.id for record in records] == [workflow.id for workflow in repository.get_workflows(company_id=1, **kwargs)]
+        db.expunge_all()
+
+        records = reader.get_workflows(company_id=1, page=1, per_page=10)
+        assert len(records) == 8 and len(db.identity_map) == 0
+        assert not hasattr(records[0], "__dict__")